@@ -1,5 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Prefetch, QuerySet
+from django.http import HttpRequest
 
 from .models import CustomUser, Subscription
 
@@ -43,6 +45,33 @@ class CustomUserAdmin(UserAdmin):
             добавления/изменения.
     """
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        """
+        Возвращает пользователей вместе с их подписками и подписчиками, чтобы
+        колонки `get_following` и `get_followers` не выполняли по два запроса
+        на каждую строку списка.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            QuerySet: Пользователи с предзагруженными подписками.
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related(
+                Prefetch(
+                    "following",
+                    queryset=Subscription.objects.select_related("following"),
+                ),
+                Prefetch(
+                    "followers",
+                    queryset=Subscription.objects.select_related("follower"),
+                ),
+            )
+        )
+
     def get_following(self, obj: CustomUser) -> str:
         """
         Возвращает разделенную запятыми строку из адресов электронной
@@ -54,7 +83,7 @@ class CustomUserAdmin(UserAdmin):
         Returns:
             str: Строка адресов электронной почты, разделенная запятыми.
         """
-        return ", ".join(user.email for user in obj.get_following())
+        return ", ".join(sub.following.email for sub in obj.following.all())
 
     get_following.short_description = "Following"
 
@@ -69,7 +98,7 @@ class CustomUserAdmin(UserAdmin):
         Returns:
             str: Строка адресов электронной почты, разделенная запятыми.
         """
-        return ", ".join(user.email for user in obj.get_followers())
+        return ", ".join(sub.follower.email for sub in obj.followers.all())
 
     get_followers.short_description = "Followers"
 
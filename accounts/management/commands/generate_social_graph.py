@@ -0,0 +1,411 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+from django.db.models import Model
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, Subscription
+from chat.models import Message
+from feed.models import FeedItem
+from notifications.models import Notification
+from posts.models import Comment, Post
+from utils.batching import batched
+
+WORDS = (
+    "привет мир сегодня погода музыка спорт технологии кофе утро вечер город "
+    "книга фильм путешествие работа отдых друзья проект идея новости"
+).split()
+
+
+@contextmanager
+def explicit_dates(*fields):
+    """
+    Временно отключает `auto_now_add` у полей, чтобы `bulk_create` сохранил
+    сгенерированные даты создания вместо текущего времени.
+
+    Args:
+        *fields: Поля моделей с `auto_now_add=True`.
+    """
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    """
+    Команда управления Django, генерирующая синтетический социальный граф для
+    нагрузочного тестирования: пользователей, подписки, посты, комментарии,
+    лайки, сообщения и уведомления.
+
+    Пароль хешируется один раз для всех пользователей, а все объекты создаются
+    через `bulk_create` порциями по `--batch-size`. Популярность пользователей
+    распределена по закону Ципфа, поэтому число подписчиков подчиняется
+    степенному закону: у немногих пользователей их очень много, у большинства —
+    единицы. Генерация детерминирована для заданного `--seed`.
+    """
+
+    help = "Generates a synthetic social graph for load testing."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Добавляет аргументы команды.
+
+        Args:
+            parser: Синтаксический анализатор аргументов
+        """
+        parser.add_argument("users", type=int, help="The number of users to create")
+        parser.add_argument(
+            "--follows", type=int, default=20, help="Average follows per user"
+        )
+        parser.add_argument(
+            "--zipf",
+            type=float,
+            default=1.0,
+            help="Exponent of the popularity distribution of followed users",
+        )
+        parser.add_argument(
+            "--posts", type=int, default=5, help="Average posts per user"
+        )
+        parser.add_argument(
+            "--comments", type=int, default=2, help="Average comments per post"
+        )
+        parser.add_argument(
+            "--likes", type=int, default=5, help="Average likes per post"
+        )
+        parser.add_argument(
+            "--messages", type=int, default=5, help="Average messages per user"
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Spread creation dates over this many days",
+        )
+        parser.add_argument(
+            "--no-feeds",
+            action="store_true",
+            help="Do not fill feed inboxes of followers",
+        )
+        parser.add_argument("--password", default="password")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        """
+        Генерирует социальный граф и выводит количество созданных объектов.
+        """
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        self.period = timedelta(days=options["days"]).total_seconds()
+        started = time.monotonic()
+
+        usernames = self.create_users(
+            options["users"], options["password"], options["seed"]
+        )
+        user_ids = list(usernames)
+        following = self.create_follows(usernames, options["follows"], options["zipf"])
+        posts = self.create_posts(user_ids, options["posts"])
+        self.create_comments(user_ids, posts, options["comments"])
+        self.create_likes(user_ids, posts, options["likes"])
+        self.create_messages(user_ids, following, options["messages"])
+        if not options["no_feeds"]:
+            self.create_feed_items(following, posts)
+        with self.stage("Counters"):
+            posts = Post.objects.filter(user__email__startswith=self.prefix)
+            self.rows = posts.reconcile_counters()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Social graph generated in {time.monotonic() - started:.1f}s"
+            )
+        )
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Выводит количество созданных на этапе генерации строк и время его
+        выполнения.
+
+        Args:
+            name (str): Название этапа.
+        """
+        self.rows = 0
+        started = time.monotonic()
+        yield
+        self.stdout.write(
+            f"{name}: {self.rows} rows in {time.monotonic() - started:.1f}s"
+        )
+
+    def random_date(self, after=None):
+        """
+        Возвращает случайную дату в пределах периода генерации.
+
+        Args:
+            after (datetime | None): Дата, не раньше которой должен быть результат.
+
+        Returns:
+            datetime: Сгенерированная дата.
+        """
+        if after is None:
+            return self.now - timedelta(seconds=self.rng.uniform(0, self.period))
+        span = (self.now - after).total_seconds()
+        return after + timedelta(seconds=self.rng.uniform(0, span))
+
+    def count(self, average: int) -> int:
+        """
+        Возвращает случайное количество объектов со средним `average`.
+
+        Args:
+            average (int): Среднее количество.
+
+        Returns:
+            int: Количество объектов.
+        """
+        return self.rng.randint(0, 2 * average)
+
+    def bulk_create(self, model: type[Model], objects: Iterable, **kwargs) -> int:
+        """
+        Сохраняет объекты порциями по `--batch-size`.
+
+        Args:
+            model (type[Model]): Модель объектов.
+            objects (Iterable): Объекты модели.
+            **kwargs: Дополнительные параметры `bulk_create`.
+
+        Returns:
+            int: Количество переданных объектов.
+        """
+        total = 0
+        for batch in batched(objects, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size, **kwargs)
+            total += len(batch)
+        self.rows += total
+        return total
+
+    def create_users(self, number: int, password: str, seed: int) -> dict[int, str]:
+        """
+        Создаёт пользователей с одним и тем же заранее захешированным паролем.
+
+        Returns:
+            dict[int, str]: Имена созданных пользователей по их идентификаторам.
+        """
+        with self.stage("Users"):
+            prefix = f"gen{seed}_{time.strftime('%Y%m%d%H%M%S')}"
+            self.prefix = f"{prefix}_"
+            password = make_password(password)
+            self.bulk_create(
+                CustomUser,
+                (
+                    CustomUser(
+                        email=f"{prefix}_{i}@example.com",
+                        username=f"user{i}_{prefix}",
+                        password=password,
+                        email_verified=True,
+                        last_login=self.random_date(),
+                    )
+                    for i in range(number)
+                ),
+            )
+            return dict(
+                CustomUser.objects.filter(email__startswith=self.prefix)
+                .order_by("pk")
+                .values_list("pk", "username")
+            )
+
+    def create_follows(
+        self, usernames: dict[int, str], average: int, exponent: float
+    ) -> dict[int, list[int]]:
+        """
+        Создаёт подписки и уведомления о них. Пользователь, на которого
+        подписываются, выбирается с вероятностью, обратно пропорциональной
+        его рангу популярности в степени `exponent`.
+
+        Returns:
+            dict[int, list[int]]: Пользователи, на которых подписан каждый
+                пользователь.
+        """
+        user_ids = list(usernames)
+        popular = user_ids[:]
+        self.rng.shuffle(popular)
+        cum_weights = list(
+            accumulate(1 / (rank + 1) ** exponent for rank in range(len(popular)))
+        )
+        following = {}
+        for user_id in user_ids:
+            k = int(self.rng.expovariate(1 / average)) if average else 0
+            k = min(len(user_ids) - 1, k)
+            targets = set(self.rng.choices(popular, cum_weights=cum_weights, k=k))
+            targets.discard(user_id)
+            following[user_id] = list(targets)
+
+        edges = [(f, t) for f, targets in following.items() for t in targets]
+        links = {
+            user_id: f'<a href="{reverse("posts:home", kwargs={"pk": user_id})}">'
+            f"{username}</a>"
+            for user_id, username in usernames.items()
+        }
+        with self.stage("Follows"):
+            self.bulk_create(
+                Subscription,
+                (Subscription(follower_id=f, following_id=t) for f, t in edges),
+            )
+        # `bulk_create` не вызывает сигналы, поддерживающие счётчик подписчиков
+        with self.stage("Follower counts"):
+            for ids in batched(user_ids, self.batch_size):
+                CustomUser.objects.filter(pk__in=ids).reconcile_follower_counts()
+        with self.stage("Notifications"), explicit_dates(
+            Notification._meta.get_field("created_at")
+        ):
+            self.bulk_create(
+                Notification,
+                (
+                    Notification(
+                        user_id=t,
+                        topic="Подписка",
+                        message=f"{links[f]} подписался на вас.",
+                        created_at=self.random_date(),
+                        is_read=self.rng.random() < 0.8,
+                    )
+                    for f, t in edges
+                ),
+            )
+        return following
+
+    def text(self, words: int) -> str:
+        """
+        Возвращает случайный текст из заданного количества слов.
+        """
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def create_posts(self, user_ids: list[int], average: int) -> list[tuple]:
+        """
+        Создаёт посты пользователей.
+
+        Returns:
+            list[tuple]: Идентификатор, автор и дата создания каждого поста.
+        """
+        with self.stage("Posts"), explicit_dates(Post._meta.get_field("created_at")):
+            self.bulk_create(
+                Post,
+                (
+                    Post(
+                        user_id=user_id,
+                        content=self.text(self.rng.randint(3, 40)),
+                        created_at=self.random_date(),
+                    )
+                    for user_id in user_ids
+                    for _ in range(self.count(average))
+                ),
+            )
+            return list(
+                Post.objects.filter(user__email__startswith=self.prefix).values_list(
+                    "pk", "user_id", "created_at"
+                )
+            )
+
+    def create_comments(
+        self, user_ids: list[int], posts: list[tuple], average: int
+    ) -> None:
+        """
+        Создаёт комментарии случайных пользователей к постам.
+        """
+        with self.stage("Comments"), explicit_dates(
+            Comment._meta.get_field("created_at")
+        ):
+            self.bulk_create(
+                Comment,
+                (
+                    Comment(
+                        post_id=post_id,
+                        user_id=self.rng.choice(user_ids),
+                        content=self.text(self.rng.randint(1, 15)),
+                        created_at=self.random_date(after=created_at),
+                    )
+                    for post_id, _, created_at in posts
+                    for _ in range(self.count(average))
+                ),
+            )
+
+    def create_likes(self, user_ids: list[int], posts: list[tuple], average: int):
+        """
+        Создаёт лайки постов случайными пользователями.
+        """
+        through = Post.liked_by.through
+        with self.stage("Likes"):
+            self.bulk_create(
+                through,
+                (
+                    through(post_id=post_id, customuser_id=user_id)
+                    for post_id, _, _ in posts
+                    for user_id in self.rng.sample(
+                        user_ids, min(len(user_ids), self.count(average))
+                    )
+                ),
+            )
+
+    def create_messages(
+        self, user_ids: list[int], following: dict[int, list[int]], average: int
+    ) -> None:
+        """
+        Создаёт сообщения пользователей тем, на кого они подписаны.
+        """
+        with self.stage("Messages"), explicit_dates(
+            Message._meta.get_field("timestamp")
+        ):
+            self.bulk_create(
+                Message,
+                (
+                    Message(
+                        sender_id=user_id,
+                        recipient_id=self.rng.choice(following[user_id]),
+                        content=self.text(self.rng.randint(1, 20)),
+                        timestamp=self.random_date(),
+                    )
+                    for user_id in user_ids
+                    if following[user_id]
+                    for _ in range(self.count(average))
+                ),
+            )
+
+    def create_feed_items(
+        self, following: dict[int, list[int]], posts: list[tuple]
+    ) -> None:
+        """
+        Заполняет ленты так же, как это сделала бы рассылка `fan_out_post`:
+        посты попадают в ленты автора и его подписчиков, кроме постов авторов
+        с числом подписчиков не меньше `FEED_FANOUT_FOLLOWER_THRESHOLD`,
+        которые подмешиваются при чтении.
+        """
+        followers = {}
+        for follower, targets in following.items():
+            for target in targets:
+                followers.setdefault(target, []).append(follower)
+        threshold = settings.FEED_FANOUT_FOLLOWER_THRESHOLD
+        with self.stage("Feed items"):
+            self.bulk_create(
+                FeedItem,
+                (
+                    FeedItem(user_id=user_id, post_id=post_id, created_at=created_at)
+                    for post_id, author_id, created_at in posts
+                    for user_id in (
+                        [author_id]
+                        if len(followers.get(author_id, ())) >= threshold
+                        else [author_id, *followers.get(author_id, ())]
+                    )
+                ),
+                ignore_conflicts=True,
+            )
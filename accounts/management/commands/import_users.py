@@ -0,0 +1,135 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.models import CustomUser
+from utils.batching import batched
+
+
+class Command(BaseCommand):
+    """
+    Команда управления Django, импортирующая пользователей из CSV-файла с
+    колонками `email`, `username` и `password` (пароль в открытом виде).
+    Пользователи с пустым паролем получают непригодный для входа пароль и
+    могут задать его через восстановление пароля.
+
+    Хеширование паролей (PBKDF2) занимает основное время импорта и нагружает
+    только процессор, поэтому пароли каждой порции хешируются параллельно в
+    пуле процессов, а пользователи сохраняются одним `bulk_create` на порцию.
+    Адреса, которые уже есть в базе или повторяются в файле, пропускаются до
+    хеширования, а `ON CONFLICT DO NOTHING` защищает от пользователей, созданных
+    параллельно с импортом.
+    """
+
+    help = "Imports users from a CSV file with email, username and password columns."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Добавляет аргументы команды.
+
+        Args:
+            parser: Синтаксический анализатор аргументов
+        """
+        parser.add_argument("path", help="Path to the CSV file")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="The number of processes hashing passwords",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="The number of users hashed and inserted at once",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Импортирует пользователей и выводит скорость импорта.
+        """
+        workers = options["workers"]
+        started = time.monotonic()
+        created = skipped = 0
+        with (
+            open(options["path"], newline="", encoding="utf-8") as file,
+            ProcessPoolExecutor(workers, initializer=django.setup) as executor,
+        ):
+            for rows in batched(csv.DictReader(file), options["chunk_size"]):
+                users = self.new_users(rows)
+                skipped += len(rows) - len(users)
+                hashes = executor.map(
+                    make_password,
+                    [user.password for user in users],
+                    chunksize=max(1, len(users) // (workers * 4)),
+                )
+                for user, password in zip(users, hashes):
+                    user.password = password
+                inserted = self.insert(users)
+                created += inserted
+                skipped += len(users) - inserted
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{created} users imported, {skipped} skipped "
+                    f"({created / elapsed:.1f} users/s)"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created} users in {time.monotonic() - started:.1f}s"
+            )
+        )
+
+    def insert(self, users: list[CustomUser]) -> int:
+        """
+        Сохраняет пользователей, пропуская адреса, занятые параллельно с
+        импортом.
+
+        Args:
+            users (list[CustomUser]): Пользователи с захешированными паролями.
+
+        Returns:
+            int: Количество действительно созданных пользователей.
+        """
+        CustomUser.objects.bulk_create(users, ignore_conflicts=True)
+        # `bulk_create` с `ignore_conflicts` не сообщает, какие строки вставлены.
+        # Хеши паролей содержат случайную соль, поэтому совпадение хеша
+        # отличает созданного импортом пользователя от занявшего его адрес.
+        return CustomUser.objects.filter(
+            email__in=[user.email for user in users],
+            password__in=[user.password for user in users],
+        ).count()
+
+    def new_users(self, rows: list[dict]) -> list[CustomUser]:
+        """
+        Создаёт несохранённых пользователей для строк, адресов которых ещё нет
+        в базе данных. Поле `password` пока содержит пароль в открытом виде
+        или None, если пароль в строке пустой (`make_password` создаёт для
+        него непригодный для входа хеш).
+
+        Args:
+            rows (list[dict]): Строки CSV-файла.
+
+        Returns:
+            list[CustomUser]: Новые пользователи.
+        """
+        users = {}
+        for row in rows:
+            email = CustomUser.objects.normalize_email(row["email"])
+            if email and email not in users:
+                users[email] = CustomUser(
+                    email=email,
+                    username=row["username"],
+                    password=row["password"] or None,
+                )
+        existing = CustomUser.objects.filter(email__in=users).values_list(
+            "email", flat=True
+        )
+        for email in existing:
+            del users[email]
+        return list(users.values())
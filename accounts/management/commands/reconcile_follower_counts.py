@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand
+
+from accounts.tasks import reconcile_follower_counts
+
+
+class Command(BaseCommand):
+    """
+    Ставит в очередь сверку счётчиков подписчиков всех пользователей.
+
+    Сама сверка выполняется воркером Dramatiq пачками (см.
+    `accounts.tasks.reconcile_follower_counts`), поэтому команда завершается
+    сразу.
+
+    Attributes:
+        help (str): Описание команды для помощи.
+    """
+
+    help = (
+        "Enqueues reconciliation of user follower counters. "
+        "Call this daily (with cron or smth similar)."
+    )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Отправляет задачу сверки счётчиков, начиная с первого пользователя.
+        """
+        reconcile_follower_counts.send()
+        self.stdout.write("Enqueued follower counts reconciliation")
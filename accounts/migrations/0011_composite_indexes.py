@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:41
+
+from django.db import migrations, models
+
+from utils.db import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0010_customuser_bot_description"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="subscription",
+            index=models.Index(
+                fields=["following", "id"], name="subscription_following_idx"
+            ),
+        ),
+    ]
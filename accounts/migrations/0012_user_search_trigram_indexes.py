@@ -0,0 +1,33 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from utils.db import RunSQLIfPostgres
+
+
+def trigram_index_sql(column: str) -> RunSQLIfPostgres:
+    """
+    Создаёт триграммный GIN-индекс по `UPPER(column)` без блокировки таблицы
+    на запись. Выражение совпадает с тем, что Django генерирует для `icontains`.
+    """
+    name = f"accounts_customuser_{column}_trgm_idx"
+    return RunSQLIfPostgres(
+        sql=(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON accounts_customuser USING gin (UPPER({column}) gin_trgm_ops);"
+        ),
+        reverse_sql=f"DROP INDEX CONCURRENTLY IF EXISTS {name};",
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0011_composite_indexes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        trigram_index_sql("username"),
+        trigram_index_sql("email"),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from utils.db import AddIndexConcurrentlyIfPostgres
+
+# Количество пользователей, счётчики которых заполняются одним UPDATE
+BACKFILL_BATCH_SIZE = 5000
+
+
+def backfill_follower_count(apps, schema_editor):
+    """
+    Заполняет счётчики подписчиков существующих пользователей пачками по
+    диапазонам первичного ключа, чтобы не держать блокировку всей таблицы.
+    """
+    CustomUser = apps.get_model("accounts", "CustomUser")
+    Subscription = apps.get_model("accounts", "Subscription")
+    followers = (
+        Subscription.objects.filter(following=OuterRef("pk"))
+        .order_by()
+        .values("following")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    users = CustomUser.objects.using(schema_editor.connection.alias)
+    last_id = users.order_by("-pk").values_list("pk", flat=True).first() or 0
+    for start in range(0, last_id, BACKFILL_BATCH_SIZE):
+        users.filter(pk__gt=start, pk__lte=start + BACKFILL_BATCH_SIZE).update(
+            follower_count=Coalesce(Subquery(followers), 0)
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0012_user_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="follower_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            backfill_follower_count, migrations.RunPython.noop, atomic=False
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="customuser",
+            index=models.Index(
+                fields=["follower_count"], name="user_follower_count_idx"
+            ),
+        ),
+    ]
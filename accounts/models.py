@@ -3,11 +3,44 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import connections, models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
 
+from utils.models import AtomicFieldsMixin
 
-class CustomUserManager(BaseUserManager):
+
+class CustomUserQuerySet(models.QuerySet):
+    """
+    Набор запросов для модели CustomUser.
+    """
+
+    def reconcile_follower_counts(self) -> int:
+        """
+        Пересчитывает счётчики `follower_count` по фактическим подпискам и
+        исправляет только тех пользователей, у которых они разошлись.
+
+        Returns:
+            int: Количество исправленных пользователей.
+        """
+        followers = (
+            Subscription.objects.filter(following=OuterRef("pk"))
+            .order_by()
+            .values("following")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        actual_followers = Coalesce(Subquery(followers), 0)
+        return (
+            self.alias(actual_followers=actual_followers)
+            .exclude(follower_count=F("actual_followers"))
+            .update(follower_count=actual_followers)
+        )
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     """
     Менеджер пользовательской модели пользователя, где адрес электронной почты является
     уникальным идентификатором для аутентификации вместо имен пользователей.
@@ -53,6 +86,33 @@ class CustomUserManager(BaseUserManager):
         extra_fields.setdefault("is_superuser", True)
         return self.create_user(email, password, **extra_fields)
 
+    def search(self, query: str) -> models.QuerySet:
+        """
+        Ищет пользователей, имя или адрес электронной почты которых содержат
+        строку запроса.
+
+        На PostgreSQL поиск подстроки использует триграммные GIN-индексы по
+        `UPPER(username)` и `UPPER(email)`, а результаты упорядочиваются по
+        триграммному сходству с запросом (наиболее похожие первыми). На
+        остальных СУБД результаты упорядочиваются по имени.
+
+        Args:
+            query: строка поиска
+
+        Returns:
+            QuerySet: найденные пользователи
+        """
+        users = self.get_queryset().filter(
+            Q(username__icontains=query) | Q(email__icontains=query)
+        )
+        if connections[users.db].vendor != "postgresql":
+            return users.order_by("username", "pk")
+        return users.annotate(
+            similarity=Greatest(
+                TrigramSimilarity("username", query), TrigramSimilarity("email", query)
+            )
+        ).order_by("-similarity", "username", "pk")
+
 
 def user_avatar_path(instance: "CustomUser", filename: str) -> str:
     """
@@ -70,7 +130,7 @@ def user_avatar_path(instance: "CustomUser", filename: str) -> str:
     )
 
 
-class CustomUser(AbstractBaseUser, PermissionsMixin):
+class CustomUser(AtomicFieldsMixin, AbstractBaseUser, PermissionsMixin):
     """
     Модель пользователя, наследуемая от AbstractBaseUser и PermissionsMixin.
 
@@ -90,6 +150,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         temp_email (EmailField): Временный адрес электронной почты для проверки
             электронной почты.
         date_joined (DateTimeField): Дата и время создания учетной записи пользователя.
+        follower_count (PositiveIntegerField): Количество подписчиков пользователя.
         USERNAME_FIELD (str): Поле, которое будет использоваться в качестве уникального
             идентификатора для аутентификации (электронная почта).
         REQUIRED_FIELDS (list): Поля, которые будут запрашиваться
@@ -120,11 +181,22 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     date_joined = models.DateTimeField(auto_now_add=True)
 
+    # Денормализованный счётчик, поддерживаемый сигналами Subscription
+    follower_count = models.PositiveIntegerField(default=0)
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
     objects = CustomUserManager()
 
+    # Поля, которые изменяются только атомарными UPDATE с F()-выражениями
+    ATOMIC_FIELDS = ("follower_count",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["follower_count"], name="user_follower_count_idx"),
+        ]
+
     def __str__(self):
         """
         Example:
@@ -201,6 +273,9 @@ class Subscription(models.Model):
 
     class Meta:
         unique_together = ("follower", "following")
+        indexes = [
+            models.Index(fields=["following", "id"], name="subscription_following_idx"),
+        ]
 
     def __str__(self):
         """
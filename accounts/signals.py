@@ -0,0 +1,42 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CustomUser, Subscription
+
+
+@receiver(post_save, sender=Subscription)
+def increment_follower_count(
+    sender: Subscription, instance: Subscription, created: bool, **kwargs
+) -> None:
+    """
+    Атомарно увеличивает счётчик подписчиков пользователя при подписке на него.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (Subscription).
+        instance (Subscription): Сохранённая подписка.
+        created (bool): True, если подписка была создана.
+        **kwargs: Дополнительные параметры.
+    """
+    if created:
+        CustomUser.objects.filter(pk=instance.following_id).update(
+            follower_count=F("follower_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Subscription)
+def decrement_follower_count(
+    sender: Subscription, instance: Subscription, **kwargs
+) -> None:
+    """
+    Атомарно уменьшает счётчик подписчиков пользователя при отписке от него.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (Subscription).
+        instance (Subscription): Удалённая подписка.
+        **kwargs: Дополнительные параметры.
+    """
+    CustomUser.objects.filter(pk=instance.following_id).update(
+        follower_count=Greatest(F("follower_count") - 1, 0)
+    )
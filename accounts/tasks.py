@@ -1,6 +1,9 @@
 import dramatiq
 from django.conf import settings
 from django.core.mail import send_mail
+from loguru import logger
+
+from accounts.models import CustomUser
 
 
 @dramatiq.actor
@@ -38,3 +41,37 @@ def send_confirmation_email(
         recipient_list,
         fail_silently=False,
     )
+
+
+@dramatiq.actor
+def reconcile_follower_counts(start_id: int = 0, batch_size: int = 1000) -> None:
+    """
+    Сверяет денормализованные счётчики подписчиков пользователей с
+    фактическими подписками.
+
+    Счётчики поддерживаются сигналами, но расходятся с данными при массовых
+    операциях в обход сигналов (например, `bulk_create` подписок). Задача
+    обрабатывает пользователей пачками по возрастанию идентификатора и ставит
+    в очередь саму себя для следующей пачки.
+
+    Args:
+        start_id (int): Идентификатор, после которого начинается пачка.
+        batch_size (int): Количество пользователей в одной пачке.
+    """
+    user_ids = list(
+        CustomUser.objects.filter(pk__gt=start_id)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not user_ids:
+        return
+    fixed = CustomUser.objects.filter(pk__in=user_ids).reconcile_follower_counts()
+    if fixed:
+        logger.warning(
+            "Fixed follower counts of {} users in ({}, {}]",
+            fixed,
+            start_id,
+            user_ids[-1],
+        )
+    if len(user_ids) == batch_size:
+        reconcile_follower_counts.send(user_ids[-1], batch_size)
@@ -1,12 +1,26 @@
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.messages import get_messages
+from django.core.management import call_command
+from django.db.models import F
 from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from chat.models import Message
+from feed.models import FeedItem
+from posts.models import Comment, Post
+from tests.support import QueryBudgetMixin
+
 from .forms import ChangeEmailForm, CustomLoginForm
+from .management.commands.import_users import Command
+from .models import Subscription
+from .tasks import reconcile_follower_counts
 
 
 class LoginViewTestCase(TestCase):
@@ -231,3 +245,205 @@ class ConfirmEmailViewTestCase(TestCase):
         self.assertTrue(
             str(messages[0]).startswith("Ссылка для подтверждения недействительна")
         )
+
+
+class FollowerCountTest(TestCase):
+    """
+    Тесты денормализованного счётчика подписчиков пользователя.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора и двух подписчиков.
+        """
+        self.author, self.reader1, self.reader2 = (
+            get_user_model().objects.create_user(
+                email=f"{username}@example.com", password="password", username=username
+            )
+            for username in ("author", "reader1", "reader2")
+        )
+
+    def assertFollowerCount(self, count: int) -> None:
+        """
+        Проверяет значение счётчика подписчиков автора в базе данных.
+        """
+        self.author.refresh_from_db(fields=["follower_count"])
+        self.assertEqual(self.author.follower_count, count)
+
+    def test_follow_and_unfollow(self):
+        """
+        Проверяет, что подписка и отписка изменяют счётчик, а повторная
+        подписка его не меняет.
+        """
+        self.reader1.follow(self.author)
+        self.reader1.follow(self.author)
+        self.reader2.follow(self.author)
+        self.assertFollowerCount(2)
+
+        self.reader1.unfollow(self.author)
+        self.assertFollowerCount(1)
+
+        self.reader2.delete()
+        self.assertFollowerCount(0)
+
+    def test_stale_save_keeps_follower_count(self):
+        """
+        Проверяет, что сохранение объекта, загруженного до подписки, не
+        сбрасывает счётчик.
+        """
+        stale = get_user_model().objects.get(pk=self.author.pk)
+        self.reader1.follow(self.author)
+        stale.username = "renamed"
+        stale.save()
+        self.assertFollowerCount(1)
+        self.author.refresh_from_db(fields=["username"])
+        self.assertEqual(self.author.username, "renamed")
+
+    def test_reconcile_follower_counts_fixes_drift(self):
+        """
+        Проверяет, что задача сверки исправляет счётчики, разошедшиеся с
+        подписками, созданными в обход сигналов, обрабатывая пользователей
+        пачками.
+        """
+        Subscription.objects.bulk_create(
+            [
+                Subscription(follower=self.reader1, following=self.author),
+                Subscription(follower=self.author, following=self.reader2),
+            ]
+        )
+        get_user_model().objects.filter(pk=self.reader1.pk).update(follower_count=5)
+
+        with patch("accounts.tasks.reconcile_follower_counts.send") as mock_send:
+            reconcile_follower_counts(batch_size=2)
+            reconcile_follower_counts(*mock_send.call_args.args)
+
+        self.assertFollowerCount(1)
+        counts = dict(get_user_model().objects.values_list("pk", "follower_count"))
+        self.assertEqual(counts[self.reader1.pk], 0)
+        self.assertEqual(counts[self.reader2.pk], 1)
+
+    def test_reconcile_follower_counts_command(self):
+        """
+        Проверяет, что команда ставит в очередь сверку с первого пользователя.
+        """
+        with patch("accounts.tasks.reconcile_follower_counts.send") as mock_send:
+            call_command("reconcile_follower_counts", stdout=StringIO())
+        mock_send.assert_called_once_with()
+
+
+class GenerateSocialGraphCommandTest(TestCase):
+    """
+    Тесты для команды generate_social_graph.
+    """
+
+    def test_generate(self):
+        """
+        Проверяет, что команда создаёт пользователей с рабочим паролем и
+        связанные с ними объекты, а счётчики постов и подписчиков совпадают
+        с данными.
+        """
+        call_command("generate_social_graph", 30, "--seed", "1", stdout=StringIO())
+
+        users = get_user_model().objects.all()
+        self.assertEqual(users.count(), 30)
+        self.assertTrue(users.first().check_password("password"))
+        for model in (Subscription, Post, Comment, Message, FeedItem):
+            self.assertTrue(model.objects.exists(), model.__name__)
+        self.assertTrue(Post.liked_by.through.objects.exists())
+        self.assertEqual(Post.objects.reconcile_counters(), 0)
+        self.assertEqual(users.reconcile_follower_counts(), 0)
+        self.assertTrue(users.filter(follower_count__gt=0).exists())
+        self.assertFalse(Subscription.objects.filter(follower=F("following")).exists())
+
+
+class ImportUsersCommandTest(TestCase):
+    """
+    Тесты для команды import_users.
+    """
+
+    def test_import(self):
+        """
+        Проверяет, что команда создаёт пользователей с захешированными паролями
+        и пропускает адреса, которые уже есть в базе или повторяются в файле.
+        """
+        get_user_model().objects.create_user(
+            email="existing@example.com", password="old", username="existing"
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(
+                "email,username,password\n"
+                "first@example.com,first,secret1\n"
+                "existing@example.com,existing,new\n"
+                "second@example.com,second,secret2\n"
+                "first@example.com,first,secret3\n"
+            )
+            file.flush()
+            stdout = StringIO()
+            call_command("import_users", file.name, "--workers", "2", stdout=stdout)
+
+        users = get_user_model().objects.in_bulk(field_name="email")
+        self.assertEqual(len(users), 3)
+        self.assertTrue(users["first@example.com"].check_password("secret1"))
+        self.assertTrue(users["second@example.com"].check_password("secret2"))
+        self.assertTrue(users["existing@example.com"].check_password("old"))
+        self.assertIn("Imported 2 users", stdout.getvalue())
+
+    def test_empty_password(self):
+        """
+        Проверяет, что пользователь с пустым паролем в файле получает
+        непригодный для входа пароль.
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write("email,username,password\nfirst@example.com,first,\n")
+            file.flush()
+            call_command("import_users", file.name, "--workers", "1", stdout=StringIO())
+
+        user = get_user_model().objects.get(email="first@example.com")
+        self.assertFalse(user.has_usable_password())
+        self.assertFalse(user.check_password(""))
+
+    def test_concurrent_conflict(self):
+        """
+        Проверяет, что пользователь, созданный параллельно с импортом с тем же
+        адресом, не учитывается как импортированный.
+        """
+        new_users = Command.new_users
+
+        def new_users_with_race(command, rows):
+            users = new_users(command, rows)
+            get_user_model().objects.create_user(
+                email="first@example.com", password="other", username="other"
+            )
+            return users
+
+        with (
+            tempfile.NamedTemporaryFile("w", suffix=".csv") as file,
+            patch.object(Command, "new_users", new_users_with_race),
+        ):
+            file.write(
+                "email,username,password\n"
+                "first@example.com,first,secret1\n"
+                "second@example.com,second,secret2\n"
+            )
+            file.flush()
+            stdout = StringIO()
+            call_command("import_users", file.name, "--workers", "2", stdout=stdout)
+
+        user = get_user_model().objects.get(email="first@example.com")
+        self.assertTrue(user.check_password("other"))
+        self.assertIn("1 users imported, 1 skipped", stdout.getvalue())
+        self.assertIn("Imported 1 users", stdout.getvalue())
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов админ-панели пользователей.
+    """
+
+    def test_admin_changelist(self):
+        """
+        Проверяет количество запросов списка пользователей в админ-панели.
+        """
+        self.client.force_login(self.admin)
+        url = reverse("admin:accounts_customuser_changelist")
+        self.assertQueryBudget(7, lambda: self.client.get(url))
@@ -0,0 +1,153 @@
+import asyncio
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.test import Client
+
+from accounts.models import CustomUser
+
+
+class ASGIResponse:
+    """
+    Ответ ASGI-приложения.
+
+    Attributes:
+        status (int): Код ответа.
+        headers (list[tuple[bytes, bytes]]): Заголовки ответа.
+        body (bytes): Тело ответа.
+    """
+
+    def __init__(self, status: int, headers: list, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class ASGIClient:
+    """
+    HTTP-клиент, вызывающий ASGI-приложение напрямую, без сети.
+
+    Запросы проходят через все слои приложения (маршрутизацию, middleware,
+    сессии), но не через сокеты и сервер, поэтому замеры отражают время работы
+    самого приложения. Клиент хранит cookies между запросами так же, как
+    браузер.
+
+    Attributes:
+        application: ASGI-приложение.
+        cookies (SimpleCookie): Cookies клиента.
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.cookies = SimpleCookie()
+
+    def force_login(self, user: CustomUser) -> None:
+        """
+        Авторизует клиент от имени пользователя без проверки пароля.
+
+        Args:
+            user (CustomUser): Пользователь.
+        """
+        client = Client()
+        client.force_login(user)
+        self.cookies.update(client.cookies)
+
+    async def get(self, path: str, data: dict | None = None) -> ASGIResponse:
+        """
+        Выполняет GET-запрос.
+
+        Args:
+            path (str): Путь страницы.
+            data (dict | None): Параметры строки запроса.
+
+        Returns:
+            ASGIResponse: Ответ приложения.
+        """
+        return await self.request("GET", path, query=urlencode(data or {}))
+
+    async def post(self, path: str, data: dict) -> ASGIResponse:
+        """
+        Отправляет форму POST-запросом вместе с CSRF-токеном из cookies.
+
+        Args:
+            path (str): Путь страницы.
+            data (dict): Поля формы.
+
+        Returns:
+            ASGIResponse: Ответ приложения.
+        """
+        if "csrftoken" in self.cookies:
+            data = {"csrfmiddlewaretoken": self.cookies["csrftoken"].value, **data}
+        return await self.request(
+            "POST",
+            path,
+            body=urlencode(data).encode(),
+            headers=[(b"content-type", b"application/x-www-form-urlencoded")],
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        query: str = "",
+        body: bytes = b"",
+        headers: list | None = None,
+    ) -> ASGIResponse:
+        """
+        Выполняет HTTP-запрос к приложению.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь страницы.
+            query (str): Строка запроса.
+            body (bytes): Тело запроса.
+            headers (list | None): Дополнительные заголовки.
+
+        Returns:
+            ASGIResponse: Ответ приложения.
+        """
+        headers = [
+            (b"host", b"127.0.0.1"),
+            (b"content-length", str(len(body)).encode()),
+            *(headers or []),
+        ]
+        if self.cookies:
+            cookie = "; ".join(f"{k}={m.value}" for k, m in self.cookies.items())
+            headers.append((b"cookie", cookie.encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {"status": None, "headers": [], "body": []}
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Клиент не отключается: приложение отменит ожидание само.
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.application(scope, receive, send)
+        for name, value in response["headers"]:
+            if name.lower() == b"set-cookie":
+                self.cookies.load(value.decode("latin-1"))
+        return ASGIResponse(
+            response["status"], response["headers"], b"".join(response["body"])
+        )
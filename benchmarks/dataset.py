@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from importlib import import_module
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+
+from accounts.models import CustomUser
+
+
+@contextmanager
+def isolated_database():
+    """
+    Создаёт для замеров отдельную пустую базу данных с применёнными миграциями
+    (так же, как это делает запуск тестов) и удаляет её по завершении.
+    Рабочие данные при этом не затрагиваются.
+    """
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def generate_dataset(size: int, seed: int) -> str:
+    """
+    Заполняет базу данных воспроизводимым социальным графом командой
+    `generate_social_graph`.
+
+    Args:
+        size (int): Количество пользователей.
+        seed (int): Зерно генератора случайных чисел.
+
+    Returns:
+        str: Префикс адресов электронной почты созданных пользователей.
+    """
+    call_command("generate_social_graph", size, seed=seed, stdout=StringIO())
+    return (
+        CustomUser.objects.filter(email__startswith=f"gen{seed}_")
+        .latest("pk")
+        .email.rpartition("_")[0]
+        + "_"
+    )
+
+
+def get_actors(prefix: str) -> dict[str, CustomUser]:
+    """
+    Выбирает пользователей, от имени и для которых выполняются запросы.
+
+    Выбираются самые тяжёлые для страниц пользователи: автор с наибольшим
+    числом подписчиков, читатель с наибольшим числом подписок и его самый
+    частый собеседник.
+
+    Args:
+        prefix (str): Префикс адресов электронной почты сгенерированных
+            пользователей.
+
+    Returns:
+        dict[str, CustomUser]: Пользователи с ключами `author`, `reader` и
+            `partner`.
+    """
+    users = CustomUser.objects.filter(email__startswith=prefix)
+    author = users.annotate(n=Count("followers")).order_by("-n", "pk").first()
+    reader = users.annotate(n=Count("following")).order_by("-n", "pk").first()
+    partner = (
+        users.filter(received_messages__sender=reader)
+        .annotate(n=Count("received_messages"))
+        .order_by("-n", "pk")
+        .first()
+    )
+    return {"author": author, "reader": reader, "partner": partner or author}
+
+
+def create_session(user: CustomUser) -> str:
+    """
+    Создаёт сессию авторизованного пользователя без проверки пароля.
+
+    Args:
+        user (CustomUser): Пользователь.
+
+    Returns:
+        str: Ключ сессии для cookie `sessionid`.
+    """
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return session.session_key
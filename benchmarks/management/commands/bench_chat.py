@@ -0,0 +1,447 @@
+import asyncio
+import json
+import random
+import re
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand, CommandError
+from django.core.management.base import CommandParser
+from django.test import override_settings
+from loguru import logger
+
+from accounts.models import CustomUser
+from benchmarks.dataset import create_session, isolated_database
+from benchmarks.mock_gpt import LATENCY_DISTRIBUTIONS, MockGPTServer
+from benchmarks.stats import (
+    cpu_seconds,
+    current_rss_mb,
+    get_environment,
+    peak_rss_mb,
+    save_results,
+    summarize,
+)
+from radiance.asgi import application
+from ratelimit.limiter import RateLimiter
+from utils import gpt
+
+MESSAGE_ID = re.compile(r"bench:(\d+)")
+OPTIONS = (
+    "clients",
+    "bot_share",
+    "rate",
+    "duration",
+    "connect_concurrency",
+    "timeout",
+    "llm_latency",
+    "llm_latency_ms",
+    "llm_token_delay_ms",
+    "llm_error_rate",
+    "llm_rate_limit",
+    "seed",
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда управления Django, нагружающая чат множеством одновременных
+    WebSocket-соединений.
+
+    В отдельной базе данных создаются пользователи и бот. Каждый клиент
+    подключается к `/ws/chat/<user_id>/` через ASGI-приложение
+    `radiance.asgi` (с авторизацией по cookie сессии) и держит соединение
+    открытым. Люди разбиты на пары собеседников, доля клиентов `--bot-share`
+    переписывается с ботом. Сообщения отправляются случайными клиентами с
+    постоянной общей частотой `--rate` в течение `--duration` секунд,
+    независимо от того, успевает ли приложение их доставлять.
+
+    Измеряются время подключения, задержка доставки сообщения собеседнику,
+    задержка ответа бота, доля ошибок (неудачные подключения и сообщения,
+    не доставленные за `--timeout` секунд), загрузка процессора и память
+    процесса. Уровень каналов заменяется на `InMemoryChannelLayer`, а бот
+    обращается к локальной заглушке API генерации текста (`MockGPTServer`),
+    поэтому команда не требует RabbitMQ и сети. Общая квота запросов к API
+    задаётся `--llm-rate-limit` и по умолчанию снята, чтобы замер показывал
+    задержки чата, а не ожидание квоты. Клиенты и заглушка работают в
+    том же процессе, поэтому показатели процессора и памяти включают и их
+    накладные расходы.
+    """
+
+    help = "Load tests the chat WebSocket consumer with many simulated clients."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Добавляет аргументы команды.
+
+        Args:
+            parser: Синтаксический анализатор аргументов
+        """
+        parser.add_argument(
+            "--clients", type=int, default=1000, help="Concurrent WebSockets"
+        )
+        parser.add_argument(
+            "--bot-share",
+            type=float,
+            default=0.1,
+            help="Share of clients chatting with a bot",
+        )
+        parser.add_argument(
+            "--rate", type=float, default=100, help="Messages per second in total"
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Sending time in seconds"
+        )
+        parser.add_argument(
+            "--connect-concurrency",
+            type=int,
+            default=100,
+            help="Connections opened at the same time",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10,
+            help="Seconds to wait for deliveries after sending stops",
+        )
+        parser.add_argument(
+            "--llm-latency",
+            choices=LATENCY_DISTRIBUTIONS,
+            default="exponential",
+            help="Distribution of the mock LLM time to the first token",
+        )
+        parser.add_argument(
+            "--llm-latency-ms",
+            type=float,
+            default=500,
+            help="Mean mock LLM time to the first token in milliseconds",
+        )
+        parser.add_argument(
+            "--llm-token-delay-ms",
+            type=float,
+            default=20,
+            help="Mock LLM time to generate each next word in milliseconds",
+        )
+        parser.add_argument(
+            "--llm-error-rate",
+            type=float,
+            default=0.0,
+            help="Share of failing mock LLM requests",
+        )
+        parser.add_argument(
+            "--llm-rate-limit",
+            type=float,
+            default=0,
+            help="LLM requests per second allowed by the rate limiter, 0 for no limit",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Save the results to a JSON file")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Выполняет нагрузочный тест, выводит и сохраняет его результаты.
+        """
+        with isolated_database():
+            results = self.load_test(options)
+        self.write_results(results)
+        if options["output"]:
+            save_results(
+                options["output"],
+                {
+                    "environment": get_environment(),
+                    "options": {key: options[key] for key in OPTIONS},
+                    "results": results,
+                },
+            )
+
+    def load_test(self, options: dict) -> dict:
+        """
+        Выполняет нагрузочный тест на текущей базе данных с уровнем каналов в
+        памяти и заглушкой API генерации текста.
+
+        Args:
+            options (dict): Параметры команды.
+
+        Returns:
+            dict: Результаты нагрузочного теста.
+        """
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        channel_layers = {
+            "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+        }
+        # Ответ заглушки начинается с сообщения пользователя, чтобы по нему
+        # можно было найти исходное сообщение.
+        server = MockGPTServer(
+            latency=options["llm_latency"],
+            latency_ms=options["llm_latency_ms"],
+            token_delay_ms=options["llm_token_delay_ms"],
+            error_rate=options["llm_error_rate"],
+            echo=True,
+            seed=options["seed"],
+        )
+        rate_limiter = RateLimiter(
+            "bench-yagpt",
+            options["llm_rate_limit"],
+            settings.YAGPT_RATE_BURST,
+            settings.YAGPT_RATE_RESERVE,
+        )
+        server.start()
+        try:
+            with (
+                override_settings(
+                    CHANNEL_LAYERS=channel_layers,
+                    YAGPT_URL=server.url,
+                    YAGPT_RATE_LIMIT=options["llm_rate_limit"],
+                ),
+                mock.patch.object(gpt, "rate_limiter", rate_limiter),
+            ):
+                # Отладочные сообщения на каждое сообщение искажают замер.
+                logger.disable("chat")
+                logger.disable("utils.gpt")
+                try:
+                    return async_to_sync(self.run)(self.create_clients())
+                finally:
+                    logger.enable("chat")
+                    logger.enable("utils.gpt")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def create_clients(self) -> list[dict]:
+        """
+        Создаёт пользователей, бота и сессии клиентов и распределяет клиентов
+        по собеседникам.
+
+        Returns:
+            list[dict]: Клиенты с ключами `user_id`, `partner_id`, `session`
+                и `bot` (переписывается ли клиент с ботом).
+        """
+        number = self.options["clients"]
+        password = make_password(None)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                email=f"bench{i}@example.com",
+                username=f"bench{i}",
+                password=password,
+            )
+            for i in range(number)
+        )
+        bot = CustomUser.objects.create(
+            email="bench-bot@example.com",
+            username="bench-bot",
+            password=password,
+            is_bot=True,
+            bot_description="Ты участник нагрузочного теста.",
+        )
+        bots = round(number * self.options["bot_share"])
+        clients = [
+            {"user_id": user.pk, "partner_id": bot.pk, "bot": True}
+            for user in users[:bots]
+        ]
+        humans = users[bots:]
+        for first, second in zip(humans[::2], humans[1::2]):
+            clients.append({"user_id": first.pk, "partner_id": second.pk, "bot": False})
+            clients.append({"user_id": second.pk, "partner_id": first.pk, "bot": False})
+        users = {user.pk: user for user in users}
+        for client in clients:
+            client["session"] = create_session(users[client["user_id"]])
+        return clients
+
+    async def run(self, clients: list[dict]) -> dict:
+        """
+        Подключает клиентов, отправляет сообщения и собирает показатели.
+
+        Args:
+            clients (list[dict]): Клиенты из `create_clients`.
+
+        Returns:
+            dict: Результаты нагрузочного теста.
+        """
+        options = self.options
+        self.sent_at, self.delivered = {}, {"delivery": [], "bot_reply": []}
+        self.kinds, self.bot_errors = {}, 0
+        self.first_token = {}
+        rss_before = current_rss_mb()
+
+        semaphore = asyncio.Semaphore(options["connect_concurrency"])
+        connect_latencies = []
+        started = time.perf_counter()
+        communicators = await asyncio.gather(
+            *(self.connect(client, semaphore, connect_latencies) for client in clients)
+        )
+        connect_elapsed = time.perf_counter() - started
+        connected = [
+            (client, communicator)
+            for client, communicator in zip(clients, communicators)
+            if communicator is not None
+        ]
+        if not connected:
+            raise CommandError(
+                f"None of {len(clients)} clients connected in {connect_elapsed:.1f}s"
+            )
+        rss_connected = current_rss_mb()
+        readers = [
+            asyncio.create_task(self.read(client, communicator))
+            for client, communicator in connected
+        ]
+
+        cpu_started, started = cpu_seconds(), time.perf_counter()
+        total = int(options["rate"] * options["duration"])
+        tasks = []
+        for message_id in range(total):
+            delay = started + message_id / options["rate"] - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            client, communicator = self.rng.choice(connected)
+            tasks.append(
+                asyncio.create_task(self.send(message_id, client, communicator))
+            )
+        await asyncio.gather(*tasks)
+        send_elapsed = time.perf_counter() - started
+
+        deadline = time.perf_counter() + options["timeout"]
+        while len(self.sent_at) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        cpu = cpu_seconds() - cpu_started
+
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        await asyncio.gather(
+            *(communicator.disconnect() for _, communicator in connected),
+            return_exceptions=True,
+        )
+
+        lost = {"delivery": 0, "bot_reply": 0}
+        for message_id in self.sent_at:
+            lost[self.kinds[message_id]] += 1
+        return {
+            "clients": len(clients),
+            "connected": len(connected),
+            "connect": summarize(connect_latencies, connect_elapsed),
+            "connect_seconds": round(connect_elapsed, 3),
+            "messages": total,
+            "bot_errors": self.bot_errors,
+            "send_rate": round(total / send_elapsed, 2) if send_elapsed else 0.0,
+            "bot_first_token": summarize(list(self.first_token.values()), elapsed),
+            **{
+                kind: {**summarize(latencies, elapsed), "lost": lost[kind]}
+                for kind, latencies in self.delivered.items()
+            },
+            "error_rate": round(
+                (len(clients) - len(connected) + sum(lost.values()))
+                / max(len(clients) + total, 1),
+                4,
+            ),
+            "cpu_percent": round(100 * cpu / elapsed, 1) if elapsed else 0.0,
+            "rss_before_mb": rss_before,
+            "rss_connected_mb": rss_connected,
+            "rss_end_mb": current_rss_mb(),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    async def connect(
+        self, client: dict, semaphore: asyncio.Semaphore, latencies: list
+    ) -> WebsocketCommunicator | None:
+        """
+        Подключает клиента к чату с его собеседником.
+
+        Returns:
+            WebsocketCommunicator | None: Открытое соединение или None, если
+                подключиться не удалось.
+        """
+        communicator = WebsocketCommunicator(
+            application,
+            f"/ws/chat/{client['partner_id']}/",
+            headers=[(b"cookie", f"sessionid={client['session']}".encode())],
+        )
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                connected, _ = await communicator.connect(
+                    timeout=self.options["timeout"]
+                )
+            except Exception:  # noqa: PIE786
+                connected = False
+            latencies.append(time.perf_counter() - started)
+        return communicator if connected else None
+
+    async def send(
+        self, message_id: int, client: dict, communicator: WebsocketCommunicator
+    ) -> None:
+        """
+        Отправляет сообщение собеседнику клиента и запоминает время отправки.
+        """
+        self.kinds[message_id] = "bot_reply" if client["bot"] else "delivery"
+        self.sent_at[message_id] = time.perf_counter()
+        await communicator.send_to(
+            text_data=json.dumps(
+                {
+                    "message": f"bench:{message_id}",
+                    "receiver_id": client["partner_id"],
+                    "sender_id": client["user_id"],
+                    "time": time.strftime("%H:%M"),
+                }
+            )
+        )
+
+    async def read(self, client: dict, communicator: WebsocketCommunicator) -> None:
+        """
+        Читает сообщения, приходящие клиенту, и фиксирует задержку доставки
+        сообщений от собеседника, первой части ответа бота и всего ответа.
+        Собственные сообщения клиента, которые консьюмер рассылает и
+        отправителю, пропускаются.
+        """
+        while True:
+            event = json.loads(await communicator.receive_from(timeout=None))
+            if event["sender_id"] == client["user_id"]:
+                continue
+            match = MESSAGE_ID.search(event["message"])
+            if event.get("partial"):
+                message_id = int(match.group(1)) if match else None
+                if message_id in self.sent_at and message_id not in self.first_token:
+                    self.first_token[message_id] = (
+                        time.perf_counter() - self.sent_at[message_id]
+                    )
+                continue
+            if match is None:
+                # Ответ бота об ошибке API не содержит исходного сообщения.
+                self.bot_errors += 1
+                continue
+            sent_at = self.sent_at.pop(int(match.group(1)), None)
+            if sent_at is not None:
+                self.delivered[self.kinds[int(match.group(1))]].append(
+                    time.perf_counter() - sent_at
+                )
+
+    def write_results(self, results: dict) -> None:
+        """
+        Выводит результаты нагрузочного теста.
+        """
+        connect = results["connect"]
+        self.stdout.write(
+            f"Connections: {results['connected']}/{results['clients']} "
+            f"in {results['connect_seconds']:.1f}s, "
+            f"p50 {connect['p50_ms']:.1f} ms, p99 {connect['p99_ms']:.1f} ms"
+        )
+        self.stdout.write(
+            f"Messages: {results['messages']} sent at {results['send_rate']:.1f}/s, "
+            f"{results['bot_errors']} bot error replies"
+        )
+        for kind in ("delivery", "bot_first_token", "bot_reply"):
+            row = {"lost": 0, **results[kind]}
+            self.stdout.write(
+                f"{kind:<15} {row['requests']:>7} received  {row['lost']:>5} lost  "
+                f"p50 {row['p50_ms']:8.1f} ms  p95 {row['p95_ms']:8.1f} ms  "
+                f"p99 {row['p99_ms']:8.1f} ms  max {row['max_ms']:8.1f} ms"
+            )
+        self.stdout.write(
+            f"Error rate: {results['error_rate']:.2%}  CPU: {results['cpu_percent']}%  "
+            f"RSS: {results['rss_before_mb']} -> {results['rss_connected_mb']} -> "
+            f"{results['rss_end_mb']} MB (process peak {results['peak_rss_mb']} MB)"
+        )
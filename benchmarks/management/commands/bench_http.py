@@ -0,0 +1,256 @@
+import time
+from typing import Awaitable, Callable
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.core.management.base import CommandParser
+from django.db import connection
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from benchmarks.client import ASGIClient, ASGIResponse
+from benchmarks.dataset import generate_dataset, get_actors, isolated_database
+from benchmarks.stats import (
+    QueryCounter,
+    compare_results,
+    current_rss_mb,
+    get_environment,
+    load_results,
+    peak_rss_mb,
+    save_results,
+    summarize,
+)
+from radiance.asgi import application
+
+SCENARIOS = ("profile", "chat", "subs_search", "notifications", "login")
+
+
+class Command(BaseCommand):
+    """
+    Команда управления Django, измеряющая производительность основных страниц
+    на воспроизводимых наборах данных разного размера.
+
+    Для каждого размера создаётся отдельная база данных, заполняемая командой
+    `generate_social_graph` с заданным `--seed`. Запросы выполняются
+    последовательно внутри процесса через ASGI-приложение `radiance.asgi`, без
+    сети. Для каждого сценария выводятся перцентили задержки p50/p95/p99,
+    пропускная способность, число запросов к базе данных на HTTP-запрос и
+    пиковый RSS процесса.
+
+    Результаты можно сохранить в JSON (`--output`) и сравнить с результатами
+    другого коммита (`--compare`): при регрессии команда завершается с
+    ошибкой.
+    """
+
+    help = "Benchmarks the main pages in-process through the ASGI application."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Добавляет аргументы команды.
+
+        Args:
+            parser: Синтаксический анализатор аргументов
+        """
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[100, 1000],
+            help="Dataset sizes in users",
+        )
+        parser.add_argument(
+            "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Measured requests per scenario",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=20,
+            help="Unmeasured requests before each scenario",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Save the results to a JSON file")
+        parser.add_argument(
+            "--compare", help="Compare the results with a previously saved JSON file"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Allowed relative p95 growth when comparing",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Выполняет замеры, выводит, сохраняет и сравнивает их результаты.
+        """
+        if settings.DEBUG:
+            self.stderr.write(
+                self.style.WARNING(
+                    "DEBUG is on: query logging and the debug toolbar distort "
+                    "the results."
+                )
+            )
+        results = []
+        for size in options["sizes"]:
+            with isolated_database():
+                prefix = generate_dataset(size, options["seed"])
+                actors = get_actors(prefix)
+                for scenario in options["scenarios"]:
+                    result = {
+                        "size": size,
+                        "scenario": scenario,
+                        **self.run_scenario(
+                            scenario, actors, options["requests"], options["warmup"]
+                        ),
+                    }
+                    self.write_result(result)
+                    results.append(result)
+
+        if options["output"]:
+            save_results(
+                options["output"],
+                {
+                    "environment": get_environment(),
+                    "options": {
+                        key: options[key]
+                        for key in ("sizes", "scenarios", "requests", "warmup", "seed")
+                    },
+                    "results": results,
+                },
+            )
+        if options["compare"]:
+            baseline = load_results(options["compare"])["results"]
+            self.compare(baseline, results, options["threshold"])
+
+    def make_scenario(
+        self, name: str, actors: dict[str, CustomUser]
+    ) -> tuple[Callable[[], Awaitable[ASGIResponse]], int]:
+        """
+        Создаёт запрос сценария.
+
+        Args:
+            name (str): Название сценария.
+            actors (dict[str, CustomUser]): Пользователи из `get_actors`.
+
+        Returns:
+            tuple: Асинхронная функция, выполняющая один запрос, и ожидаемый
+                код ответа.
+        """
+        client = ASGIClient(application)
+        reader, author = actors["reader"], actors["author"]
+        if name == "login":
+            url = reverse("accounts:login")
+
+            async def login():
+                if "csrftoken" not in client.cookies:
+                    await client.get(url)
+                return await client.post(
+                    url, {"email": reader.email, "password": "password"}
+                )
+
+            return login, 302
+
+        client.force_login(author if name == "notifications" else reader)
+        if name == "profile":
+            url, data = reverse("posts:home", kwargs={"pk": author.pk}), None
+        elif name == "chat":
+            url = reverse("chat:chat", kwargs={"user_id": actors["partner"].pk})
+            data = None
+        elif name == "subs_search":
+            url, data = reverse("subs:subs"), {"q": "user1"}
+        else:
+            url, data = reverse("notifications:notifications"), None
+        return lambda: client.get(url, data), 200
+
+    def run_scenario(
+        self, name: str, actors: dict[str, CustomUser], requests: int, warmup: int
+    ) -> dict:
+        """
+        Выполняет сценарий и измеряет его показатели.
+
+        Args:
+            name (str): Название сценария.
+            actors (dict[str, CustomUser]): Пользователи из `get_actors`.
+            requests (int): Количество измеряемых запросов.
+            warmup (int): Количество предварительных неизмеряемых запросов.
+
+        Returns:
+            dict: Показатели `summarize`, количество ошибок, число запросов к
+                базе данных на HTTP-запрос, рост RSS за сценарий (None, если
+                текущий RSS недоступен) и пиковый RSS процесса, накопленный
+                всеми сценариями до этого включительно.
+        """
+        call, expected_status = self.make_scenario(name, actors)
+        counter = QueryCounter()
+        rss_before = current_rss_mb()
+
+        async def measure():
+            for _ in range(warmup):
+                await call()
+            counter.queries = 0
+            latencies, errors = [], 0
+            started = time.perf_counter()
+            for _ in range(requests):
+                request_started = time.perf_counter()
+                response = await call()
+                latencies.append(time.perf_counter() - request_started)
+                errors += response.status != expected_status
+            return latencies, errors, time.perf_counter() - started
+
+        # Синхронные представления выполняются в этом же потоке, поэтому
+        # обёртка соединения видит все их запросы.
+        with connection.execute_wrapper(counter):
+            latencies, errors, elapsed = async_to_sync(measure)()
+        rss_after = current_rss_mb()
+        return {
+            **summarize(latencies, elapsed),
+            "errors": errors,
+            "queries_per_request": round(counter.queries / max(requests, 1), 2),
+            "rss_growth_mb": (
+                round(rss_after - rss_before, 1)
+                if rss_before is not None and rss_after is not None
+                else None
+            ),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def write_result(self, result: dict) -> None:
+        """
+        Выводит результаты сценария.
+        """
+        growth = result["rss_growth_mb"]
+        growth = "n/a" if growth is None else f"{growth:+.1f}"
+        self.stdout.write(
+            f"{result['size']:>7} users  {result['scenario']:<14}"
+            f"p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  {result['throughput_rps']:8.1f} req/s  "
+            f"{result['queries_per_request']:6.1f} queries  "
+            f"RSS {growth:>6} MB "
+            f"(process peak {result['peak_rss_mb']:.1f} MB)  {result['errors']} errors"
+        )
+
+    def compare(self, baseline: list[dict], results: list[dict], threshold: float):
+        """
+        Выводит сравнение с базовыми результатами и завершает команду с
+        ошибкой при регрессиях.
+        """
+        rows = compare_results(baseline, results, threshold)
+        for row in rows:
+            line = (
+                f"{row['size']:>7} users  {row['scenario']:<14}"
+                f"p95 {row['p95_before']:8.2f} -> {row['p95_after']:8.2f} ms "
+                f"({row['p95_change']:+.1%})  queries "
+                f"{row['queries_before']} -> {row['queries_after']}"
+            )
+            style = self.style.ERROR if row["regression"] else self.style.SUCCESS
+            self.stdout.write(style(line))
+        regressions = sum(row["regression"] for row in rows)
+        if regressions:
+            raise CommandError(f"{regressions} scenarios regressed")
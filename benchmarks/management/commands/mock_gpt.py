@@ -0,0 +1,83 @@
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+
+from benchmarks.mock_gpt import LATENCY_DISTRIBUTIONS, MockGPTServer
+
+
+class Command(BaseCommand):
+    """
+    Команда управления Django, запускающая локальную заглушку API генерации
+    текста (см. `MockGPTServer`). Чтобы приложение обращалось к ней вместо
+    YandexGPT, укажите выведенный адрес в переменной окружения `YAGPT_URL`.
+    """
+
+    help = "Runs a local mock of the YandexGPT completion API."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Добавляет аргументы команды.
+
+        Args:
+            parser: Синтаксический анализатор аргументов
+        """
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8001)
+        parser.add_argument(
+            "--latency",
+            choices=LATENCY_DISTRIBUTIONS,
+            default="exponential",
+            help="Distribution of the time to the first token",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=500,
+            help="Mean time to the first token in milliseconds",
+        )
+        parser.add_argument(
+            "--sigma",
+            type=float,
+            default=0.5,
+            help="Shape of the lognormal distribution",
+        )
+        parser.add_argument(
+            "--token-delay-ms",
+            type=float,
+            default=20,
+            help="Time to generate each next word in milliseconds",
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Share of failing requests"
+        )
+        parser.add_argument(
+            "--error-status", type=int, default=500, help="Status of failed requests"
+        )
+        parser.add_argument(
+            "--echo",
+            action="store_true",
+            help="Start every reply with the user message",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        """
+        Запускает сервер и обслуживает запросы до прерывания.
+        """
+        server = MockGPTServer(
+            (options["host"], options["port"]),
+            latency=options["latency"],
+            latency_ms=options["latency_ms"],
+            sigma=options["sigma"],
+            token_delay_ms=options["token_delay_ms"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+            echo=options["echo"],
+            seed=options["seed"],
+        )
+        self.stdout.write(f"Mock GPT is listening, set YAGPT_URL={server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,281 @@
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "да конечно интересно согласен думаю сегодня вечером погода отличная "
+    "расскажи подробнее как дела спасибо хорошо давно не виделись музыка кино "
+    "книга прогулка работа отдых выходные планы новости"
+).split()
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+
+def sample_latency(
+    rng: random.Random, distribution: str, mean_ms: float, sigma: float
+) -> float:
+    """
+    Возвращает случайную задержку с заданным распределением и средним.
+
+    Args:
+        rng (random.Random): Генератор случайных чисел.
+        distribution (str): Одно из `LATENCY_DISTRIBUTIONS`.
+        mean_ms (float): Среднее значение задержки в миллисекундах.
+        sigma (float): Параметр формы логнормального распределения: чем он
+            больше, тем тяжелее хвост.
+
+    Returns:
+        float: Задержка в секундах.
+    """
+    if mean_ms <= 0:
+        return 0.0
+    if distribution == "constant":
+        latency = mean_ms
+    elif distribution == "uniform":
+        latency = rng.uniform(0, 2 * mean_ms)
+    elif distribution == "exponential":
+        latency = rng.expovariate(1 / mean_ms)
+    else:
+        latency = rng.lognormvariate(math.log(mean_ms) - sigma**2 / 2, sigma)
+    return latency / 1000
+
+
+def completion_chunk(text: str, status: str, input_tokens: int) -> dict:
+    """
+    Строит ответ в формате API генерации текста YandexGPT.
+
+    Args:
+        text (str): Сгенерированный к этому моменту текст.
+        status (str): Статус альтернативы (`ALTERNATIVE_STATUS_PARTIAL` или
+            `ALTERNATIVE_STATUS_FINAL`).
+        input_tokens (int): Количество токенов запроса.
+
+    Returns:
+        dict: Тело ответа.
+    """
+    completion_tokens = len(text.split())
+    return {
+        "result": {
+            "alternatives": [
+                {"message": {"role": "assistant", "text": text}, "status": status}
+            ],
+            "usage": {
+                "inputTextTokens": str(input_tokens),
+                "completionTokens": str(completion_tokens),
+                "totalTokens": str(input_tokens + completion_tokens),
+            },
+            "modelVersion": "mock",
+        }
+    }
+
+
+class MockGPTServer(ThreadingHTTPServer):
+    """
+    Локальная заглушка API генерации текста YandexGPT для нагрузочных тестов.
+
+    Принимает те же запросы, что и `utils.gpt.make_request`, и отвечает в том
+    же формате, который разбирает `utils.gpt.format_text`. Каждый запрос
+    обрабатывается в отдельном потоке, поэтому медленные ответы не задерживают
+    друг друга.
+
+    Время до первого токена выбирается из распределения `latency`, после чего
+    каждое следующее слово ответа генерируется за `token_delay_ms`. В режиме
+    `stream` ответ отдаётся построчно (NDJSON), как это делает настоящий API:
+    каждая строка содержит весь сгенерированный к этому моменту текст.
+    Текст ответа и задержки определяются `seed` и порядковым номером запроса,
+    поэтому последовательные прогоны воспроизводимы.
+
+    Attributes:
+        latency (str): Распределение задержки до первого токена.
+        latency_ms (float): Средняя задержка до первого токена.
+        sigma (float): Параметр формы логнормального распределения.
+        token_delay_ms (float): Задержка генерации каждого следующего слова.
+        error_rate (float): Доля запросов, завершающихся ошибкой.
+        error_status (int): Код ответа при ошибке.
+        echo (bool): Начинать ли ответ с текста сообщения пользователя.
+        malformed (bool): Вставлять ли перед последней строкой потокового
+            ответа строки, которые не разбираются как ответ API.
+        seed (int): Зерно генератора случайных чисел.
+        requests (int): Количество полученных запросов.
+        connections (int): Количество принятых TCP-соединений.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        latency: str = "exponential",
+        latency_ms: float = 500,
+        sigma: float = 0.5,
+        token_delay_ms: float = 20,
+        error_rate: float = 0.0,
+        error_status: int = HTTPStatus.INTERNAL_SERVER_ERROR,
+        echo: bool = False,
+        malformed: bool = False,
+        seed: int = 0,
+    ):
+        super().__init__(address, MockGPTHandler)
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.token_delay_ms = token_delay_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.echo = echo
+        self.malformed = malformed
+        self.seed = seed
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """
+        Returns:
+            str: Адрес для настройки `YAGPT_URL`.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/foundationModels/v1/completion"
+
+    def next_rng(self) -> random.Random:
+        """
+        Возвращает генератор случайных чисел для очередного запроса.
+
+        Returns:
+            random.Random: Генератор, зависящий от `seed` и номера запроса.
+        """
+        with self._lock:
+            self.requests += 1
+            return random.Random(f"{self.seed}:{self.requests}")
+
+    def handle_error(self, request, client_address):
+        """
+        Не выводит ошибки соединений, закрытых клиентом, например отменённых
+        дублирующих запросов.
+        """
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def start(self) -> threading.Thread:
+        """
+        Запускает сервер в фоновом потоке.
+
+        Returns:
+            threading.Thread: Поток сервера.
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class MockGPTHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов к `MockGPTServer`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: MockGPTServer
+
+    def setup(self):
+        """
+        Учитывает новое соединение.
+        """
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        """
+        Отключает вывод каждого запроса в stderr.
+        """
+
+    def do_POST(self):
+        """
+        Обрабатывает запрос генерации текста.
+        """
+        server = self.server
+        rng = server.next_rng()
+        try:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            options = body.get("completionOptions", {})
+            messages = body["messages"]
+        except (TypeError, ValueError, KeyError):
+            self.send_json(HTTPStatus.BAD_REQUEST, self.error_body(400, "Bad request"))
+            return
+
+        time.sleep(sample_latency(rng, server.latency, server.latency_ms, server.sigma))
+        if rng.random() < server.error_rate:
+            self.send_json(
+                server.error_status, self.error_body(server.error_status, "Mock error")
+            )
+            return
+
+        user_text = messages[-1].get("text", "")
+        input_tokens = sum(len(m.get("text", "").split()) for m in messages)
+        max_tokens = max(1, int(options.get("maxTokens", 100)))
+        words = rng.choices(WORDS, k=min(max_tokens, rng.randint(5, 30)))
+        words[0] = words[0].capitalize()
+        words[-1] += rng.choice(".!?")
+        if server.echo:
+            words.insert(0, user_text)
+        token_delay = server.token_delay_ms / 1000
+
+        if not options.get("stream"):
+            time.sleep(token_delay * (len(words) - 1))
+            chunk = completion_chunk(
+                " ".join(words), "ALTERNATIVE_STATUS_FINAL", input_tokens
+            )
+            self.send_json(HTTPStatus.OK, chunk)
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for number in range(1, len(words) + 1):
+            if number > 1:
+                time.sleep(token_delay)
+            status = (
+                "ALTERNATIVE_STATUS_FINAL"
+                if number == len(words)
+                else "ALTERNATIVE_STATUS_PARTIAL"
+            )
+            if server.malformed and number == len(words):
+                self.write_chunk(b'{"result": {"alternatives": [\n')
+                self.write_chunk(b'{"error": {"message": "Mock error"}}\n')
+            line = json.dumps(
+                completion_chunk(" ".join(words[:number]), status, input_tokens),
+                ensure_ascii=False,
+            )
+            self.write_chunk(f"{line}\n".encode())
+        self.write_chunk(b"")
+
+    def error_body(self, status: int, message: str) -> dict:
+        """
+        Строит тело ответа об ошибке в формате API.
+        """
+        return {"error": {"httpCode": status, "message": message}}
+
+    def send_json(self, status: int, body: dict) -> None:
+        """
+        Отправляет JSON-ответ.
+        """
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def write_chunk(self, data: bytes) -> None:
+        """
+        Отправляет часть ответа с `Transfer-Encoding: chunked`.
+        """
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
@@ -0,0 +1,197 @@
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+
+class QueryCounter:
+    """
+    Обёртка выполнения запросов (`connection.execute_wrapper`), подсчитывающая
+    запросы к базе данных.
+
+    Attributes:
+        queries (int): Количество выполненных запросов.
+    """
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    """
+    Рассчитывает перцентили задержки и пропускную способность.
+
+    Args:
+        latencies (list[float]): Длительности запросов в секундах.
+        elapsed (float): Общее время выполнения запросов в секундах.
+
+    Returns:
+        dict: Количество запросов, перцентили p50/p95/p99, среднее и
+            максимальное время в миллисекундах и количество запросов в секунду.
+    """
+    milliseconds = sorted(latency * 1000 for latency in latencies)
+    if len(milliseconds) > 1:
+        cuts = statistics.quantiles(milliseconds, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = milliseconds[0] if milliseconds else 0.0
+    return {
+        "requests": len(milliseconds),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "mean_ms": round(statistics.fmean(milliseconds), 3) if milliseconds else 0.0,
+        "max_ms": round(milliseconds[-1], 3) if milliseconds else 0.0,
+        "throughput_rps": round(len(milliseconds) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """
+    Возвращает пиковый объём резидентной памяти процесса.
+
+    Пик накапливается с запуска процесса (`ru_maxrss`) и не уменьшается, поэтому
+    при нескольких замерах в одном процессе он относится ко всем замерам до
+    текущего, а не к последнему. Рост памяти отдельного замера следует
+    считать по `current_rss_mb`.
+
+    Returns:
+        float: Пиковый RSS с запуска процесса в мегабайтах.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # В macOS ru_maxrss измеряется в байтах, в Linux — в килобайтах.
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+
+
+def current_rss_mb() -> float | None:
+    """
+    Возвращает текущий объём резидентной памяти процесса.
+
+    Returns:
+        float | None: RSS в мегабайтах или None, если `/proc` недоступен.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except OSError:
+        return None
+    return round(pages * resource.getpagesize() / 2**20, 1)
+
+
+def cpu_seconds() -> float:
+    """
+    Возвращает процессорное время, затраченное процессом.
+
+    Returns:
+        float: Сумма пользовательского и системного времени в секундах.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def get_environment() -> dict:
+    """
+    Описывает окружение, в котором выполнялись замеры, чтобы результаты разных
+    коммитов можно было сопоставить.
+
+    Returns:
+        dict: Коммит, версии Python и Django, база данных и дата замера.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "debug": settings.DEBUG,
+    }
+
+
+def save_results(path: str, report: dict) -> None:
+    """
+    Сохраняет отчёт о замерах в JSON-файл.
+
+    Args:
+        path (str): Путь к файлу.
+        report (dict): Отчёт с ключами `environment`, `options` и `results`.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """
+    Загружает отчёт о замерах из JSON-файла.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        dict: Отчёт, сохранённый `save_results`.
+    """
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_results(
+    baseline: list[dict], current: list[dict], threshold: float
+) -> list[dict]:
+    """
+    Сравнивает результаты замеров с базовыми.
+
+    Регрессией считается рост p95 больше чем на долю `threshold` или рост
+    числа запросов к базе данных на один HTTP-запрос. Число запросов не
+    зависит от шума измерений, поэтому любой его рост считается регрессией.
+
+    Args:
+        baseline (list[dict]): Базовые результаты.
+        current (list[dict]): Текущие результаты.
+        threshold (float): Допустимый относительный рост p95.
+
+    Returns:
+        list[dict]: Для каждого сценария, присутствующего в обоих замерах:
+            ключ сценария, значения p95 и числа запросов до и после и признак
+            регрессии.
+    """
+    baseline = {(row["size"], row["scenario"]): row for row in baseline}
+    rows = []
+    for row in current:
+        before = baseline.get((row["size"], row["scenario"]))
+        if before is None:
+            continue
+        change = row["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        rows.append(
+            {
+                "size": row["size"],
+                "scenario": row["scenario"],
+                "p95_before": before["p95_ms"],
+                "p95_after": row["p95_ms"],
+                "p95_change": round(change, 4),
+                "queries_before": before["queries_per_request"],
+                "queries_after": row["queries_per_request"],
+                "regression": change > threshold
+                or row["queries_per_request"] > before["queries_per_request"],
+            }
+        )
+    return rows
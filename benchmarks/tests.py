@@ -0,0 +1,231 @@
+import json
+from unittest import mock
+
+import requests
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from chat.models import Message
+from radiance.asgi import application
+from tests.support import MockGPTMixin
+from utils.gpt import amake_request, make_request
+
+from .client import ASGIClient
+from .dataset import generate_dataset, get_actors
+from .management.commands.bench_chat import Command as BenchChatCommand
+from .management.commands.bench_http import SCENARIOS
+from .management.commands.bench_http import Command as BenchHttpCommand
+from .stats import compare_results, summarize
+
+
+class ASGIClientTest(TestCase):
+    """
+    Тесты клиента, вызывающего ASGI-приложение напрямую.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пользователя.
+        """
+        self.user = CustomUser.objects.create_user(
+            email="user@example.com", password="password", username="user"
+        )
+
+    def test_force_login(self):
+        """
+        Проверяет, что авторизованный клиент получает страницу пользователя.
+        """
+        client = ASGIClient(application)
+        client.force_login(self.user)
+        url = reverse("posts:home", kwargs={"pk": self.user.pk})
+        response = async_to_sync(client.get)(url)
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"user", response.body)
+
+    def test_login_form(self):
+        """
+        Проверяет, что клиент хранит cookies и проходит проверку CSRF при
+        отправке формы входа.
+        """
+        client = ASGIClient(application)
+        url = reverse("accounts:login")
+        async_to_sync(client.get)(url)
+        self.assertIn("csrftoken", client.cookies)
+        response = async_to_sync(client.post)(
+            url, {"email": "user@example.com", "password": "password"}
+        )
+        self.assertEqual(response.status, 302)
+        self.assertIn("sessionid", client.cookies)
+
+
+class BenchHttpTest(TestCase):
+    """
+    Тесты команды `bench_http` и расчёта её показателей.
+    """
+
+    def test_summarize(self):
+        """
+        Проверяет расчёт перцентилей и пропускной способности.
+        """
+        summary = summarize([i / 1000 for i in range(1, 101)], elapsed=2.0)
+        self.assertEqual(summary["requests"], 100)
+        self.assertAlmostEqual(summary["p50_ms"], 50.5)
+        self.assertAlmostEqual(summary["p99_ms"], 99.01)
+        self.assertEqual(summary["max_ms"], 100)
+        self.assertEqual(summary["throughput_rps"], 50)
+
+    def test_compare_results(self):
+        """
+        Проверяет, что регрессией считаются рост p95 выше порога и рост числа
+        запросов к базе данных.
+        """
+        baseline = [
+            {"size": 10, "scenario": name, "p95_ms": 10.0, "queries_per_request": 5}
+            for name in ("profile", "chat", "login")
+        ]
+        current = [
+            {"size": 10, "scenario": name, "p95_ms": p95, "queries_per_request": q}
+            for name, p95, q in (
+                ("profile", 10.5, 5),
+                ("chat", 12.0, 5),
+                ("login", 9.0, 6),
+            )
+        ]
+        rows = compare_results(baseline, current, threshold=0.1)
+        self.assertEqual([row["regression"] for row in rows], [False, True, True])
+
+    def test_run_scenarios(self):
+        """
+        Проверяет, что все сценарии выполняются без ошибок на
+        сгенерированных данных и сообщают рост памяти за сценарий.
+        """
+        actors = get_actors(generate_dataset(20, seed=1))
+        command = BenchHttpCommand()
+        for scenario in SCENARIOS:
+            with self.subTest(scenario=scenario):
+                result = command.run_scenario(scenario, actors, requests=2, warmup=1)
+                self.assertEqual(result["requests"], 2)
+                self.assertEqual(result["errors"], 0)
+                self.assertGreater(result["queries_per_request"], 0)
+                self.assertIsInstance(result["rss_growth_mb"], float)
+
+
+class BenchChatTest(TestCase):
+    """
+    Тесты нагрузочного теста чата.
+    """
+
+    def test_load_test(self):
+        """
+        Проверяет, что сообщения доставляются собеседникам, бот отвечает
+        через заглушку API генерации текста, а сообщения сохраняются.
+        """
+        command = BenchChatCommand()
+        options = vars(
+            command.create_parser("manage.py", "bench_chat").parse_args(
+                ["--clients", "10", "--bot-share", "0.2", "--rate", "50"]
+                + ["--duration", "0.2", "--llm-latency-ms", "1", "--timeout", "5"]
+            )
+        )
+        results = command.load_test(options)
+        self.assertEqual(results["connected"], 10)
+        self.assertEqual(results["error_rate"], 0)
+        delivered = results["delivery"]["requests"] + results["bot_reply"]["requests"]
+        self.assertEqual(delivered, 10)
+        self.assertGreater(results["bot_reply"]["requests"], 0)
+        self.assertEqual(
+            results["bot_first_token"]["requests"], results["bot_reply"]["requests"]
+        )
+        self.assertEqual(Message.objects.count(), 10 + results["bot_reply"]["requests"])
+
+    def test_no_connections(self):
+        """
+        Проверяет, что тест завершается ошибкой, если ни один клиент не
+        подключился.
+        """
+        command = BenchChatCommand()
+        options = vars(
+            command.create_parser("manage.py", "bench_chat").parse_args(
+                ["--clients", "2", "--duration", "0.1", "--timeout", "1"]
+            )
+        )
+        with (
+            mock.patch.object(command, "connect", mock.AsyncMock(return_value=None)),
+            self.assertRaisesMessage(CommandError, "None of 2 clients connected"),
+        ):
+            command.load_test(options)
+
+
+class MockGPTServerTest(MockGPTMixin, TestCase):
+    """
+    Тесты локальной заглушки API генерации текста.
+    """
+
+    def test_make_request(self):
+        """
+        Проверяет, что `make_request` обращается к адресу из `YAGPT_URL` и
+        разбирает ответ заглушки, а ответы воспроизводимы при одном зерне.
+        """
+        replies = []
+        for _ in range(2):
+            server = self.start_server(seed=7)
+            with override_settings(YAGPT_URL=server.url):
+                replies.append(make_request("system", "Привет"))
+        self.assertEqual(replies[0], replies[1])
+        self.assertTrue(replies[0].endswith((".", "!", "?")))
+        self.assertEqual(server.requests, 1)
+
+    def test_connection_pool(self):
+        """
+        Проверяет, что последовательные запросы `make_request` и
+        `amake_request` переиспользуют открытое соединение.
+        """
+        server = self.start_server()
+        with override_settings(YAGPT_URL=server.url):
+            for _ in range(3):
+                make_request("system", "Привет")
+            self.assertEqual(server.connections, 1)
+
+            async def request_many():
+                for _ in range(3):
+                    await amake_request("system", "Привет")
+
+            async_to_sync(request_many)()
+        self.assertEqual(server.requests, 6)
+        self.assertEqual(server.connections, 2)
+
+    def test_errors(self):
+        """
+        Проверяет, что при ошибке API `make_request` возвращает сообщение об
+        ошибке.
+        """
+        server = self.start_server(error_rate=1)
+        with override_settings(YAGPT_URL=server.url):
+            self.assertEqual(make_request("system", "Привет"), "Произошла ошибка :(")
+
+    def test_stream(self):
+        """
+        Проверяет, что в режиме потоковой генерации каждая строка ответа
+        содержит весь сгенерированный к этому моменту текст.
+        """
+        server = self.start_server(echo=True)
+        response = requests.post(
+            server.url,
+            json={
+                "completionOptions": {"stream": True, "maxTokens": 10},
+                "messages": [{"role": "user", "text": "Привет"}],
+            },
+            stream=True,
+        )
+        chunks = [json.loads(line) for line in response.iter_lines() if line]
+        texts = [c["result"]["alternatives"][0]["message"]["text"] for c in chunks]
+        statuses = [c["result"]["alternatives"][0]["status"] for c in chunks]
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(texts[0].startswith("Привет"))
+        for previous, text in zip(texts, texts[1:]):
+            self.assertTrue(text.startswith(previous))
+        self.assertEqual(statuses[-1], "ALTERNATIVE_STATUS_FINAL")
+        self.assertEqual(set(statuses[:-1]), {"ALTERNATIVE_STATUS_PARTIAL"})
@@ -1,12 +1,13 @@
 import asyncio
 import json
+import uuid
 
 import loguru
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
 from accounts.models import CustomUser
-from utils.gpt import make_request
+from utils.gpt import ERROR_ANSWER, astream_request, complete_answer
 
 from .models import Message
 
@@ -103,8 +104,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
         участникам группы.
 
         Этот метод проверяет, является ли получатель сообщения ботом, и если это так,
-        он использует GPT для генерации ответа.
-        Затем ответ сохраняется в базе данных и отправляется обратно участникам чата.
+        он использует GPT для генерации ответа. Ответ запрашивается в потоковом
+        режиме: каждая порция текста сразу рассылается участникам чата событием
+        `chat_message_chunk`, поэтому пользователь видит начало ответа, не
+        дожидаясь окончания генерации. Готовый ответ сохраняется в базе данных
+        и рассылается обычным сообщением с тем же `reply_id`. На повторяющиеся
+        сообщения (например, "привет") бот отвечает одним из ранее
+        сгенерированных ответов из кэша.
 
         Args:
             message (str): Сообщение, отправленное пользователем.
@@ -118,21 +124,43 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         if receiver_user.is_bot:
             logger.debug("starting GPT request")
+            reply_id = uuid.uuid4().hex
+            gpt_response = ""
             # Обработка сообщения с использованием GPT
-            gpt_response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                make_request,
-                (
-                    "Ты человек. Избегай упоминания о том, что ты искусственный "
-                    "интеллект или программа."
-                ),  # system_text
-                (
-                    f"{receiver_user.bot_description} Я пишу тебе сообщение, "
-                    f"ответь на него (можешь не здороваться): {message}"
-                ),  # message
-                False,  # stream
-                0.3,  # temperature
-                100,  # max_tokens
+            try:
+                async for gpt_response in astream_request(
+                    (
+                        "Ты человек. Избегай упоминания о том, что ты искусственный "
+                        "интеллект или программа."
+                    ),  # system_text
+                    (
+                        f"{receiver_user.bot_description} Я пишу тебе сообщение, "
+                        f"ответь на него (можешь не здороваться): {message}"
+                    ),  # message
+                    0.3,  # temperature
+                    100,  # max_tokens
+                    True,  # cache
+                    hedge=True,
+                ):
+                    # Отправка части ответа GPT всем участникам группы
+                    await self.channel_layer.group_send(
+                        self.room_group_name,
+                        {
+                            "type": "chat_message_chunk",
+                            "reply_id": reply_id,
+                            "message": gpt_response,
+                            "receiver_id": sender_id,
+                            "sender_id": receiver_id,
+                            "time": time,
+                        },
+                    )
+            except Exception:  # noqa: PIE786
+                # Пользователь получает сообщение об ошибке вместо ответа,
+                # оборванного на середине
+                logger.exception("GPT reply failed")
+                gpt_response = ""
+            gpt_response = (
+                complete_answer(gpt_response) if gpt_response else ERROR_ANSWER
             )
 
             # Сохраняем ответ GPT в базу данных
@@ -146,6 +174,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     "type": "chat_message",
+                    "reply_id": reply_id,
                     "message": gpt_response,
                     "receiver_id": sender_id,
                     "sender_id": receiver_id,
@@ -168,13 +197,35 @@ class ChatConsumer(AsyncWebsocketConsumer):
         sender_id = event["sender_id"]
         time = event["time"]
 
+        data = {
+            "message": message,
+            "receiver_id": receiver_id,
+            "sender_id": sender_id,
+            "time": time,
+        }
+        # Ответ бота заменяет на клиенте свои части с тем же `reply_id`
+        if "reply_id" in event:
+            data["reply_id"] = event["reply_id"]
+        await self.send(text_data=json.dumps(data))
+
+    async def chat_message_chunk(self, event):
+        """
+        Отправляет участнику `группы` часть генерируемого ответа бота.
+
+        Args:
+            event (dict): Данные о событии, содержащие `reply_id`, `message`
+                (весь сгенерированный к этому моменту текст), `receiver_id`,
+                `sender_id` и `time`.
+        """
         await self.send(
             text_data=json.dumps(
                 {
-                    "message": message,
-                    "receiver_id": receiver_id,
-                    "sender_id": sender_id,
-                    "time": time,
+                    "reply_id": event["reply_id"],
+                    "partial": True,
+                    "message": event["message"],
+                    "receiver_id": event["receiver_id"],
+                    "sender_id": event["sender_id"],
+                    "time": event["time"],
                 }
             )
         )
@@ -189,9 +240,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             sender_id (int): Идентификатор отправителя сообщения.
         """
         Message.objects.create(
-            sender=CustomUser.objects.get(id=sender_id),
-            recipient=CustomUser.objects.get(id=receiver_id),
-            content=message,
+            sender_id=sender_id, recipient_id=receiver_id, content=message
         )
 
     def get_custom_user_by_id(self, user_id) -> CustomUser:
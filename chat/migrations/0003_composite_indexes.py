@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+from utils.db import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("chat", "0002_alter_message_sender"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="message",
+            index=models.Index(
+                fields=["sender", "recipient", "timestamp"], name="message_dialog_idx"
+            ),
+        ),
+    ]
@@ -29,6 +29,13 @@ class Message(models.Model):
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["sender", "recipient", "timestamp"], name="message_dialog_idx"
+            ),
+        ]
+
     def __str__(self):
         """Возвращает содержимое сообщения в виде его строкового представления."""
         return self.content
@@ -1,9 +1,19 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
 from django.db.models import Q
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from accounts.models import CustomUser
+from benchmarks.mock_gpt import MockGPTServer
+from tests.support import QueryBudgetMixin
+from utils import gpt
+from utils.response_cache import ResponseCache
 
+from .consumers import ChatConsumer
 from .models import Message
 from .views import get_chat_users
 
@@ -121,3 +131,207 @@ class ChatViewTests(TestCase):
         self.assertQuerySetEqual(
             get_chat_users(self.user1), response.context["chat_users"]
         )
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов страницы чата, её админ-панели и обработки
+    сообщения в WebSocket-консьюмере.
+    """
+
+    def test_chat(self):
+        """
+        Проверяет количество запросов страницы чата.
+        """
+        self.client.force_login(self.user)
+        url = reverse("chat:chat", kwargs={"user_id": self.other.pk})
+        self.assertQueryBudget(6, lambda: self.client.get(url))
+
+    def test_admin_changelist(self):
+        """
+        Проверяет количество запросов списка сообщений в админ-панели.
+        """
+        self.client.force_login(self.admin)
+        url = reverse("admin:chat_message_changelist")
+        self.assertQueryBudget(7, lambda: self.client.get(url))
+
+    def test_consumer_receive(self):
+        """
+        Проверяет количество запросов при отправке сообщения через WebSocket.
+        """
+        self.assertQueryBudget(2, async_to_sync(self.send_message))
+
+    async def send_message(self):
+        """
+        Подключается к чату с `other`, отправляет сообщение и дожидается его
+        рассылки и проверки, является ли получатель ботом.
+        """
+        communicator = WebsocketCommunicator(
+            ChatConsumer.as_asgi(), f"/ws/chat/{self.other.pk}/"
+        )
+        communicator.scope["user"] = self.user
+        communicator.scope["url_route"] = {"kwargs": {"user_id": self.other.pk}}
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await communicator.send_to(
+            text_data=json.dumps(
+                {
+                    "message": "Hello",
+                    "receiver_id": self.other.pk,
+                    "sender_id": self.user.pk,
+                    "time": "12:00",
+                }
+            )
+        )
+        response = json.loads(await communicator.receive_from())
+        self.assertEqual(response["message"], "Hello")
+        await communicator.receive_nothing()
+        await communicator.disconnect()
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class BotReplyStreamTest(TestCase):
+    """
+    Тесты потоковой отправки ответа бота в чат.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пользователя, бота и заглушку API генерации текста.
+        """
+        self.user = CustomUser.objects.create_user(
+            email="user@example.com", password="password", username="user"
+        )
+        self.bot = CustomUser.objects.create_user(
+            email="bot@example.com",
+            password="password",
+            username="bot",
+            is_bot=True,
+            bot_description="Ты любишь музыку.",
+        )
+        self.server = MockGPTServer(latency_ms=0, token_delay_ms=0, echo=True)
+        self.server.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(gpt.breaker.reset)
+        self.addCleanup(gpt.response_cache.clear)
+
+    def test_stream(self):
+        """
+        Проверяет, что части ответа приходят с общим `reply_id` и содержат
+        весь текст к этому моменту, а готовый ответ сохраняется один раз.
+        """
+        with override_settings(YAGPT_URL=self.server.url):
+            events = async_to_sync(self.chat_with_bot)()
+        chunks = [event for event in events if event.get("partial")]
+        reply = events[-1]
+        self.assertGreater(len(chunks), 1)
+        self.assertNotIn("partial", reply)
+        self.assertEqual({c["reply_id"] for c in chunks}, {reply["reply_id"]})
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertTrue(chunk["message"].startswith(previous["message"]))
+        self.assertTrue(reply["message"].startswith(chunks[-1]["message"]))
+        self.assertEqual(reply["sender_id"], self.bot.pk)
+        self.assertEqual(
+            list(Message.objects.filter(sender=self.bot).values_list("content")),
+            [(reply["message"],)],
+        )
+
+    def test_error(self):
+        """
+        Проверяет, что при ошибке API бот отвечает сообщением об ошибке.
+        """
+        self.server.error_rate = 1
+        with override_settings(YAGPT_URL=self.server.url):
+            events = async_to_sync(self.chat_with_bot)()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["message"], "Произошла ошибка :(")
+        self.assertTrue(Message.objects.filter(sender=self.bot).exists())
+
+    def test_malformed_line(self):
+        """
+        Проверяет, что строки потокового ответа не в формате API пропускаются,
+        а ответ бота собирается из остальных строк.
+        """
+        self.server.malformed = True
+        with override_settings(YAGPT_URL=self.server.url):
+            events = async_to_sync(self.chat_with_bot)()
+        reply = events[-1]
+        self.assertNotEqual(reply["message"], "Произошла ошибка :(")
+        self.assertTrue(reply["message"].startswith(events[-2]["message"]))
+        self.assertEqual(
+            list(Message.objects.filter(sender=self.bot).values_list("content")),
+            [(reply["message"],)],
+        )
+
+    def test_reply_exception(self):
+        """
+        Проверяет, что при исключении во время генерации бот отвечает
+        сообщением об ошибке и сохраняет его.
+        """
+
+        async def failing_stream(*args, **kwargs):
+            yield "Начало ответа"
+            raise RuntimeError("stream failed")
+
+        with mock.patch("chat.consumers.astream_request", failing_stream):
+            events = async_to_sync(self.chat_with_bot)()
+        self.assertEqual(events[0]["message"], "Начало ответа")
+        self.assertEqual(events[-1]["message"], "Произошла ошибка :(")
+        self.assertEqual(events[-1]["reply_id"], events[0]["reply_id"])
+        self.assertEqual(
+            list(Message.objects.filter(sender=self.bot).values_list("content")),
+            [("Произошла ошибка :(",)],
+        )
+
+    def test_cached_reply(self):
+        """
+        Проверяет, что на повторяющееся сообщение бот отвечает из кэша
+        одним событием, не обращаясь к API.
+        """
+        with (
+            mock.patch.object(gpt, "response_cache", ResponseCache(10, 60, 1)),
+            override_settings(YAGPT_URL=self.server.url),
+        ):
+            first = async_to_sync(self.chat_with_bot)()
+            second = async_to_sync(self.chat_with_bot)()
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(second[-1]["message"], first[-1]["message"])
+        self.assertEqual(Message.objects.filter(sender=self.bot).count(), 2)
+
+    async def chat_with_bot(self) -> list[dict]:
+        """
+        Отправляет боту сообщение и возвращает события, пришедшие после него,
+        до окончательного ответа бота включительно.
+        """
+        communicator = WebsocketCommunicator(
+            ChatConsumer.as_asgi(), f"/ws/chat/{self.bot.pk}/"
+        )
+        communicator.scope["user"] = self.user
+        communicator.scope["url_route"] = {"kwargs": {"user_id": self.bot.pk}}
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await communicator.send_to(
+            text_data=json.dumps(
+                {
+                    "message": "Привет",
+                    "receiver_id": self.bot.pk,
+                    "sender_id": self.user.pk,
+                    "time": "12:00",
+                }
+            )
+        )
+        self.assertEqual(
+            json.loads(await communicator.receive_from())["message"], "Привет"
+        )
+        events = []
+        while not events or events[-1].get("partial"):
+            events.append(json.loads(await communicator.receive_from(timeout=5)))
+        await communicator.disconnect()
+        return events
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import FeedItem
+
+
+@admin.register(FeedItem)
+class FeedItemAdmin(admin.ModelAdmin):
+    """
+    Конфигурация админки для модели FeedItem.
+
+    Attributes:
+        list_display (tuple): Поля, которые будут отображаться в списке объектов.
+        raw_id_fields (tuple): Внешние ключи, которые редактируются по
+            идентификатору вместо выпадающего списка.
+        readonly_fields (tuple): Поля, доступные только для чтения.
+    """
+
+    list_display = ("id", "user", "post", "created_at")
+    raw_id_fields = ("user", "post")
+    readonly_fields = ("created_at",)
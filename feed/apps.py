@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class FeedConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "feed"
+
+    def ready(self):
+        """
+        Регистрирует сигналы.
+        """
+        import feed.signals  # noqa
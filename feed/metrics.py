@@ -0,0 +1,15 @@
+from prometheus_client import Counter, Histogram
+
+# Метрики собираются в веб-процессе при чтении ленты: рассылка выполняется в
+# процессах воркеров dramatiq, метрики которых `/metrics` не отдаёт
+FEED_POSTS_SERVED = Counter(
+    "radiance_feed_posts_served_total",
+    "Posts served on feed pages, by delivery path (push = read from the inbox "
+    "filled by fan-out on write, pull = merged at read time).",
+    ["path"],
+)
+PULL_AUTHORS_PER_READ = Histogram(
+    "radiance_feed_pull_authors_per_read",
+    "Followed high-follower accounts merged into a feed page at read time.",
+    buckets=(0, 1, 2, 5, 10, 20, 50),
+)
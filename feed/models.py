@@ -0,0 +1,42 @@
+from django.db import models
+
+from accounts.models import CustomUser
+from posts.models import Post
+
+
+class FeedItem(models.Model):
+    """
+    Модель записи во входящей ленте пользователя.
+
+    Лента строится при записи: когда пользователь публикует пост, задача
+    `feed.tasks.fan_out_post` добавляет запись в ленты всех его подписчиков.
+    Чтение ленты сводится к выборке по индексу `(user, -created_at, -post)`
+    без соединения подписок с постами.
+
+    Attributes:
+        user (ForeignKey): Владелец ленты. Связано с моделью CustomUser.
+        post (ForeignKey): Пост, попавший в ленту. Связано с моделью Post.
+        created_at (DateTimeField): Копия даты создания поста, по которой
+            упорядочивается лента.
+    """
+
+    user = models.ForeignKey(
+        CustomUser, related_name="feed_items", on_delete=models.CASCADE
+    )
+    post = models.ForeignKey(Post, related_name="+", on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "post")
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-post"], name="feed_item_inbox_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Example:
+            "Post #1 in feed of user #2"
+        """
+        return f"Post #{self.post_id} in feed of user #{self.user_id}"
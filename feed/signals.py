@@ -0,0 +1,28 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from posts.models import Post
+
+from .tasks import fan_out_post
+
+
+@receiver(post_save, sender=Post)
+def schedule_fan_out(sender: Post, instance: Post, created: bool, **kwargs) -> None:
+    """
+    Ставит в очередь рассылку нового поста по лентам подписчиков автора.
+
+    Задача отправляется после фиксации транзакции, чтобы воркер гарантированно
+    увидел сохранённый пост. Сигнал срабатывает и для постов ботов, созданных
+    задачей `posts.tasks.create_bot_post`.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (Post).
+        instance (Post): Сохранённый пост.
+        created (bool): True, если пост был создан.
+        **kwargs: Дополнительные параметры.
+    """
+    if created:
+        transaction.on_commit(partial(fan_out_post.send, instance.pk))
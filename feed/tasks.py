@@ -0,0 +1,91 @@
+import dramatiq
+from django.conf import settings
+from django.db.models import Q
+
+from accounts.models import Subscription
+from posts.models import Post
+
+from .models import FeedItem
+
+
+@dramatiq.actor
+def fan_out_post(post_id: int, start_id: int = 0) -> None:
+    """
+    Добавляет пост во входящие ленты подписчиков его автора.
+
+    Подписчики обрабатываются пачками по `FEED_FANOUT_BATCH_SIZE` в порядке
+    возрастания идентификатора подписки. После каждой пачки задача ставит в
+    очередь саму себя для следующей, а обрезку лент — отдельной задачей.
+    Первая пачка также добавляет пост в ленту самого автора.
+
+    Если у автора не меньше `FEED_FANOUT_FOLLOWER_THRESHOLD` подписчиков, пост
+    попадает только в его собственную ленту, а подписчики получают его при
+    чтении (см. `feed.views.get_feed_page`), чтобы избежать массовой записи.
+
+    Args:
+        post_id (int): Идентификатор поста.
+        start_id (int): Идентификатор подписки, после которой начинается пачка.
+    """
+    post = (
+        Post.objects.filter(pk=post_id)
+        .select_related("user")
+        .only("user_id", "created_at", "user__follower_count")
+        .first()
+    )
+    if post is None:
+        return
+    batch_size = settings.FEED_FANOUT_BATCH_SIZE
+    if start_id == 0:
+        if post.user.follower_count >= settings.FEED_FANOUT_FOLLOWER_THRESHOLD:
+            FeedItem.objects.get_or_create(
+                user_id=post.user_id,
+                post_id=post_id,
+                defaults={"created_at": post.created_at},
+            )
+            return
+    subscriptions = list(
+        Subscription.objects.filter(following_id=post.user_id, pk__gt=start_id)
+        .order_by("pk")
+        .values_list("pk", "follower_id")[:batch_size]
+    )
+    user_ids = [follower_id for _, follower_id in subscriptions]
+    if start_id == 0:
+        user_ids.append(post.user_id)
+    FeedItem.objects.bulk_create(
+        [
+            FeedItem(user_id=user_id, post_id=post_id, created_at=post.created_at)
+            for user_id in user_ids
+        ],
+        ignore_conflicts=True,
+    )
+    if user_ids:
+        trim_feed_inboxes.send(user_ids)
+    if len(subscriptions) == batch_size:
+        fan_out_post.send(post_id, subscriptions[-1][0])
+
+
+@dramatiq.actor
+def trim_feed_inboxes(user_ids: list[int]) -> None:
+    """
+    Обрезает входящие ленты пользователей до `FEED_INBOX_SIZE` самых новых
+    записей.
+
+    Для каждой ленты одним запросом по индексу находится первая лишняя запись,
+    после чего удаляются она и все более старые.
+
+    Args:
+        user_ids (list[int]): Идентификаторы владельцев лент.
+    """
+    inbox_size = settings.FEED_INBOX_SIZE
+    for user_id in user_ids:
+        boundary = (
+            FeedItem.objects.filter(user_id=user_id)
+            .order_by("-created_at", "-post_id")
+            .values_list("created_at", "post_id")[inbox_size : inbox_size + 1]
+        )
+        for created_at, post_id in boundary:
+            FeedItem.objects.filter(
+                Q(created_at__lt=created_at)
+                | Q(created_at=created_at, post_id__lte=post_id),
+                user_id=user_id,
+            ).delete()
@@ -0,0 +1,215 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from accounts.models import CustomUser, Subscription
+from posts.models import Post
+from posts.views import POSTS_PER_PAGE
+from tests.support import QueryBudgetMixin
+
+from .models import FeedItem
+from .tasks import fan_out_post, trim_feed_inboxes
+from .views import PULL_AUTHORS_CACHE_KEY
+
+
+class FanOutTest(TestCase):
+    """
+    Тесты для рассылки постов по входящим лентам подписчиков.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора и трёх подписчиков.
+        """
+        self.author = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        self.followers = []
+        for i in range(3):
+            follower = CustomUser.objects.create_user(
+                email=f"follower{i}@example.com",
+                password="password",
+                username=f"follower{i}",
+            )
+            Subscription.objects.create(follower=follower, following=self.author)
+            self.followers.append(follower)
+
+    def test_post_creation_schedules_fan_out_on_commit(self):
+        """
+        Проверяет, что рассылка ставится в очередь только после фиксации
+        транзакции, в которой создан пост.
+        """
+        with patch("feed.tasks.fan_out_post.send") as mock_send:
+            with self.captureOnCommitCallbacks(execute=True):
+                post = Post.objects.create(user=self.author, content="Test post")
+                mock_send.assert_not_called()
+        mock_send.assert_called_once_with(post.pk)
+
+    @override_settings(FEED_FANOUT_BATCH_SIZE=2)
+    @patch("feed.tasks.trim_feed_inboxes.send")
+    def test_fan_out_in_batches(self, mock_trim):
+        """
+        Проверяет, что пост попадает в ленты всех подписчиков и автора,
+        а подписчики обрабатываются пачками.
+        """
+        post = Post.objects.create(user=self.author, content="Test post")
+        with patch("feed.tasks.fan_out_post.send") as mock_send:
+            fan_out_post(post.pk)
+            mock_send.assert_called_once()
+            fan_out_post(*mock_send.call_args.args)
+
+        self.assertEqual(
+            set(FeedItem.objects.filter(post=post).values_list("user", flat=True)),
+            {self.author.pk, *(follower.pk for follower in self.followers)},
+        )
+        self.assertEqual(mock_trim.call_count, 2)
+
+    @override_settings(FEED_FANOUT_FOLLOWER_THRESHOLD=3)
+    @patch("feed.tasks.trim_feed_inboxes.send")
+    def test_high_follower_author_is_not_fanned_out(self, mock_trim):
+        """
+        Проверяет, что пост автора с числом подписчиков не меньше порога
+        попадает только в ленту автора.
+        """
+        post = Post.objects.create(user=self.author, content="Test post")
+        fan_out_post(post.pk)
+        self.assertEqual(
+            list(FeedItem.objects.filter(post=post).values_list("user", flat=True)),
+            [self.author.pk],
+        )
+        mock_trim.assert_not_called()
+
+    @override_settings(FEED_INBOX_SIZE=2)
+    def test_trim_feed_inboxes(self):
+        """
+        Проверяет, что в ленте остаются только самые новые записи.
+        """
+        posts = Post.objects.bulk_create(
+            Post(user=self.author, content=f"Post {i}") for i in range(4)
+        )
+        follower = self.followers[0]
+        FeedItem.objects.bulk_create(
+            FeedItem(user=follower, post=post, created_at=post.created_at)
+            for post in posts
+        )
+        trim_feed_inboxes([follower.pk])
+        self.assertEqual(
+            list(
+                FeedItem.objects.filter(user=follower)
+                .order_by("-created_at")
+                .values_list("post", flat=True)
+            ),
+            [posts[3].pk, posts[2].pk],
+        )
+
+
+class FeedViewTest(TestCase):
+    """
+    Тесты для представления ленты и эндпоинта её подгрузки.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пользователя, чья лента содержит больше постов, чем
+        помещается на страницу.
+        """
+        self.author = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        self.reader = CustomUser.objects.create_user(
+            email="reader@example.com", password="password", username="reader"
+        )
+        self.posts = Post.objects.bulk_create(
+            Post(user=self.author, content=f"Post {i}")
+            for i in range(POSTS_PER_PAGE + 2)
+        )
+        FeedItem.objects.bulk_create(
+            FeedItem(user=self.reader, post=post, created_at=post.created_at)
+            for post in self.posts
+        )
+
+    def test_login_required(self):
+        """
+        Проверяет, что лента доступна только авторизованным пользователям.
+        """
+        response = self.client.get(reverse("feed:feed"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_feed_pages(self):
+        """
+        Проверяет, что лента выдаётся от новых постов к старым и что вторая
+        страница содержит оставшиеся посты.
+        """
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse("feed:feed"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "feed/feed.html")
+        posts = response.context["posts"]
+        self.assertEqual(posts, self.posts[::-1][:POSTS_PER_PAGE])
+
+        response = self.client.get(
+            reverse("feed:post_list"), {"cursor": response.context["next_cursor"]}
+        )
+        data = response.json()
+        self.assertIsNone(data["next_cursor"])
+        for post in self.posts[:2]:
+            self.assertIn(f"<p>{post.content}</p>", data["html"])
+
+    @override_settings(FEED_FANOUT_FOLLOWER_THRESHOLD=1)
+    def test_high_follower_posts_merged_at_read_time(self):
+        """
+        Проверяет, что посты подписок с большим числом подписчиков
+        подмешиваются в ленту при чтении в хронологическом порядке, а
+        источники постов страницы учитываются в метриках.
+        """
+        cache.delete(PULL_AUTHORS_CACHE_KEY)
+        celebrity = CustomUser.objects.create_user(
+            email="celebrity@example.com", password="password", username="celebrity"
+        )
+        Subscription.objects.create(follower=self.reader, following=celebrity)
+        pulled_post = Post.objects.create(user=celebrity, content="Pulled post")
+
+        served = {
+            path: REGISTRY.get_sample_value(
+                "radiance_feed_posts_served_total", {"path": path}
+            )
+            or 0
+            for path in ("push", "pull")
+        }
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse("feed:feed"))
+        posts = response.context["posts"]
+        self.assertEqual(posts[0], pulled_post)
+        self.assertEqual(posts[1:], self.posts[::-1][: POSTS_PER_PAGE - 1])
+        for path, count in (("push", POSTS_PER_PAGE - 1), ("pull", 1)):
+            self.assertEqual(
+                REGISTRY.get_sample_value(
+                    "radiance_feed_posts_served_total", {"path": path}
+                ),
+                served[path] + count,
+            )
+        cache.delete(PULL_AUTHORS_CACHE_KEY)
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов ленты и её админ-панели.
+    """
+
+    def test_feed(self):
+        """
+        Проверяет количество запросов страницы ленты.
+        """
+        self.client.force_login(self.user)
+        self.assertQueryBudget(8, lambda: self.client.get(reverse("feed:feed")))
+
+    def test_admin_changelist(self):
+        """
+        Проверяет количество запросов списка элементов лент в админ-панели.
+        """
+        self.client.force_login(self.admin)
+        url = reverse("admin:feed_feeditem_changelist")
+        self.assertQueryBudget(5, lambda: self.client.get(url))
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import FeedPostListView, FeedView
+
+app_name = "feed"
+
+
+urlpatterns = [
+    path("", FeedView.as_view(), name="feed"),
+    path("posts/", FeedPostListView.as_view(), name="post_list"),
+]
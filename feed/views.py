@@ -0,0 +1,157 @@
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.views import View
+
+from accounts.models import CustomUser, Subscription
+from posts.models import Post
+from posts.views import POSTS_PER_PAGE, get_liked_post_ids, prepare_post_cards
+from utils.pagination import encode_cursor, keyset_queryset
+
+from .metrics import FEED_POSTS_SERVED, PULL_AUTHORS_PER_READ
+from .models import FeedItem
+
+PULL_AUTHORS_CACHE_KEY = "feed:pull_author_ids"
+
+
+def get_pull_author_ids() -> set[int]:
+    """
+    Возвращает идентификаторы пользователей, у которых не меньше
+    `FEED_FANOUT_FOLLOWER_THRESHOLD` подписчиков.
+
+    Посты таких пользователей не рассылаются по лентам, а подмешиваются при
+    чтении. Результат кешируется на `FEED_PULL_AUTHORS_CACHE_SECONDS` секунд.
+
+    Returns:
+        set[int]: Идентификаторы пользователей.
+    """
+    author_ids = cache.get(PULL_AUTHORS_CACHE_KEY)
+    if author_ids is None:
+        author_ids = set(
+            CustomUser.objects.filter(
+                follower_count__gte=settings.FEED_FANOUT_FOLLOWER_THRESHOLD
+            ).values_list("pk", flat=True)
+        )
+        cache.set(
+            PULL_AUTHORS_CACHE_KEY,
+            author_ids,
+            settings.FEED_PULL_AUTHORS_CACHE_SECONDS,
+        )
+    return author_ids
+
+
+def get_feed_page(user: CustomUser, cursor: str | None) -> tuple[list, str | None]:
+    """
+    Возвращает одну страницу ленты пользователя, начиная с позиции курсора.
+
+    Страница собирается из двух источников: входящей ленты (посты, разосланные
+    при записи) и постов подписок с большим числом подписчиков, которые
+    подмешиваются при чтении (см. `get_pull_author_ids`). Оба источника
+    читаются по индексам с одним и тем же курсором и сливаются по
+    `(created_at, id)`. Затем посты страницы загружаются одним запросом вместе
+    с авторами и подготавливаются функцией `prepare_post_cards`.
+
+    Args:
+        user (CustomUser): Владелец ленты.
+        cursor (str | None): Курсор, полученный с предыдущей страницы.
+
+    Returns:
+        tuple[list, str | None]: Посты страницы и курсор следующей страницы.
+    """
+    pushed = set(
+        keyset_queryset(
+            FeedItem.objects.filter(user=user), cursor, id_field="post_id"
+        ).values_list("created_at", "post_id")[: POSTS_PER_PAGE + 1]
+    )
+    pulled = set()
+    pull_author_ids = get_pull_author_ids()
+    if pull_author_ids:
+        followed_pull_author_ids = list(
+            Subscription.objects.filter(
+                follower=user, following_id__in=pull_author_ids
+            ).values_list("following_id", flat=True)
+        )
+        PULL_AUTHORS_PER_READ.observe(len(followed_pull_author_ids))
+        if followed_pull_author_ids:
+            pulled.update(
+                keyset_queryset(
+                    Post.objects.filter(user_id__in=followed_pull_author_ids), cursor
+                ).values_list("created_at", "pk")[: POSTS_PER_PAGE + 1]
+            )
+    entries = sorted(pushed | pulled, reverse=True)
+    next_cursor = None
+    if len(entries) > POSTS_PER_PAGE:
+        entries = entries[:POSTS_PER_PAGE]
+        next_cursor = encode_cursor(*entries[-1])
+    pulled_count = sum(entry not in pushed for entry in entries)
+    FEED_POSTS_SERVED.labels(path="push").inc(len(entries) - pulled_count)
+    FEED_POSTS_SERVED.labels(path="pull").inc(pulled_count)
+
+    posts = (
+        Post.objects.filter(pk__in=[post_id for _, post_id in entries])
+        .select_related("user")
+        .in_bulk()
+    )
+    posts = [posts[post_id] for _, post_id in entries if post_id in posts]
+    prepare_post_cards(posts)
+    return posts, next_cursor
+
+
+class FeedView(LoginRequiredMixin, View):
+    """
+    Представление для отображения ленты постов пользователей, на которых
+    подписан текущий пользователь.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Обрабатывает GET-запрос для отображения первой страницы ленты.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы.
+
+        Returns:
+            HttpResponse: Ответ с отрендеренной страницей ленты.
+        """
+        posts, next_cursor = get_feed_page(request.user, request.GET.get("cursor"))
+        context = {
+            "posts": posts,
+            "liked_post_ids": get_liked_post_ids(request.user, posts),
+            "next_cursor": next_cursor,
+        }
+        return render(request, "feed/feed.html", context)
+
+
+class FeedPostListView(LoginRequiredMixin, View):
+    """
+    Представление для подгрузки следующей страницы ленты при бесконечной
+    прокрутке.
+    """
+
+    raise_exception = True
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает GET-запрос на получение страницы ленты.
+
+        Args:
+            request (HttpRequest): Объект запроса. Параметр `cursor` указывает
+                позицию, с которой начинается страница.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы.
+
+        Returns:
+            JsonResponse: Ответ с полями `html` и `next_cursor`.
+        """
+        posts, next_cursor = get_feed_page(request.user, request.GET.get("cursor"))
+        context = {
+            "posts": posts,
+            "liked_post_ids": get_liked_post_ids(request.user, posts),
+        }
+        html = render_to_string("posts/post_list.html", context, request=request)
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
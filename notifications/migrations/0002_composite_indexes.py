@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+from utils.db import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at"], name="notification_user_created_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "is_read", "-created_at"],
+                name="notification_user_unread_idx",
+            ),
+        ),
+    ]
@@ -30,6 +30,17 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"], name="notification_user_created_idx"
+            ),
+            models.Index(
+                fields=["user", "is_read", "-created_at"],
+                name="notification_user_unread_idx",
+            ),
+        ]
+
     def __str__(self):
         """
         Возвращает строковое представление объекта Notification.
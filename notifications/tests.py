@@ -4,6 +4,7 @@ from django.utils import timezone
 
 from accounts.models import CustomUser, Subscription
 from notifications.models import Notification
+from tests.support import QueryBudgetMixin
 
 
 class NotificationViewTest(TestCase):
@@ -82,6 +83,54 @@ class NotificationViewTest(TestCase):
         self.assertTrue(self.user_notification.is_read)
 
 
+class NotificationConditionalGetTest(TestCase):
+    """
+    Тесты для условных GET-запросов к странице уведомлений.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пользователя с уведомлением и авторизует его.
+        """
+        self.user = CustomUser.objects.create_user(
+            email="testuser@example.com", password="password"
+        )
+        Notification.objects.create(user=self.user, message="Notification 1")
+        self.client.force_login(self.user)
+        self.url = reverse("notifications:notifications")
+
+    def test_not_modified(self):
+        """
+        Проверяет, что повторный запрос без новых уведомлений возвращает 304.
+        """
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified_by_deleted_notification(self):
+        """
+        Проверяет, что удаление уведомления меняет ETag, а дата последнего
+        изменения не отдаётся, так как она не меняется при удалении.
+        """
+        Notification.objects.create(user=self.user, message="Notification 2")
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Last-Modified"))
+        Notification.objects.filter(message="Notification 1").delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Notification 1")
+
+    def test_modified_by_new_notification(self):
+        """
+        Проверяет, что новое уведомление меняет ETag, и страница рендерится заново.
+        """
+        etag = self.client.get(self.url)["ETag"]
+        Notification.objects.create(user=self.user, message="Notification 2")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Notification 2")
+
+
 class SignalTests(TestCase):
     """
     Тесты для проверки сигналов, создающих уведомления о подписках и изменениях
@@ -168,3 +217,25 @@ class SignalTests(TestCase):
         self.assertEqual(Notification.objects.filter(user=self.user1).count(), 0)
         self.user1.save()
         self.assertEqual(Notification.objects.filter(user=self.user1).count(), 0)
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов страницы уведомлений и её админ-панели.
+    """
+
+    def test_notifications(self):
+        """
+        Проверяет количество запросов страницы уведомлений.
+        """
+        self.client.force_login(self.user)
+        url = reverse("notifications:notifications")
+        self.assertQueryBudget(6, lambda: self.client.get(url))
+
+    def test_admin_changelist(self):
+        """
+        Проверяет количество запросов списка уведомлений в админ-панели.
+        """
+        self.client.force_login(self.admin)
+        url = reverse("admin:notifications_notification_changelist")
+        self.assertQueryBudget(6, lambda: self.client.get(url))
@@ -1,11 +1,40 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Count, Max
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views import View
 
 from notifications.models import Notification
+from utils.http import conditional_page, make_etag
 
 
+def get_notifications_etag(request: HttpRequest) -> str:
+    """
+    Вычисляет ETag страницы уведомлений.
+
+    Уведомления не редактируются, поэтому список меняется только при появлении
+    или удалении уведомлений. Статус прочтения в ETag не входит: страница
+    отмечает все уведомления прочитанными до рендеринга, поэтому счётчик
+    непрочитанных в навигации на ней всегда пуст.
+
+    `Last-Modified` странице не отдаётся: дата последнего уведомления не
+    меняется при удалении уведомлений, и клиент с `If-Modified-Since`
+    получал бы ответ 304 с удалённым уведомлением.
+
+    Args:
+        request (HttpRequest): Объект запроса авторизованного пользователя.
+
+    Returns:
+        str: ETag страницы.
+    """
+    summary = Notification.objects.filter(user=request.user).aggregate(
+        count=Count("pk"), last_id=Max("pk")
+    )
+    return make_etag(request, summary)
+
+
+@method_decorator(conditional_page(etag_func=get_notifications_etag), name="get")
 class NotificationView(LoginRequiredMixin, View):
     """
     Представление для отображения уведомлений пользователя.
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
 from .models import Comment, Post
 
@@ -15,6 +17,8 @@ class PostAdmin(admin.ModelAdmin):
         list_display (tuple): Поля модели Post, которые будут отображаться
             в списке объектов.
         search_fields (tuple): Поля, по которым можно выполнять поиск в админ-панели.
+            Сам поиск выполняется по полнотекстовому индексу
+            (см. `get_search_results`).
         list_filter (tuple): Поля, по которым можно фильтровать объекты в админ-панели.
         readonly_fields (tuple): Поля, доступные только для чтения в форме
             редактирования объекта.
@@ -22,29 +26,19 @@ class PostAdmin(admin.ModelAdmin):
             горизонтальный фильтр.
     """
 
-    list_display = ("id", "user", "created_at", "content_excerpt", "liked_by_users")
+    list_display = (
+        "id",
+        "user",
+        "created_at",
+        "content_excerpt",
+        "like_count",
+        "comment_count",
+    )
     search_fields = ("content",)
     list_filter = ("created_at", "user")
-    readonly_fields = ("created_at",)
+    readonly_fields = ("created_at", "like_count", "comment_count")
     filter_horizontal = ("liked_by",)
 
-    def liked_by_users(self, obj: Post) -> str:
-        """
-        Возвращает строку с именами пользователей, которые отметили пост как
-        понравившийся.
-
-        Args:
-            obj (Post): Экземпляр модели Post, для которого возвращаются
-                имена пользователей.
-
-        Returns:
-            str: Строка с именами пользователей, которые отметили пост
-                как понравившийся.
-        """
-        return ", ".join([user.username for user in obj.liked_by.all()])[:50]
-
-    liked_by_users.short_description = "Liked By"
-
     def content_excerpt(self, obj: Post) -> str:
         """
         Возвращает обрезанный фрагмент содержания поста.
@@ -60,6 +54,24 @@ class PostAdmin(admin.ModelAdmin):
 
     content_excerpt.short_description = "Content Excerpt"
 
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet, search_term: str
+    ) -> tuple[QuerySet, bool]:
+        """
+        Выполняет поиск через полнотекстовый индекс вместо ILIKE по `search_fields`.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            queryset (QuerySet): Набор объектов списка.
+            search_term (str): Поисковый запрос.
+
+        Returns:
+            tuple[QuerySet, bool]: Найденные объекты и признак возможных дубликатов.
+        """
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -73,6 +85,8 @@ class CommentAdmin(admin.ModelAdmin):
         list_display (tuple): Поля модели Comment, которые будут отображаться
             в списке объектов.
         search_fields (tuple): Поля, по которым можно выполнять поиск в админ-панели.
+            Сам поиск выполняется по полнотекстовому индексу
+            (см. `get_search_results`).
         list_filter (tuple): Поля, по которым можно фильтровать объекты в админ-панели.
         readonly_fields (tuple): Поля, доступные только для чтения в форме
             редактирования объекта.
@@ -97,3 +111,21 @@ class CommentAdmin(admin.ModelAdmin):
         return f"{obj.content[:47]}..."
 
     content_excerpt.short_description = "Content Excerpt"
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet, search_term: str
+    ) -> tuple[QuerySet, bool]:
+        """
+        Выполняет поиск через полнотекстовый индекс вместо ILIKE по `search_fields`.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            queryset (QuerySet): Набор объектов списка.
+            search_term (str): Поисковый запрос.
+
+        Returns:
+            tuple[QuerySet, bool]: Найденные объекты и признак возможных дубликатов.
+        """
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
@@ -7,25 +7,29 @@ from django.core.management.base import BaseCommand
 
 class Command(BaseCommand):
     """
-    Добавляет CRON задачу для планирования ежедневных постов ботами.
+    Добавляет CRON задачи для планирования ежедневных постов ботами и сверки
+    счётчиков постов и подписчиков.
 
     Этот класс представляет команду управления Django, которая добавляет
-    CRON задачу для выполнения команды Django по расписанию. Команда
-    запускает задачу `schedule_daily_posts` каждый день в полночь.
+    CRON задачи для выполнения команд Django по расписанию. Команда
+    запускает задачу `schedule_daily_posts` каждый день в полночь, а
+    `reconcile_post_counters` и `reconcile_follower_counts` — каждую ночь в
+    3:00, когда нагрузка минимальна.
 
     Attributes:
         help (str): Описание команды для вывода в справке.
     """
 
-    help = "Adds a CRON job to schedule daily posts for bots"
+    help = "Adds CRON jobs to schedule daily posts for bots and reconcile counters"
 
     def handle(self, *args, **kwargs) -> None:
         """
-        Выполняет команду добавления CRON задачи.
+        Выполняет команду добавления CRON задач.
 
         Этот метод подключается к CRON-таблице текущего пользователя, создает
         новую задачу, которая будет запускать команду Django `schedule_daily_posts`
-        каждый день в полночь. Путь к `manage.py` определяется автоматически.
+        каждый день в полночь, и задачи сверки счётчиков. Путь к
+        `manage.py` определяется автоматически.
 
         Args:
             *args: Позиционные аргументы команды.
@@ -46,9 +50,26 @@ class Command(BaseCommand):
         # Устанавливаем расписание: ежедневно в полночь
         job.setall("0 0 * * *")
 
+        # Сверка счётчиков лайков и комментариев постов: ежедневно в 3:00
+        job = user_cron.new(
+            command=f"python3 {manage_py} reconcile_post_counters",
+            comment="Django Post Counters",
+        )
+        job.setall("0 3 * * *")
+
+        # Сверка счётчиков подписчиков пользователей: ежедневно в 3:00
+        job = user_cron.new(
+            command=f"python3 {manage_py} reconcile_follower_counts",
+            comment="Django Follower Counters",
+        )
+        job.setall("0 3 * * *")
+
         # Сохраняем изменения в CRON-таблице
         user_cron.write()
 
         self.stdout.write(
-            self.style.SUCCESS("Successfully added CRON job to schedule daily posts")
+            self.style.SUCCESS(
+                "Successfully added CRON jobs to schedule daily posts "
+                "and reconcile counters"
+            )
         )
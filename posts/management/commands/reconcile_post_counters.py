@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+
+from posts.tasks import reconcile_post_counters
+
+
+class Command(BaseCommand):
+    """
+    Ставит в очередь сверку счётчиков лайков и комментариев всех постов.
+
+    Сама сверка выполняется воркером Dramatiq пачками (см.
+    `posts.tasks.reconcile_post_counters`), поэтому команда завершается сразу.
+
+    Attributes:
+        help (str): Описание команды для помощи.
+    """
+
+    help = (
+        "Enqueues reconciliation of post like and comment counters. "
+        "Call this daily (with cron or smth similar)."
+    )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Отправляет задачу сверки счётчиков, начиная с первого поста.
+        """
+        reconcile_post_counters.send()
+        self.stdout.write("Enqueued post counters reconciliation")
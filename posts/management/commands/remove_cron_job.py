@@ -4,24 +4,26 @@ from django.core.management.base import BaseCommand
 
 class Command(BaseCommand):
     """
-    Удаляет CRON задачу для планирования ежедневных постов.
+    Удаляет CRON задачи для планирования ежедневных постов и сверки счётчиков
+    постов.
 
     Этот класс представляет команду управления Django, которая удаляет
-    CRON задачу для планирования ежедневных постов, если таковая существует.
+    CRON задачи, добавленные `add_cron_job`, если таковые существуют.
     Команда ищет задачи по комментарию и удаляет их.
 
     Attributes:
         help (str): Описание команды для вывода в справке.
     """
 
-    help = "Removes the CRON job for scheduling daily posts"
+    help = "Removes the CRON jobs for scheduling daily posts and reconciling counters"
 
     def handle(self, *args, **kwargs) -> None:
         """
-        Выполняет команду удаления CRON задачи.
+        Выполняет команду удаления CRON задач.
 
         Этот метод подключается к CRON-таблице текущего пользователя, ищет
-        задачи с комментарием 'Django Bot Posts' и удаляет их. После этого
+        задачи с комментариями 'Django Bot Posts', 'Django Post Counters' и
+        'Django Follower Counters' и удаляет их. После этого
         сохраняет изменения в CRON-таблице.
 
         Args:
@@ -30,14 +32,17 @@ class Command(BaseCommand):
         """
         user_cron = CronTab(user=True)
 
-        # Ищем задачу по комментарию
+        # Ищем задачи по комментарию
         user_cron.remove_all(comment="Django Bot Posts")
+        user_cron.remove_all(comment="Django Post Counters")
+        user_cron.remove_all(comment="Django Follower Counters")
 
         # Сохраняем изменения
         user_cron.write()
 
         self.stdout.write(
             self.style.SUCCESS(
-                "Successfully removed CRON job for scheduling daily posts"
+                "Successfully removed CRON jobs for scheduling daily posts "
+                "and reconciling counters"
             )
         )
@@ -0,0 +1,107 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:44
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from utils.db import RunSQLIfPostgres
+
+# Количество идентификаторов, обрабатываемых одним UPDATE при заполнении
+# `search_vector` существующих строк
+BACKFILL_BATCH_SIZE = 5000
+
+
+def search_vector_sql(table: str) -> RunSQLIfPostgres:
+    """
+    Создаёт триггер, поддерживающий столбец `search_vector` таблицы.
+
+    Миграция не атомарна, поэтому триггер пересоздаётся: повторный запуск
+    после сбоя на следующих операциях не падает на уже созданном триггере.
+    """
+    drop_sql = f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table};"
+    return RunSQLIfPostgres(
+        sql=f"""
+            {drop_sql}
+            CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF content ON {table}
+            FOR EACH ROW EXECUTE FUNCTION
+            tsvector_update_trigger(search_vector, 'pg_catalog.russian', content);
+        """,
+        reverse_sql=drop_sql,
+    )
+
+
+def backfill_search_vector(table: str) -> migrations.RunPython:
+    """
+    Заполняет `search_vector` существующих строк таблицы пачками по диапазонам
+    первичного ключа.
+
+    Каждая пачка выполняется в своей транзакции, поэтому строки не остаются
+    заблокированными на всё время заполнения. Уже заполненные строки
+    пропускаются, и повторный запуск продолжает с того места, где прервался
+    предыдущий.
+    """
+
+    def backfill(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT min(id), max(id) FROM {table}")
+            low, high = cursor.fetchone()
+            if low is None:
+                return
+            for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+                cursor.execute(
+                    f"""
+                        UPDATE {table}
+                        SET search_vector = to_tsvector('pg_catalog.russian', content)
+                        WHERE id >= %s AND id < %s AND search_vector IS NULL
+                    """,
+                    [start, start + BACKFILL_BATCH_SIZE],
+                )
+
+    return migrations.RunPython(backfill, migrations.RunPython.noop, atomic=False)
+
+
+def search_index_sql(table: str) -> RunSQLIfPostgres:
+    """
+    Создаёт GIN-индекс по столбцу `search_vector` без блокировки таблицы на запись.
+    """
+    return RunSQLIfPostgres(
+        sql=(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_search_vector_idx "
+            f"ON {table} USING gin (search_vector);"
+        ),
+        reverse_sql=f"DROP INDEX CONCURRENTLY IF EXISTS {table}_search_vector_idx;",
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("posts", "0006_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        search_vector_sql("posts_post"),
+        search_vector_sql("posts_comment"),
+        backfill_search_vector("posts_post"),
+        backfill_search_vector("posts_comment"),
+        search_index_sql("posts_post"),
+        search_index_sql("posts_comment"),
+    ]
@@ -1,9 +1,136 @@
-from django.db import models
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
 
 from accounts.models import CustomUser
+from utils.models import AtomicFieldsMixin
 
+SEARCH_CONFIG = "russian"
 
-class Post(models.Model):
+
+def search_by_content(queryset: models.QuerySet, query: str) -> models.QuerySet:
+    """
+    Отбирает объекты, содержимое которых соответствует поисковому запросу,
+    и упорядочивает их по релевантности.
+
+    На PostgreSQL поиск идёт по столбцу `search_vector`, который поддерживается
+    триггером базы данных и покрыт GIN-индексом, а релевантность вычисляется
+    функцией `ts_rank`. Запрос разбирается в синтаксисе веб-поиска (кавычки
+    для фраз, `-` для исключения слов). На остальных СУБД (SQLite при
+    разработке и в тестах) выполняется поиск подстроки без ранжирования.
+
+    Args:
+        queryset (QuerySet): Исходный набор постов или комментариев.
+        query (str): Поисковый запрос.
+
+    Returns:
+        QuerySet: Найденные объекты, от наиболее релевантных к наименее.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.filter(content__icontains=query).order_by("-created_at", "-pk")
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-created_at", "-pk")
+    )
+
+
+def latest_comments_prefetch(limit: int) -> Prefetch:
+    """
+    Возвращает предзагрузку только `limit` самых новых комментариев каждого
+    поста вместе с их авторами.
+
+    Комментарии нумеруются оконной функцией ROW_NUMBER() внутри каждого
+    поста, поэтому объём выборки ограничен `limit` на пост независимо от
+    общего числа комментариев. Результат сохраняется в атрибут
+    `latest_comments` в хронологическом порядке.
+
+    Args:
+        limit (int): Максимальное количество комментариев на пост.
+
+    Returns:
+        Prefetch: Настроенная предзагрузка.
+    """
+    latest = (
+        Comment.objects.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F("post_id"),
+                order_by=[F("created_at").desc(), F("pk").desc()],
+            )
+        )
+        .filter(row_number__lte=limit)
+        .select_related("user")
+        .order_by("created_at", "pk")
+    )
+    return Prefetch("comments", queryset=latest, to_attr="latest_comments")
+
+
+class PostQuerySet(models.QuerySet):
+    """
+    Набор запросов для модели Post.
+    """
+
+    def with_latest_comments(self, limit: int) -> "PostQuerySet":
+        """
+        Подгружает для каждого поста только `limit` самых новых комментариев
+        (см. `latest_comments_prefetch`).
+
+        Args:
+            limit (int): Максимальное количество комментариев на пост.
+
+        Returns:
+            PostQuerySet: Набор запросов с настроенной предзагрузкой.
+        """
+        return self.prefetch_related(latest_comments_prefetch(limit))
+
+    def search(self, query: str) -> "PostQuerySet":
+        """
+        Выполняет полнотекстовый поиск по содержимому постов
+        (см. `search_by_content`).
+
+        Args:
+            query (str): Поисковый запрос.
+
+        Returns:
+            PostQuerySet: Найденные посты, от наиболее релевантных к наименее.
+        """
+        return search_by_content(self, query)
+
+    def reconcile_counters(self) -> int:
+        """
+        Пересчитывает счётчики `like_count` и `comment_count` по фактическим
+        данным и исправляет только те посты, у которых они разошлись.
+
+        Returns:
+            int: Количество исправленных постов.
+        """
+        likes = (
+            self.model.liked_by.through.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        comments = (
+            Comment.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        actual_likes = Coalesce(Subquery(likes), 0)
+        actual_comments = Coalesce(Subquery(comments), 0)
+        return (
+            self.alias(actual_likes=actual_likes, actual_comments=actual_comments)
+            .exclude(like_count=F("actual_likes"), comment_count=F("actual_comments"))
+            .update(like_count=actual_likes, comment_count=actual_comments)
+        )
+
+
+class Post(AtomicFieldsMixin):
     """
     Модель для хранения постов пользователей.
 
@@ -19,6 +146,15 @@ class Post(models.Model):
             Устанавливается автоматически при создании.
         liked_by (ManyToManyField): Список пользователей, которые
             отметили пост как понравившийся. Связано с моделью CustomUser.
+        like_count (PositiveIntegerField): Количество лайков поста. Поддерживается
+            сигналами `posts.signals` и сверяется задачей `reconcile_post_counters`.
+        comment_count (PositiveIntegerField): Количество комментариев к посту.
+            Поддерживается так же, как и `like_count`.
+        version (PositiveIntegerField): Версия поста для кеша отрендеренной
+            карточки. Увеличивается сигналами при изменении поста и его
+            комментариев.
+        search_vector (SearchVectorField): Поисковый вектор содержимого поста.
+            Заполняется триггером PostgreSQL при создании и изменении поста.
     """
 
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
@@ -27,6 +163,22 @@ class Post(models.Model):
     liked_by = models.ManyToManyField(
         CustomUser, related_name="liked_posts", blank=True, default=None
     )
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveIntegerField(default=0, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    # Поля, которые изменяются только атомарными UPDATE с F()-выражениями
+    ATOMIC_FIELDS = ("like_count", "comment_count", "version")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="post_user_created_idx"
+            ),
+        ]
 
     def __str__(self):
         """
@@ -40,6 +192,81 @@ class Post(models.Model):
         """
         return f"Post #{self.pk}: {self.content[:20]}"
 
+    @property
+    def card_version(self) -> str:
+        """
+        Возвращает отметку версии для ключа кеша отрендеренной карточки поста.
+
+        Кроме `version` включает дату создания поста, чтобы карточка не
+        досталась другому посту с тем же идентификатором (например, после
+        восстановления базы данных из резервной копии).
+
+        Returns:
+            str: Отметка версии.
+        """
+        return f"{self.created_at.timestamp()}.{self.version}"
+
+    def toggle_like(self, user: CustomUser) -> tuple[bool, int]:
+        """
+        Ставит или снимает лайк пользователя с поста.
+
+        Вместо загрузки всего списка `liked_by` выполняется одно условное
+        удаление строки связи, а если удалять было нечего — одна вставка.
+        Сигнал `m2m_changed` при этом не отправляется, поэтому счётчик
+        `like_count` изменяется здесь же, в той же транзакции.
+
+        Args:
+            user (CustomUser): Пользователь, который ставит или снимает лайк.
+
+        Returns:
+            tuple[bool, int]: Новое состояние лайка и актуальное количество лайков.
+        """
+        through = Post.liked_by.through
+        with transaction.atomic():
+            deleted, _ = through.objects.filter(
+                post_id=self.pk, customuser_id=user.pk
+            ).delete()
+            if deleted:
+                liked, delta = False, -1
+            else:
+                try:
+                    with transaction.atomic():
+                        through.objects.create(post_id=self.pk, customuser_id=user.pk)
+                    liked, delta = True, 1
+                except IntegrityError:
+                    # Лайк уже поставлен параллельным запросом
+                    liked, delta = True, 0
+            if delta:
+                Post.objects.filter(pk=self.pk).update(
+                    like_count=F("like_count") + delta
+                )
+            self.like_count = (
+                Post.objects.filter(pk=self.pk)
+                .values_list("like_count", flat=True)
+                .get()
+            )
+        return liked, self.like_count
+
+
+class CommentQuerySet(models.QuerySet):
+    """
+    Набор запросов для модели Comment.
+    """
+
+    def search(self, query: str) -> "CommentQuerySet":
+        """
+        Выполняет полнотекстовый поиск по содержимому комментариев
+        (см. `search_by_content`).
+
+        Args:
+            query (str): Поисковый запрос.
+
+        Returns:
+            CommentQuerySet: Найденные комментарии, от наиболее релевантных
+                к наименее.
+        """
+        return search_by_content(self, query)
+
 
 class Comment(models.Model):
     """
@@ -57,12 +284,25 @@ class Comment(models.Model):
         content (TextField): Содержимое комментария.
         created_at (DateTimeField): Дата и время создания комментария.
             Устанавливается автоматически при создании.
+        search_vector (SearchVectorField): Поисковый вектор содержимого
+            комментария. Заполняется триггером PostgreSQL при создании и
+            изменении комментария.
     """
 
     post = models.ForeignKey(Post, related_name="comments", on_delete=models.CASCADE)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "-created_at", "-id"], name="comment_post_created_idx"
+            ),
+        ]
 
     def __str__(self):
         """
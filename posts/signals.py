@@ -0,0 +1,114 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Post
+
+
+@receiver(m2m_changed, sender=Post.liked_by.through)
+def update_like_count(
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    """
+    Атомарно изменяет счётчик лайков при изменении `Post.liked_by`.
+
+    Сигнал обрабатывает изменения с обеих сторон связи: `post.liked_by`
+    (`reverse=False`, `instance` — пост) и `user.liked_posts` (`reverse=True`,
+    `instance` — пользователь). Перед удалением и очисткой запоминаются посты,
+    лайки которых действительно существуют, чтобы счётчик не уменьшался
+    за несуществующие связи.
+
+    Args:
+        sender (Model): Промежуточная модель связи `Post.liked_by`.
+        instance (Post | CustomUser): Объект, у которого изменилась связь.
+        action (str): Тип изменения (`post_add`, `pre_remove` и т.д.).
+        reverse (bool): True, если изменение сделано со стороны пользователя.
+        pk_set (set | None): Идентификаторы добавляемых или удаляемых объектов.
+        **kwargs: Дополнительные параметры.
+    """
+    if action in ("pre_remove", "pre_clear"):
+        links = sender.objects.filter(**{"customuser" if reverse else "post": instance})
+        if action == "pre_remove":
+            links = links.filter(
+                **{"post__in" if reverse else "customuser__in": pk_set}
+            )
+        instance._removed_like_post_ids = list(links.values_list("post_id", flat=True))
+        return
+
+    if action == "post_add":
+        post_ids = list(pk_set) if reverse else [instance.pk] * len(pk_set)
+        delta = 1
+    elif action in ("post_remove", "post_clear"):
+        post_ids = instance.__dict__.pop("_removed_like_post_ids", [])
+        delta = -1
+    else:
+        return
+
+    if not post_ids:
+        return
+    if reverse:
+        Post.objects.filter(pk__in=post_ids).update(like_count=F("like_count") + delta)
+    else:
+        Post.objects.filter(pk=instance.pk).update(
+            like_count=F("like_count") + delta * len(post_ids)
+        )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_card(sender: Post, instance: Post, created: bool, **kwargs):
+    """
+    Увеличивает версию поста при его изменении, тем самым инвалидируя
+    закешированную карточку поста. Версия увеличивается в базе данных, без
+    учёта значения в сохранённом объекте, которое может быть устаревшим, а
+    затем перечитывается в объект.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (Post).
+        instance (Post): Сохранённый пост.
+        created (bool): True, если пост был создан.
+        **kwargs: Дополнительные параметры.
+    """
+    if not created:
+        Post.objects.filter(pk=instance.pk).update(version=F("version") + 1)
+        instance.refresh_from_db(fields=["version"])
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(
+    sender: Comment, instance: Comment, created: bool, **kwargs
+) -> None:
+    """
+    Увеличивает счётчик комментариев поста при создании комментария.
+
+    Любое сохранение комментария также увеличивает версию поста, инвалидируя
+    закешированную карточку с последними комментариями.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (Comment).
+        instance (Comment): Сохранённый комментарий.
+        created (bool): True, если комментарий был создан.
+        **kwargs: Дополнительные параметры.
+    """
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1, version=F("version") + 1
+        )
+    else:
+        Post.objects.filter(pk=instance.post_id).update(version=F("version") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender: Comment, instance: Comment, **kwargs) -> None:
+    """
+    Уменьшает счётчик комментариев поста и увеличивает его версию при удалении
+    комментария.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (Comment).
+        instance (Comment): Удалённый комментарий.
+        **kwargs: Дополнительные параметры.
+    """
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0), version=F("version") + 1
+    )
@@ -1,5 +1,33 @@
+const loadComments = async (commentList) => {
+    const cursor = commentList.dataset.nextCursor;
+    if (!cursor || commentList.dataset.loading) return;
+    commentList.dataset.loading = '1';
+    try {
+        const url = `${commentList.dataset.url}?cursor=${encodeURIComponent(cursor)}`;
+        const response = await fetch(url, {headers: {'X-Requested-With': 'XMLHttpRequest'}});
+        if (!response.ok) {
+            console.error('Failed to load comments:', response.status);
+            return;
+        }
+        const data = await response.json();
+        const loadButton = commentList.querySelector('.load-comments');
+        loadButton.insertAdjacentHTML('afterend', data.html);
+        commentList.dataset.nextCursor = data.next_cursor || '';
+        if (!data.next_cursor) loadButton.remove();
+    } finally {
+        delete commentList.dataset.loading;
+    }
+};
+
+
 document.addEventListener('DOMContentLoaded', () => {
     document.body.addEventListener('click', (event) => {
+        const loadButton = event.target.closest('.load-comments');
+        if (loadButton) {
+            loadComments(loadButton.closest('.comment-list'));
+            return;
+        }
+
         const button = event.target.closest('.comment-button');
         if (!button) return;
 
@@ -15,11 +43,15 @@ document.addEventListener('DOMContentLoaded', () => {
         if (commentListDisplay === 'none' && commentFormDisplay === 'none') {
             commentList.style.display = 'inline-block';
             commentForm.style.display = 'flex';
-            button.innerHTML = '<i class="fa-solid fa-comment"></i>';
+            button.querySelector('.comment-icon').innerHTML = '<i class="fa-solid fa-comment"></i>';
+            if (!commentList.dataset.expanded) {
+                commentList.dataset.expanded = '1';
+                loadComments(commentList);
+            }
         } else {
             commentList.style.display = 'none';
             commentForm.style.display = 'none';
-            button.innerHTML = '<i class="fa-regular fa-comment"></i>';
+            button.querySelector('.comment-icon').innerHTML = '<i class="fa-regular fa-comment"></i>';
         }
     });
 });
@@ -41,3 +73,83 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 });
 
+
+
+document.addEventListener('DOMContentLoaded', () => {
+    const posts = document.querySelector('.posts');
+    const sentinel = document.querySelector('.posts-sentinel');
+    if (!posts || !sentinel || !posts.dataset.nextCursor) return;
+
+    let loading = false;
+
+    const loadMore = async () => {
+        const cursor = posts.dataset.nextCursor;
+        if (loading || !cursor) return;
+        loading = true;
+        try {
+            const url = new URL(posts.dataset.url, window.location.origin);
+            url.searchParams.set('cursor', cursor);
+            const response = await fetch(url, {headers: {'X-Requested-With': 'XMLHttpRequest'}});
+            if (!response.ok) {
+                console.error('Failed to load posts:', response.status);
+                return;
+            }
+            const data = await response.json();
+            posts.insertAdjacentHTML('beforeend', data.html);
+            posts.dataset.nextCursor = data.next_cursor || '';
+            if (!data.next_cursor) observer.disconnect();
+        } finally {
+            loading = false;
+        }
+    };
+
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) loadMore();
+    }, {rootMargin: '600px'});
+    observer.observe(sentinel);
+});
+
+
+document.addEventListener('DOMContentLoaded', () => {
+    const postForm = async (form) => {
+        const response = await fetch(form.dataset.url, {
+            method: 'POST',
+            body: new FormData(form),
+            headers: {'X-Requested-With': 'XMLHttpRequest'},
+        });
+        const data = await response.json();
+        if (!response.ok) throw new Error(JSON.stringify(data.errors || response.status));
+        return data;
+    };
+
+    document.body.addEventListener('submit', async (event) => {
+        const form = event.target;
+        if (!form.dataset.url) return;
+
+        if (form.classList.contains('like-form')) {
+            event.preventDefault();
+            try {
+                const data = await postForm(form);
+                form.querySelector('.like-icon').innerHTML = data.liked
+                    ? '<i class="fa-solid fa-heart"></i>'
+                    : '<i class="fa-regular fa-heart"></i>';
+                form.querySelector('.like-count').textContent = data.like_count;
+            } catch (error) {
+                console.error('Failed to toggle like:', error);
+            }
+        } else if (form.classList.contains('comment-form')) {
+            event.preventDefault();
+            const input = form.querySelector('input[name="content"]');
+            if (!input || !input.value.trim()) return;
+            try {
+                const data = await postForm(form);
+                const post = form.closest('.post');
+                post.querySelector('.comment-list').insertAdjacentHTML('beforeend', data.html);
+                post.querySelector('.comment-count').textContent = data.comment_count;
+                input.value = '';
+            } catch (error) {
+                console.error('Failed to add comment:', error);
+            }
+        }
+    });
+});
@@ -1,12 +1,14 @@
 import dramatiq
 from django.utils import timezone
+from loguru import logger
 
 from accounts.models import CustomUser
 from posts.models import Post
-from utils.gpt import make_request
+from ratelimit.limiter import BATCH
+from utils.gpt import ERROR_ANSWER, make_request
 
 
-@dramatiq.actor
+@dramatiq.actor(max_retries=5)
 def create_bot_post(bot_id: int) -> None:
     """
     Создает пост от имени бота с использованием GPT и сохраняет его в базе данных.
@@ -14,10 +16,16 @@ def create_bot_post(bot_id: int) -> None:
     Эта функция извлекает бота из базы данных по его идентификатору,
     затем с помощью GPT генерирует контент для поста,
     основываясь на описании бота и текущем времени.
-    Сгенерированный пост сохраняется в модели `Post`.
+    Сгенерированный пост сохраняется в модели `Post`. Запрос к GPT имеет
+    низкий приоритет и при нехватке общей квоты ждёт, пока её не освободят
+    ответы в чате. Если GPT так и не ответил, задача завершается ошибкой, и
+    dramatiq повторяет её позже.
 
     Args:
         bot_id (int): Идентификатор бота, от имени которого создается пост.
+
+    Raises:
+        RuntimeError: GPT недоступен или не хватило квоты запросов.
     """
 
     bot: CustomUser = CustomUser.objects.get(id=bot_id)
@@ -30,5 +38,39 @@ def create_bot_post(bot_id: int) -> None:
         f"{bot.bot_description} Сейчас на часах: {time_string}."
         f"Напиши пост о чём-нибудь для своей странички в социальной сети."
     )
-    content = make_request(system_text, user_text, temperature=0.7)
+    content = make_request(system_text, user_text, temperature=0.7, priority=BATCH)
+    if content == ERROR_ANSWER:
+        raise RuntimeError(f"GPT is unavailable for a post of bot {bot_id}")
     Post.objects.create(user=bot, content=content, created_at=timezone.now())
+
+
+@dramatiq.actor
+def reconcile_post_counters(start_id: int = 0, batch_size: int = 1000) -> None:
+    """
+    Сверяет денормализованные счётчики лайков и комментариев постов с
+    фактическими данными.
+
+    Счётчики поддерживаются сигналами, но могут разойтись с данными при
+    массовых операциях в обход ORM (например, каскадном удалении лайков вместе
+    с пользователем). Задача обрабатывает посты пачками по возрастанию
+    идентификатора и ставит в очередь саму себя для следующей пачки, поэтому
+    ни один запуск не держит транзакцию над всей таблицей.
+
+    Args:
+        start_id (int): Идентификатор, после которого начинается пачка.
+        batch_size (int): Количество постов в одной пачке.
+    """
+    post_ids = list(
+        Post.objects.filter(pk__gt=start_id)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not post_ids:
+        return
+    fixed = Post.objects.filter(pk__in=post_ids).reconcile_counters()
+    if fixed:
+        logger.warning(
+            "Fixed counters of {} posts in ({}, {}]", fixed, start_id, post_ids[-1]
+        )
+    if len(post_ids) == batch_size:
+        reconcile_post_counters.send(post_ids[-1], batch_size)
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
 from django.core.management import call_command
@@ -7,7 +8,10 @@ from django.urls import reverse
 from django.utils import timezone
 
 from accounts.models import CustomUser, Subscription
-from posts.models import Post
+from posts.models import Comment, Post
+from posts.tasks import reconcile_post_counters
+from posts.views import COMMENTS_PER_PAGE, LATEST_COMMENTS_PER_POST, POSTS_PER_PAGE
+from tests.support import QueryBudgetMixin
 
 
 class HomeViewTest(TestCase):
@@ -135,6 +139,555 @@ class HomeViewTest(TestCase):
         self.assertFalse(self.user2.is_following(self.user1))
 
 
+class PostListViewTest(TestCase):
+    """
+    Тесты для постраничной (keyset) выдачи постов на странице пользователя
+    и JSON-эндпоинта бесконечной прокрутки.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пользователя с количеством постов, превышающим размер страницы.
+        """
+        self.user = CustomUser.objects.create_user(
+            email="user1@example.com", password="password", username="user1"
+        )
+        self.posts = Post.objects.bulk_create(
+            Post(user=self.user, content=f"Post {i}") for i in range(POSTS_PER_PAGE + 5)
+        )
+
+    def test_home_page_renders_first_page(self):
+        """
+        Проверяет, что страница пользователя содержит только первую страницу
+        самых новых постов и курсор для подгрузки следующей.
+        """
+        url = reverse("posts:home", kwargs={"pk": self.user.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        posts = response.context["posts"]
+        self.assertEqual(len(posts), POSTS_PER_PAGE)
+        self.assertEqual(posts[0], self.posts[-1])
+        self.assertIsNotNone(response.context["next_cursor"])
+
+    def test_post_list_returns_next_page(self):
+        """
+        Проверяет, что эндпоинт подгрузки возвращает оставшиеся посты без
+        повторов и пустой курсор на последней странице.
+        """
+        home_url = reverse("posts:home", kwargs={"pk": self.user.pk})
+        cursor = self.client.get(home_url).context["next_cursor"]
+
+        url = reverse("posts:post_list", kwargs={"pk": self.user.pk})
+        response = self.client.get(url, {"cursor": cursor})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIsNone(data["next_cursor"])
+        for post in self.posts[:5]:
+            self.assertIn(f"<p>{post.content}</p>", data["html"])
+        self.assertNotIn(f"<p>{self.posts[5].content}</p>", data["html"])
+
+    def test_liked_post_ids_in_context(self):
+        """
+        Проверяет, что в контекст передаются идентификаторы лайкнутых
+        зрителем постов только текущей страницы.
+        """
+        viewer = CustomUser.objects.create_user(
+            email="viewer@example.com", password="password", username="viewer"
+        )
+        self.posts[0].liked_by.add(viewer)
+        self.posts[-1].liked_by.add(viewer)
+        self.client.force_login(viewer)
+        url = reverse("posts:home", kwargs={"pk": self.user.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.context["liked_post_ids"], {self.posts[-1].pk})
+        self.assertContains(response, "fa-solid fa-heart", count=1)
+
+    def test_post_list_ignores_invalid_cursor(self):
+        """
+        Проверяет, что повреждённый курсор приводит к выдаче первой страницы.
+        """
+        url = reverse("posts:post_list", kwargs={"pk": self.user.pk})
+        response = self.client.get(url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.json()["next_cursor"])
+
+
+class PostCountersTest(TestCase):
+    """
+    Тесты для денормализованных счётчиков лайков и комментариев поста.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора поста, двух читателей и пост.
+        """
+        self.author = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        self.reader1 = CustomUser.objects.create_user(
+            email="reader1@example.com", password="password", username="reader1"
+        )
+        self.reader2 = CustomUser.objects.create_user(
+            email="reader2@example.com", password="password", username="reader2"
+        )
+        self.post = Post.objects.create(user=self.author, content="Test post")
+
+    def assertCounters(self, like_count: int, comment_count: int) -> None:
+        """
+        Проверяет значения счётчиков поста в базе данных.
+        """
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, like_count)
+        self.assertEqual(self.post.comment_count, comment_count)
+
+    def test_like_count_follows_liked_by(self):
+        """
+        Проверяет, что счётчик лайков меняется при добавлении, удалении и
+        очистке лайков с обеих сторон связи.
+        """
+        self.post.liked_by.add(self.reader1, self.reader2)
+        self.assertCounters(2, 0)
+        self.post.liked_by.add(self.reader1)
+        self.assertCounters(2, 0)
+        self.post.liked_by.remove(self.reader1, self.author)
+        self.assertCounters(1, 0)
+        self.reader1.liked_posts.add(self.post)
+        self.assertCounters(2, 0)
+        self.reader2.liked_posts.clear()
+        self.assertCounters(1, 0)
+        self.post.liked_by.clear()
+        self.assertCounters(0, 0)
+
+    def test_comment_count_follows_comments(self):
+        """
+        Проверяет, что счётчик комментариев меняется при создании и удалении
+        комментариев.
+        """
+        comment = Comment.objects.create(
+            post=self.post, user=self.reader1, content="Hi"
+        )
+        Comment.objects.create(post=self.post, user=self.reader2, content="Hello")
+        self.assertCounters(0, 2)
+        comment.delete()
+        self.assertCounters(0, 1)
+
+    def test_stale_save_keeps_counters(self):
+        """
+        Проверяет, что сохранение объекта, загруженного до лайка и
+        комментария, не сбрасывает счётчики.
+        """
+        stale = Post.objects.get(pk=self.post.pk)
+        self.post.liked_by.add(self.reader1)
+        Comment.objects.create(post=self.post, user=self.reader2, content="Hi")
+        stale.content = "Edited post"
+        stale.save()
+        self.assertCounters(1, 1)
+        self.assertEqual(self.post.content, "Edited post")
+
+    def test_reconcile_post_counters_fixes_drift(self):
+        """
+        Проверяет, что задача сверки исправляет счётчики, разошедшиеся с
+        данными, обрабатывая посты пачками.
+        """
+        other_post = Post.objects.create(user=self.author, content="Other post")
+        self.post.liked_by.add(self.reader1)
+        Comment.objects.create(post=other_post, user=self.reader1, content="Hi")
+        Post.objects.update(like_count=7, comment_count=7)
+
+        with patch("posts.tasks.reconcile_post_counters.send") as mock_send:
+            reconcile_post_counters(batch_size=1)
+            reconcile_post_counters(*mock_send.call_args.args)
+
+        self.assertCounters(1, 0)
+        other_post.refresh_from_db()
+        self.assertEqual(other_post.like_count, 0)
+        self.assertEqual(other_post.comment_count, 1)
+
+    def test_reconcile_post_counters_command(self):
+        """
+        Проверяет, что команда ставит в очередь сверку с первого поста.
+        """
+        with patch("posts.tasks.reconcile_post_counters.send") as mock_send:
+            call_command("reconcile_post_counters", stdout=StringIO())
+        mock_send.assert_called_once_with()
+
+
+class LikeAndCommentViewTest(TestCase):
+    """
+    Тесты для AJAX-эндпоинтов лайков и комментариев.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора, читателя и пост.
+        """
+        self.author = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        self.reader = CustomUser.objects.create_user(
+            email="reader@example.com", password="password", username="reader"
+        )
+        self.post = Post.objects.create(user=self.author, content="Test post")
+
+    def test_like_toggle(self):
+        """
+        Проверяет, что повторный запрос снимает лайк, а ответ содержит новое
+        состояние и количество лайков.
+        """
+        self.client.force_login(self.reader)
+        url = reverse("posts:like", kwargs={"pk": self.post.pk})
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"liked": True, "like_count": 1})
+        self.assertTrue(self.post.liked_by.filter(pk=self.reader.pk).exists())
+
+        response = self.client.post(url)
+        self.assertEqual(response.json(), {"liked": False, "like_count": 0})
+        self.assertFalse(self.post.liked_by.filter(pk=self.reader.pk).exists())
+
+    def test_like_requires_login(self):
+        """
+        Проверяет, что анонимный пользователь не может поставить лайк.
+        """
+        url = reverse("posts:like", kwargs={"pk": self.post.pk})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_add_comment(self):
+        """
+        Проверяет создание комментария и содержимое JSON-ответа.
+        """
+        self.client.force_login(self.reader)
+        url = reverse("posts:comments", kwargs={"pk": self.post.pk})
+        response = self.client.post(url, {"content": "Nice post"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["comment_count"], 1)
+        self.assertIn("Nice post", data["html"])
+        self.assertEqual(self.post.comments.get().user, self.reader)
+
+    def test_add_empty_comment(self):
+        """
+        Проверяет, что пустой комментарий отклоняется с ошибкой формы.
+        """
+        self.client.force_login(self.reader)
+        url = reverse("posts:comments", kwargs={"pk": self.post.pk})
+        response = self.client.post(url, {"content": ""})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("content", response.json()["errors"])
+        self.assertFalse(self.post.comments.exists())
+
+
+class LatestCommentsTest(TestCase):
+    """
+    Тесты для ограниченной предзагрузки последних комментариев и постраничной
+    загрузки более старых.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пост с количеством комментариев, превышающим размер страницы.
+        """
+        self.user = CustomUser.objects.create_user(
+            email="user1@example.com", password="password", username="user1"
+        )
+        self.post = Post.objects.create(user=self.user, content="Test post")
+        self.empty_post = Post.objects.create(user=self.user, content="Empty post")
+        self.comments = Comment.objects.bulk_create(
+            Comment(post=self.post, user=self.user, content=f"Comment {i}")
+            for i in range(LATEST_COMMENTS_PER_POST + COMMENTS_PER_PAGE + 1)
+        )
+        Post.objects.reconcile_counters()
+
+    def test_with_latest_comments(self):
+        """
+        Проверяет, что для каждого поста подгружаются только последние
+        комментарии в хронологическом порядке.
+        """
+        posts = {
+            post.pk: post
+            for post in Post.objects.with_latest_comments(LATEST_COMMENTS_PER_POST)
+        }
+        self.assertEqual(
+            posts[self.post.pk].latest_comments,
+            self.comments[-LATEST_COMMENTS_PER_POST:],
+        )
+        self.assertEqual(posts[self.empty_post.pk].latest_comments, [])
+
+    def test_comment_pages(self):
+        """
+        Проверяет, что страницы комментариев, начиная с курсора на странице
+        пользователя, возвращают все более старые комментарии без повторов.
+        """
+        url = reverse("posts:home", kwargs={"pk": self.user.pk})
+        posts = self.client.get(url).context["posts"]
+        cursor = next(p for p in posts if p.pk == self.post.pk).comments_cursor
+        self.assertIsNotNone(cursor)
+
+        url = reverse("posts:comments", kwargs={"pk": self.post.pk})
+        first_page = self.client.get(url, {"cursor": cursor}).json()
+        self.assertIsNotNone(first_page["next_cursor"])
+        second_page = self.client.get(url, {"cursor": first_page["next_cursor"]})
+        second_page = second_page.json()
+        self.assertIsNone(second_page["next_cursor"])
+
+        html = second_page["html"] + first_page["html"]
+        older = self.comments[:-LATEST_COMMENTS_PER_POST]
+        positions = [html.index(f"{c.content}</p>") for c in older]
+        self.assertEqual(positions, sorted(positions))
+        for comment in self.comments[-LATEST_COMMENTS_PER_POST:]:
+            self.assertNotIn(f"{comment.content}</p>", html)
+
+
+class PostCardCacheTest(TestCase):
+    """
+    Тесты для кеша отрендеренных карточек постов.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора, читателя и пост.
+        """
+        self.author = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        self.reader = CustomUser.objects.create_user(
+            email="reader@example.com", password="password", username="reader"
+        )
+        self.post = Post.objects.create(user=self.author, content="Test post")
+        self.url = reverse("posts:home", kwargs={"pk": self.author.pk})
+
+    def get_card_html(self) -> str | None:
+        """
+        Запрашивает страницу автора и возвращает закешированную карточку поста.
+        """
+        return self.client.get(self.url).context["posts"][0].card_html
+
+    def test_card_is_reused(self):
+        """
+        Проверяет, что повторный рендеринг страницы берёт карточку из кеша,
+        а состояние лайка зрителя рендерится для каждого запроса.
+        """
+        self.assertIsNone(self.get_card_html())
+        self.assertIn("Test post", self.get_card_html())
+
+        self.post.liked_by.add(self.reader)
+        self.client.force_login(self.reader)
+        response = self.client.get(self.url)
+        self.assertIsNotNone(response.context["posts"][0].card_html)
+        self.assertContains(response, "fa-solid fa-heart")
+
+    def test_card_invalidated_by_changes(self):
+        """
+        Проверяет, что изменение поста и его комментариев инвалидирует карточку.
+        """
+        self.get_card_html()
+        comment = Comment.objects.create(
+            post=self.post, user=self.reader, content="First comment"
+        )
+        self.assertIsNone(self.get_card_html())
+        self.assertIn("First comment", self.get_card_html())
+
+        comment.content = "Edited comment"
+        comment.save()
+        self.assertIsNone(self.get_card_html())
+        self.assertIn("Edited comment", self.get_card_html())
+
+        self.post.refresh_from_db()
+        self.post.content = "Edited post"
+        self.post.save()
+        self.assertIsNone(self.get_card_html())
+        self.assertIn("Edited post", self.get_card_html())
+
+    def test_author_is_not_cached(self):
+        """
+        Проверяет, что новое имя автора видно сразу, хотя карточка поста
+        берётся из кеша.
+        """
+        self.get_card_html()
+        self.author.username = "renamed"
+        self.author.save()
+        response = self.client.get(self.url)
+        self.assertIsNotNone(response.context["posts"][0].card_html)
+        self.assertContains(response, "<h3>renamed</h3>", html=True)
+
+    def test_stale_edit_invalidates_card(self):
+        """
+        Проверяет, что изменение поста через объект, загруженный до
+        предыдущего изменения, тоже инвалидирует карточку.
+        """
+        stale = Post.objects.get(pk=self.post.pk)
+        self.post.content = "First edit"
+        self.post.save()
+        self.get_card_html()
+        self.assertIn("First edit", self.get_card_html())
+
+        stale.content = "Second edit"
+        stale.save()
+        self.assertIsNone(self.get_card_html())
+        self.assertIn("Second edit", self.get_card_html())
+        self.assertEqual(stale.version, 2)
+
+
+class HomeConditionalGetTest(TestCase):
+    """
+    Тесты для условных GET-запросов к странице пользователя.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора с постом и авторизует читателя.
+        """
+        self.author = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        self.reader = CustomUser.objects.create_user(
+            email="reader@example.com", password="password", username="reader"
+        )
+        self.post = Post.objects.create(user=self.author, content="Test post")
+        self.url = reverse("posts:home", kwargs={"pk": self.author.pk})
+        self.client.force_login(self.reader)
+
+    def assertNotModified(self, etag: str, expected: bool = True):
+        """
+        Проверяет, возвращает ли повторный запрос с ETag ответ 304.
+        """
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304 if expected else 200)
+
+    def test_not_modified(self):
+        """
+        Проверяет, что неизменённая страница возвращается как 304 без рендеринга,
+        а ответ помечен как зависящий от пользователя.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Cookie", response["Vary"])
+        self.assertIn("private", response["Cache-Control"])
+        with self.assertTemplateNotUsed("posts/home.html"):
+            self.assertNotModified(response["ETag"])
+
+    def test_modified_by_changes(self):
+        """
+        Проверяет, что ETag меняется при изменении отображаемых данных.
+        """
+        changes = [
+            lambda: self.post.liked_by.add(self.author),
+            lambda: Comment.objects.create(
+                post=self.post, user=self.author, content="Comment"
+            ),
+            lambda: Post.objects.create(user=self.author, content="New post"),
+            lambda: Subscription.objects.create(
+                follower=self.reader, following=self.author
+            ),
+        ]
+        for change in changes:
+            etag = self.client.get(self.url)["ETag"]
+            change()
+            self.assertNotModified(etag, expected=False)
+
+    def test_modified_by_swapped_likes(self):
+        """
+        Проверяет, что ETag меняется, если зритель заменил лайки на лайки
+        других постов с той же суммой идентификаторов и тем же количеством.
+        """
+        posts = [self.post] + Post.objects.bulk_create(
+            Post(user=self.author, content=f"Post {i}") for i in range(3)
+        )
+        for post in (posts[0], posts[3]):
+            post.liked_by.add(self.reader)
+        etag = self.client.get(self.url)["ETag"]
+        for post in (posts[0], posts[3]):
+            post.liked_by.remove(self.reader)
+        for post in (posts[1], posts[2]):
+            post.liked_by.add(self.reader)
+        self.assertNotModified(etag, expected=False)
+
+    def test_etag_depends_on_viewer(self):
+        """
+        Проверяет, что ETag различается для авторизованного и анонимного зрителя.
+        """
+        etag = self.client.get(self.url)["ETag"]
+        self.client.logout()
+        self.assertNotModified(etag, expected=False)
+
+
+class SearchViewTest(TestCase):
+    """
+    Тесты для поиска по постам.
+    """
+
+    def setUp(self):
+        """
+        Создаёт автора и его посты.
+        """
+        self.user = CustomUser.objects.create_user(
+            email="author@example.com", password="password", username="author"
+        )
+        Post.objects.bulk_create(
+            Post(user=self.user, content=f"Котики {i}")
+            for i in range(POSTS_PER_PAGE + 5)
+        )
+        self.other_post = Post.objects.create(user=self.user, content="Собаки")
+
+    def test_search_posts(self):
+        """
+        Проверяет, что поиск возвращает только подходящие посты и подгружает
+        следующую страницу результатов.
+        """
+        response = self.client.get(reverse("posts:search"), {"q": "Котики"})
+        posts = response.context["posts"]
+        self.assertEqual(len(posts), POSTS_PER_PAGE)
+        self.assertNotIn(self.other_post, posts)
+
+        response = self.client.get(
+            reverse("posts:search_posts"),
+            {"q": "Котики", "cursor": response.context["next_cursor"]},
+        )
+        data = response.json()
+        self.assertIsNone(data["next_cursor"])
+        self.assertEqual(data["html"].count('class="post"'), 5)
+
+    def test_search_comments(self):
+        """
+        Проверяет, что поиск также показывает подходящие комментарии со
+        ссылкой на страницу автора поста.
+        """
+        Comment.objects.create(
+            post=self.other_post, user=self.user, content="Попугаи лучше"
+        )
+        response = self.client.get(reverse("posts:search"), {"q": "Попугаи"})
+        self.assertEqual(
+            [comment.content for comment in response.context["comments"]],
+            ["Попугаи лучше"],
+        )
+        self.assertEqual(response.context["posts"], [])
+        self.assertContains(response, reverse("posts:home", args=[self.user.pk]))
+        self.assertNotContains(response, "Ничего не найдено")
+
+    def test_search_without_query(self):
+        """
+        Проверяет, что страница поиска без запроса не содержит результатов.
+        """
+        response = self.client.get(reverse("posts:search"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["posts"], [])
+
+    def test_admin_search(self):
+        """
+        Проверяет, что поиск в админ-панели использует поиск по содержимому.
+        """
+        admin = CustomUser.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse("admin:posts_post_changelist"), {"q": "Собаки"}
+        )
+        self.assertEqual(list(response.context["cl"].result_list), [self.other_post])
+
+
 class ScheduleBotPostsCommandTest(TestCase):
     """
     Тесты для команды планирования ежедневных постов для ботов.
@@ -250,3 +803,37 @@ class ScheduleBotPostsCommandTest(TestCase):
             mock_send_with_options.assert_any_call(
                 args=(self.user.id,), delay=timedelta(seconds=10000)
             )
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов страниц постов и их админ-панелей.
+    """
+
+    def test_home(self):
+        """
+        Проверяет количество запросов главной страницы пользователя.
+        """
+        self.client.force_login(self.other)
+        url = reverse("posts:home", kwargs={"pk": self.user.pk})
+        self.assertQueryBudget(15, lambda: self.client.get(url))
+
+    def test_search(self):
+        """
+        Проверяет количество запросов страницы поиска, включая запрос
+        найденных комментариев.
+        """
+        self.client.force_login(self.other)
+        url = reverse("posts:search")
+        self.assertQueryBudget(7, lambda: self.client.get(url, {"q": "Post"}))
+
+    def test_admin_changelists(self):
+        """
+        Проверяет количество запросов списков постов и комментариев в
+        админ-панели.
+        """
+        self.client.force_login(self.admin)
+        for model in ("post", "comment"):
+            with self.subTest(model=model):
+                url = reverse(f"admin:posts_{model}_changelist")
+                self.assertQueryBudget(7, lambda url=url: self.client.get(url))
@@ -1,10 +1,22 @@
 from django.urls import path
 
-from posts.views import HomeView
+from posts.views import (
+    CommentView,
+    HomeView,
+    LikeView,
+    PostListView,
+    SearchPostListView,
+    SearchView,
+)
 
 app_name = "posts"
 
 
 urlpatterns = [
     path("<int:pk>/", HomeView.as_view(), name="home"),
+    path("<int:pk>/posts/", PostListView.as_view(), name="post_list"),
+    path("post/<int:pk>/like/", LikeView.as_view(), name="like"),
+    path("post/<int:pk>/comments/", CommentView.as_view(), name="comments"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("search/posts/", SearchPostListView.as_view(), name="search_posts"),
 ]
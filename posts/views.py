@@ -1,13 +1,208 @@
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Max, Sum, prefetch_related_objects
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views.generic import View
 
 from accounts.models import CustomUser, Subscription
 from posts.forms import CommentForm, PostForm
-from posts.models import Post
+from posts.models import Comment, Post, latest_comments_prefetch
+from utils.http import conditional_page, make_etag
+from utils.pagination import encode_cursor, paginate_keyset, paginate_offset
 
+POSTS_PER_PAGE = 20
+LATEST_COMMENTS_PER_POST = 3
+COMMENTS_PER_PAGE = 20
+COMMENT_SEARCH_RESULTS = 5
 
+
+def get_post_card_cache_key(post: Post) -> str:
+    """
+    Возвращает ключ кеша отрендеренной карточки поста, совпадающий с ключом
+    тега `{% cache %}` в шаблоне `posts/post_list.html`.
+
+    Args:
+        post (Post): Пост.
+
+    Returns:
+        str: Ключ кеша.
+    """
+    return make_template_fragment_key("post_card", [post.pk, post.card_version])
+
+
+def prepare_post_cards(posts: list[Post]) -> None:
+    """
+    Подготавливает посты страницы к рендерингу карточек.
+
+    Закешированные карточки загружаются одним запросом к кешу и записываются в
+    атрибут `card_html`. Автор поста в карточку не входит и рендерится при
+    каждом запросе, чтобы смена имени или аватара была видна сразу. Только для
+    постов без карточки в кеше подгружаются последние комментарии, а в атрибут
+    `comments_cursor` записывается курсор для подгрузки более старых (None,
+    если все комментарии уже загружены).
+
+    Args:
+        posts (list[Post]): Посты страницы.
+    """
+    keys = {post.pk: get_post_card_cache_key(post) for post in posts}
+    cached = cache.get_many(keys.values())
+    missing = []
+    for post in posts:
+        post.card_html = cached.get(keys[post.pk])
+        if post.card_html is None:
+            missing.append(post)
+    prefetch_related_objects(
+        missing, latest_comments_prefetch(LATEST_COMMENTS_PER_POST)
+    )
+    for post in missing:
+        post.comments_cursor = None
+        if post.comment_count > len(post.latest_comments):
+            oldest = post.latest_comments[0]
+            post.comments_cursor = encode_cursor(oldest.created_at, oldest.pk)
+
+
+def get_posts_page(user: CustomUser, cursor: str | None) -> tuple[list, str | None]:
+    """
+    Возвращает одну страницу постов пользователя, начиная с позиции курсора.
+
+    Посты подготавливаются к рендерингу карточек (см. `prepare_post_cards`).
+
+    Args:
+        user (CustomUser): Автор постов.
+        cursor (str | None): Курсор, полученный с предыдущей страницы.
+
+    Returns:
+        tuple[list, str | None]: Посты страницы и курсор следующей страницы.
+    """
+    posts = Post.objects.filter(user=user).select_related("user")
+    posts, next_cursor = paginate_keyset(posts, cursor, POSTS_PER_PAGE)
+    prepare_post_cards(posts)
+    return posts, next_cursor
+
+
+def get_search_page(query: str, cursor: str | None) -> tuple[list, str | None]:
+    """
+    Возвращает одну страницу постов, найденных по запросу, от наиболее
+    релевантных к наименее.
+
+    Args:
+        query (str): Поисковый запрос.
+        cursor (str | None): Номер страницы, полученный с предыдущей страницы.
+
+    Returns:
+        tuple[list, str | None]: Посты страницы и номер следующей страницы.
+    """
+    if not query:
+        return [], None
+    posts = Post.objects.search(query).select_related("user")
+    posts, next_cursor = paginate_offset(posts, cursor, POSTS_PER_PAGE)
+    prepare_post_cards(posts)
+    return posts, next_cursor
+
+
+def get_comment_search_results(query: str) -> list[Comment]:
+    """
+    Возвращает наиболее релевантные комментарии, найденные по запросу, вместе
+    с их авторами и постами.
+
+    Args:
+        query (str): Поисковый запрос.
+
+    Returns:
+        list[Comment]: Не больше `COMMENT_SEARCH_RESULTS` комментариев.
+    """
+    if not query:
+        return []
+    comments = Comment.objects.search(query).select_related("user", "post")
+    return list(comments[:COMMENT_SEARCH_RESULTS])
+
+
+def get_liked_post_ids(user: CustomUser, posts: list[Post]) -> set[int]:
+    """
+    Возвращает идентификаторы постов страницы, которые лайкнул пользователь.
+
+    Выполняется один запрос к таблице связи `Post.liked_by`, ограниченный
+    постами страницы, вместо загрузки полного списка лайкнувших для каждого поста.
+
+    Args:
+        user (CustomUser): Пользователь, просматривающий страницу.
+        posts (list[Post]): Посты страницы.
+
+    Returns:
+        set[int]: Идентификаторы лайкнутых постов.
+    """
+    if not user.is_authenticated or not posts:
+        return set()
+    return set(
+        Post.liked_by.through.objects.filter(
+            customuser_id=user.pk, post_id__in=[post.pk for post in posts]
+        ).values_list("post_id", flat=True)
+    )
+
+
+def get_home_etag(request: HttpRequest, pk: int) -> str | None:
+    """
+    Вычисляет ETag страницы пользователя, не загружая и не рендеря её.
+
+    ETag строится из агрегатов по отображаемым данным: профиля автора, его
+    подписок, количества, дат создания и версий постов (версия меняется при
+    изменении поста и его комментариев) и суммы лайков. Для авторизованного
+    зрителя учитываются также его лайки постов автора, подписка на автора и
+    количество непрочитанных уведомлений в навигации. Лайки зрителя
+    описываются количеством и наибольшим идентификатором строк связи: новая
+    строка всегда получает больший идентификатор, а удаление уменьшает
+    количество, поэтому любое изменение набора лайков меняет ETag.
+
+    Args:
+        request (HttpRequest): Объект запроса.
+        pk (int): Идентификатор автора постов.
+
+    Returns:
+        str | None: ETag или None, если автор не найден или у зрителя есть
+            неотображённые сообщения (тогда страница рендерится как обычно).
+    """
+    if get_messages(request):
+        return None
+    user_of_posts = (
+        CustomUser.objects.filter(pk=pk)
+        .values_list("username", "email", "avatar")
+        .first()
+    )
+    if user_of_posts is None:
+        return None
+    posts = Post.objects.filter(user_id=pk).aggregate(
+        count=Count("pk"),
+        last_created_at=Max("created_at"),
+        version=Sum("version"),
+        like_count=Sum("like_count"),
+    )
+    subscriptions = list(
+        Subscription.objects.filter(follower_id=pk)
+        .order_by("pk")
+        .values_list("following_id", "following__username", "following__avatar")
+    )
+    viewer = None
+    if request.user.is_authenticated:
+        viewer = (
+            Post.liked_by.through.objects.filter(
+                customuser_id=request.user.pk, post__user_id=pk
+            ).aggregate(count=Count("pk"), last_pk=Max("pk")),
+            Subscription.objects.filter(
+                follower_id=request.user.pk, following_id=pk
+            ).exists(),
+            request.user.notifications.filter(is_read=False).count(),
+        )
+    return make_etag(request, user_of_posts, posts, subscriptions, viewer)
+
+
+@method_decorator(conditional_page(etag_func=get_home_etag), name="get")
 class HomeView(View):
     """
     Представление для отображения домашней страницы пользователя, включая посты,
@@ -21,7 +216,8 @@ class HomeView(View):
         """
         Обрабатывает GET-запрос для отображения страницы пользователя.
 
-        Этот метод извлекает информацию о постах пользователя, его подписках и
+        Этот метод извлекает первую страницу постов пользователя (остальные
+        подгружаются через `PostListView` при прокрутке), его подписки и
         проверяет, подписан ли текущий пользователь на данного пользователя.
         Затем передает эту информацию в контекст и рендерит HTML-шаблон для
         отображения страницы.
@@ -38,14 +234,7 @@ class HomeView(View):
         subscriptions = Subscription.objects.filter(
             follower=user_of_posts
         ).select_related("following")
-        posts = (
-            Post.objects.filter(user=user_of_posts)
-            .select_related("user")
-            .prefetch_related("comments")
-            .prefetch_related("comments__user")
-            .prefetch_related("liked_by")
-            .order_by("-created_at")
-        )
+        posts, next_cursor = get_posts_page(user_of_posts, request.GET.get("cursor"))
         if request.user.is_authenticated:
             user_of_posts_in_followers = request.user.is_following(user_of_posts)
         else:
@@ -53,6 +242,8 @@ class HomeView(View):
         context = {
             "user_of_posts": user_of_posts,
             "posts": posts,
+            "liked_post_ids": get_liked_post_ids(request.user, posts),
+            "next_cursor": next_cursor,
             "subscriptions": subscriptions,
             "user_of_posts_in_followers": user_of_posts_in_followers,
         }
@@ -98,11 +289,8 @@ class HomeView(View):
 
         if "like-post" in request.POST:
             post_pk = request.POST.get("post-pk")
-            post = get_object_or_404(Post, pk=post_pk)
-            if request.user in post.liked_by.all():
-                post.liked_by.remove(request.user)
-            else:
-                post.liked_by.add(request.user)
+            post = get_object_or_404(Post.objects.only("pk"), pk=post_pk)
+            post.toggle_like(request.user)
 
         if "subscribe" in request.POST:
             user_of_posts = get_object_or_404(CustomUser, pk=kwargs.get("pk"))
@@ -112,3 +300,185 @@ class HomeView(View):
                 request.user.follow(user_of_posts)
 
         return redirect(reverse("posts:home", kwargs={"pk": kwargs.get("pk")}))
+
+
+class PostListView(View):
+    """
+    Представление для подгрузки следующей страницы постов пользователя при
+    бесконечной прокрутке.
+
+    Возвращает JSON с HTML-фрагментом постов и курсором следующей страницы.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает GET-запрос на получение страницы постов.
+
+        Args:
+            request (HttpRequest): Объект запроса. Параметр `cursor` указывает
+                позицию, с которой начинается страница.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы.
+
+        Returns:
+            JsonResponse: Ответ с полями `html` и `next_cursor`.
+        """
+        user_of_posts = get_object_or_404(CustomUser, pk=kwargs.get("pk"))
+        posts, next_cursor = get_posts_page(user_of_posts, request.GET.get("cursor"))
+        context = {
+            "posts": posts,
+            "liked_post_ids": get_liked_post_ids(request.user, posts),
+        }
+        html = render_to_string("posts/post_list.html", context, request=request)
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
+
+
+class LikeView(LoginRequiredMixin, View):
+    """
+    Представление для постановки и снятия лайка без перезагрузки страницы.
+    """
+
+    raise_exception = True
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает POST-запрос на переключение лайка поста.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы. `pk` — идентификатор
+                поста.
+
+        Returns:
+            JsonResponse: Ответ с полями `liked` и `like_count`.
+        """
+        post = get_object_or_404(Post.objects.only("pk"), pk=kwargs.get("pk"))
+        liked, like_count = post.toggle_like(request.user)
+        return JsonResponse({"liked": liked, "like_count": like_count})
+
+
+class CommentView(View):
+    """
+    Представление для постраничной загрузки комментариев поста и добавления
+    нового комментария без перезагрузки страницы.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает GET-запрос на получение страницы более старых комментариев.
+
+        Args:
+            request (HttpRequest): Объект запроса. Параметр `cursor` указывает
+                самый старый из уже показанных комментариев.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы. `pk` — идентификатор
+                поста.
+
+        Returns:
+            JsonResponse: Ответ с HTML-фрагментом комментариев в хронологическом
+                порядке и курсором следующей страницы.
+        """
+        post = get_object_or_404(Post.objects.only("pk"), pk=kwargs.get("pk"))
+        comments, next_cursor = paginate_keyset(
+            post.comments.select_related("user"),
+            request.GET.get("cursor"),
+            COMMENTS_PER_PAGE,
+        )
+        html = "".join(
+            render_to_string("posts/comment.html", {"comment": comment})
+            for comment in reversed(comments)
+        )
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает POST-запрос на создание комментария.
+
+        Args:
+            request (HttpRequest): Объект запроса с полем `content`.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы. `pk` — идентификатор
+                поста.
+
+        Returns:
+            JsonResponse: Ответ с HTML-фрагментом комментария и новым количеством
+                комментариев или с ошибками формы (статус 400).
+        """
+        if not request.user.is_authenticated:
+            raise PermissionDenied
+        post = get_object_or_404(Post.objects.only("pk"), pk=kwargs.get("pk"))
+        comment_form = CommentForm(request.POST)
+        if not comment_form.is_valid():
+            return JsonResponse({"errors": comment_form.errors}, status=400)
+        comment = comment_form.save(commit=False)
+        comment.post = post
+        comment.user = request.user
+        comment.save()
+        post.refresh_from_db(fields=["comment_count"])
+        html = render_to_string(
+            "posts/comment.html", {"comment": comment}, request=request
+        )
+        return JsonResponse({"html": html, "comment_count": post.comment_count})
+
+
+class SearchView(View):
+    """
+    Представление для полнотекстового поиска по постам и комментариям.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Обрабатывает GET-запрос для отображения первой страницы результатов
+        поиска. Следующие страницы подгружаются через `SearchPostListView`
+        при прокрутке. Над постами показываются наиболее релевантные
+        комментарии (см. `get_comment_search_results`).
+
+        Args:
+            request (HttpRequest): Объект запроса. Параметр `q` содержит
+                поисковый запрос.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы.
+
+        Returns:
+            HttpResponse: Ответ с отрендеренной страницей результатов поиска.
+        """
+        query = request.GET.get("q", "").strip()
+        posts, next_cursor = get_search_page(query, request.GET.get("cursor"))
+        context = {
+            "query": query,
+            "comments": get_comment_search_results(query),
+            "posts": posts,
+            "liked_post_ids": get_liked_post_ids(request.user, posts),
+            "next_cursor": next_cursor,
+        }
+        return render(request, "posts/search.html", context)
+
+
+class SearchPostListView(View):
+    """
+    Представление для подгрузки следующей страницы результатов поиска при
+    бесконечной прокрутке.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает GET-запрос на получение страницы результатов поиска.
+
+        Args:
+            request (HttpRequest): Объект запроса. Параметр `q` содержит
+                поисковый запрос, а `cursor` — номер страницы.
+            *args: Дополнительные позиционные аргументы.
+            **kwargs: Дополнительные именованные аргументы.
+
+        Returns:
+            JsonResponse: Ответ с полями `html` и `next_cursor`.
+        """
+        query = request.GET.get("q", "").strip()
+        posts, next_cursor = get_search_page(query, request.GET.get("cursor"))
+        context = {
+            "posts": posts,
+            "liked_post_ids": get_liked_post_ids(request.user, posts),
+        }
+        html = render_to_string("posts/post_list.html", context, request=request)
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
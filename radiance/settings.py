@@ -63,6 +63,9 @@ INSTALLED_APPS = [
     "chat.apps.ChatConfig",
     "subs.apps.SubsConfig",
     "notifications.apps.NotificationsConfig",
+    "feed.apps.FeedConfig",
+    "benchmarks.apps.BenchmarksConfig",
+    "ratelimit.apps.RatelimitConfig",
 ]
 
 MIDDLEWARE = [
@@ -104,6 +107,18 @@ ASGI_APPLICATION = "radiance.asgi.application"
 
 DATABASES = {"default": dj_database_url.config(default=getenv("DATABASE_URL"))}
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": getenv(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": getenv("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -201,6 +216,68 @@ CHANNEL_LAYERS = {
     },
 }
 
-# YaGPT ApiKey
+# Feed
+
+FEED_INBOX_SIZE = int(getenv("FEED_INBOX_SIZE", "500"))
+FEED_FANOUT_BATCH_SIZE = int(getenv("FEED_FANOUT_BATCH_SIZE", "1000"))
+# Посты авторов с таким и большим числом подписчиков не рассылаются по лентам,
+# а подмешиваются при чтении
+FEED_FANOUT_FOLLOWER_THRESHOLD = int(getenv("FEED_FANOUT_FOLLOWER_THRESHOLD", "10000"))
+FEED_PULL_AUTHORS_CACHE_SECONDS = int(getenv("FEED_PULL_AUTHORS_CACHE_SECONDS", "300"))
+
+# Username autocomplete
+
+# Оценка памяти, которую может занимать индекс имён в каждом процессе, в байтах
+AUTOCOMPLETE_MEMORY_BUDGET = int(getenv("AUTOCOMPLETE_MEMORY_BUDGET", str(64 * 2**20)))
+AUTOCOMPLETE_REFRESH_SECONDS = int(getenv("AUTOCOMPLETE_REFRESH_SECONDS", "600"))
+
+# YaGPT
 
 YAGPT_API_KEY = getenv("YAGPT_API_KEY")
+# Адрес API генерации текста. Для нагрузочных тестов без сети можно указать
+# локальную заглушку: python manage.py mock_gpt
+YAGPT_URL = getenv(
+    "YAGPT_URL", "https://llm.api.cloud.yandex.net/foundationModels/v1/completion"
+)
+YAGPT_MODEL_URI = getenv(
+    "YAGPT_MODEL_URI", "gpt://b1ggjnuhu5mmhqqnag0t/yandexgpt/latest"
+)
+# Размер пула соединений с API в каждом процессе и число соединений,
+# остающихся открытыми между запросами
+YAGPT_MAX_CONNECTIONS = int(getenv("YAGPT_MAX_CONNECTIONS", "100"))
+YAGPT_MAX_KEEPALIVE_CONNECTIONS = int(getenv("YAGPT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Время в секундах на установку соединения и на ожидание очередной порции
+# ответа, а также общий срок вызова, включая повторные попытки
+YAGPT_CONNECT_TIMEOUT = float(getenv("YAGPT_CONNECT_TIMEOUT", "5"))
+YAGPT_READ_TIMEOUT = float(getenv("YAGPT_READ_TIMEOUT", "30"))
+YAGPT_DEADLINE = float(getenv("YAGPT_DEADLINE", "60"))
+# Количество повторных попыток после таймаута или временной ошибки API и
+# верхняя граница случайной паузы перед первой из них в миллисекундах
+# (удваивается с каждой попыткой, но не превышает YAGPT_RETRY_BACKOFF_MAX_MS)
+YAGPT_RETRIES = int(getenv("YAGPT_RETRIES", "2"))
+YAGPT_RETRY_BACKOFF_MS = int(getenv("YAGPT_RETRY_BACKOFF_MS", "200"))
+YAGPT_RETRY_BACKOFF_MAX_MS = int(getenv("YAGPT_RETRY_BACKOFF_MAX_MS", "2000"))
+# После стольких неудачных вызовов подряд запросы к API не выполняются
+# YAGPT_BREAKER_RESET_SECONDS секунд, а бот сразу отвечает сообщением об ошибке
+YAGPT_BREAKER_FAILURES = int(getenv("YAGPT_BREAKER_FAILURES", "5"))
+YAGPT_BREAKER_RESET_SECONDS = float(getenv("YAGPT_BREAKER_RESET_SECONDS", "30"))
+# Кэш ответов на повторяющиеся сообщения ботам: количество запоминаемых
+# сообщений в каждом процессе (0 отключает кэш), время жизни ответов в секундах
+# и количество разных ответов на одно сообщение
+YAGPT_CACHE_SIZE = int(getenv("YAGPT_CACHE_SIZE", "1000"))
+YAGPT_CACHE_TTL = int(getenv("YAGPT_CACHE_TTL", "600"))
+YAGPT_CACHE_VARIANTS = int(getenv("YAGPT_CACHE_VARIANTS", "3"))
+# Общая для всех процессов квота запросов к API: запросов в секунду
+# (0 отключает ограничение) и наибольший всплеск
+YAGPT_RATE_LIMIT = float(getenv("YAGPT_RATE_LIMIT", "10"))
+YAGPT_RATE_BURST = int(getenv("YAGPT_RATE_BURST", "20"))
+# Доля квоты, которую посты ботов по расписанию оставляют ответам в чате, и
+# наибольшее время ожидания квоты для постов в секундах. Ответы в чате ждут
+# квоту не дольше YAGPT_DEADLINE
+YAGPT_RATE_RESERVE = float(getenv("YAGPT_RATE_RESERVE", "0.5"))
+YAGPT_RATE_BATCH_MAX_WAIT = int(getenv("YAGPT_RATE_BATCH_MAX_WAIT", "300"))
+# Ответ бота, задержавшийся дольше этого перцентиля недавних ответов,
+# запрашивается повторно параллельно первому запросу (0 отключает
+# дублирование). Дубли составляют не больше YAGPT_HEDGE_BUDGET от всех запросов
+YAGPT_HEDGE_PERCENTILE = float(getenv("YAGPT_HEDGE_PERCENTILE", "95"))
+YAGPT_HEDGE_BUDGET = float(getenv("YAGPT_HEDGE_BUDGET", "0.05"))
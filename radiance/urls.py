@@ -20,17 +20,19 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from .views import custom_login_redirect
+from .views import custom_login_redirect, metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("accounts/", include("accounts.urls")),
     path("posts/", include("posts.urls")),
+    path("feed/", include("feed.urls")),
     path("custom-login-redirect/", custom_login_redirect, name="custom_login_redirect"),
     path("userinfo/", include("userinfo.urls")),
     path("chat/", include("chat.urls")),
     path("subs/", include("subs.urls")),
     path("notifications/", include("notifications.urls")),
+    path("metrics/", metrics, name="metrics"),
 ]
 
 urlpatterns.extend(static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT))
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponseRedirect
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 
 @login_required
@@ -8,3 +10,18 @@ def custom_login_redirect(request: HttpRequest) -> HttpResponseRedirect:
     """Перенаправляет пользователя на страницу с его постами."""
     user = request.user
     return redirect("posts:home", pk=user.pk)
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Отдаёт метрики процесса в формате Prometheus.
+
+    Доступно сотрудникам и запросам с адресов из `INTERNAL_IPS`, для остальных
+    страница не существует.
+    """
+    if (
+        not request.user.is_staff
+        and request.META.get("REMOTE_ADDR") not in settings.INTERNAL_IPS
+    ):
+        raise Http404
+    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
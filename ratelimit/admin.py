@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import TokenBucket
+
+
+@admin.register(TokenBucket)
+class TokenBucketAdmin(admin.ModelAdmin):
+    """
+    Конфигурация админки для модели TokenBucket.
+
+    Attributes:
+        list_display (tuple): Поля, которые будут отображаться в списке объектов.
+    """
+
+    list_display = ("name", "tokens", "updated_at")
@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from channels.db import database_sync_to_async
+from django.utils import timezone
+
+from .metrics import RATE_LIMIT_TIMEOUTS, RATE_LIMIT_WAIT_SECONDS, RATE_LIMIT_WAITING
+from .models import TokenBucket
+
+# Запросы, которых ждёт пользователь (ответы бота в чате)
+INTERACTIVE = "interactive"
+# Фоновые запросы, которые могут подождать (посты ботов по расписанию)
+BATCH = "batch"
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов к внешнему сервису по алгоритму token bucket,
+    общий для всех процессов приложения.
+
+    Состояние хранится в строке `TokenBucket` и изменяется условным UPDATE,
+    который применяется, только если строку никто не изменил после чтения,
+    поэтому daphne и воркеры dramatiq расходуют одну квоту, не удерживая
+    блокировок. Токены
+    пополняются со скоростью `rate` в секунду, но их не бывает больше `burst`.
+    Запросы с приоритетом `BATCH` не могут расходовать последние
+    `burst * reserve` токенов: они остаются запросам `INTERACTIVE`, так что
+    всплеск фоновой генерации не задерживает ответы в чате. Когда токенов
+    нет, запрос ждёт их пополнения, а не завершается ошибкой.
+
+    Attributes:
+        name (str): Имя ограничиваемого ресурса.
+        rate (float): Скорость пополнения токенов в секунду. 0 отключает
+            ограничение.
+        burst (float): Наибольшее количество токенов.
+        reserve (float): Доля токенов, недоступная запросам `BATCH`.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, reserve: float):
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.reserve = reserve
+
+    def get_floor(self, priority: str) -> float:
+        """
+        Возвращает количество токенов, которое должно остаться после запроса
+        с приоритетом `priority`.
+        """
+        if priority == INTERACTIVE:
+            return 0.0
+        return min(self.burst * self.reserve, self.burst - 1)
+
+    def get_bucket(self, now: datetime) -> TokenBucket:
+        """
+        Читает состояние ограничителя без блокировки, создавая его при первом
+        обращении.
+        """
+        bucket, _ = TokenBucket.objects.get_or_create(
+            name=self.name, defaults={"tokens": self.burst, "updated_at": now}
+        )
+        return bucket
+
+    def try_acquire(self, priority: str) -> float:
+        """
+        Пытается взять токен.
+
+        Новое состояние записывается, только если `tokens` и `updated_at` не
+        изменились с момента чтения. Иначе токен успел взять другой процесс,
+        и попытка повторяется по свежему состоянию.
+
+        Args:
+            priority (str): `INTERACTIVE` или `BATCH`.
+
+        Returns:
+            float: 0, если токен взят, иначе время в секундах, через которое
+                токенов станет достаточно при отсутствии других запросов.
+        """
+        needed = self.get_floor(priority) + 1
+        while True:
+            now = timezone.now()
+            bucket = self.get_bucket(now)
+            # Часы процессов на разных машинах могут немного расходиться
+            elapsed = max((now - bucket.updated_at).total_seconds(), 0)
+            tokens = min(self.burst, bucket.tokens + elapsed * self.rate)
+            if tokens < needed:
+                return (needed - tokens) / self.rate
+            updated = TokenBucket.objects.filter(
+                name=self.name, tokens=bucket.tokens, updated_at=bucket.updated_at
+            ).update(tokens=tokens - 1, updated_at=max(now, bucket.updated_at))
+            if updated:
+                return 0.0
+
+    def acquire(self, priority: str, timeout: float) -> bool:
+        """
+        Берёт токен, при необходимости ожидая его пополнения.
+
+        Args:
+            priority (str): `INTERACTIVE` или `BATCH`.
+            timeout (float): Наибольшее время ожидания в секундах.
+
+        Returns:
+            bool: False, если токен не удалось получить за `timeout`.
+        """
+        if not self.rate:
+            return True
+        started = time.monotonic()
+        wait = self.try_acquire(priority)
+        if wait:
+            with RATE_LIMIT_WAITING.labels(self.name, priority).track_inprogress():
+                while wait:
+                    delay = self.get_delay(wait, started, timeout)
+                    if delay is None:
+                        return self.give_up(priority)
+                    time.sleep(delay)
+                    wait = self.try_acquire(priority)
+        RATE_LIMIT_WAIT_SECONDS.labels(self.name, priority).observe(
+            time.monotonic() - started
+        )
+        return True
+
+    async def aacquire(self, priority: str, timeout: float) -> bool:
+        """
+        Асинхронная версия `acquire`, не занимающая поток на время ожидания.
+
+        `try_acquire` не ждёт блокировок строки, поэтому его короткие запросы
+        не задерживают другой синхронный код в общем потоке
+        `database_sync_to_async`.
+        """
+        if not self.rate:
+            return True
+        started = time.monotonic()
+        try_acquire = database_sync_to_async(self.try_acquire)
+        wait = await try_acquire(priority)
+        if wait:
+            with RATE_LIMIT_WAITING.labels(self.name, priority).track_inprogress():
+                while wait:
+                    delay = self.get_delay(wait, started, timeout)
+                    if delay is None:
+                        return self.give_up(priority)
+                    await asyncio.sleep(delay)
+                    wait = await try_acquire(priority)
+        RATE_LIMIT_WAIT_SECONDS.labels(self.name, priority).observe(
+            time.monotonic() - started
+        )
+        return True
+
+    async def atry_acquire(self, priority: str) -> bool:
+        """
+        Берёт токен, только если он доступен сразу.
+
+        В отличие от `aacquire` с нулевым таймаутом, отказ не учитывается как
+        таймаут ожидания: подходит для необязательных запросов, которые
+        просто не выполняются без квоты.
+
+        Returns:
+            bool: True, если токен взят.
+        """
+        if not self.rate:
+            return True
+        return not await database_sync_to_async(self.try_acquire)(priority)
+
+    def get_delay(self, wait: float, started: float, timeout: float) -> float | None:
+        """
+        Возвращает паузу перед следующей попыткой взять токен.
+
+        Пауза немного увеличивается на случайную величину, чтобы ожидающие
+        процессы не обращались к базе данных одновременно.
+
+        Returns:
+            float | None: Пауза в секундах или None, если токен заведомо не
+                появится до истечения `timeout`.
+        """
+        remaining = started + timeout - time.monotonic()
+        if wait > remaining:
+            return None
+        return min(wait * random.uniform(1, 1.25), remaining)
+
+    def give_up(self, priority: str) -> bool:
+        """
+        Учитывает запрос, не дождавшийся токена.
+
+        Returns:
+            bool: Всегда False.
+        """
+        RATE_LIMIT_TIMEOUTS.labels(self.name, priority).inc()
+        return False
@@ -0,0 +1,19 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+RATE_LIMIT_WAITING = Gauge(
+    "radiance_rate_limit_waiting",
+    "Calls in this process queued for a rate limiter token, by limiter and "
+    "priority.",
+    ["limiter", "priority"],
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "radiance_rate_limit_wait_seconds",
+    "Time spent waiting for a rate limiter token, by limiter and priority.",
+    ["limiter", "priority"],
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+RATE_LIMIT_TIMEOUTS = Counter(
+    "radiance_rate_limit_timeouts_total",
+    "Calls that gave up waiting for a rate limiter token, by limiter and priority.",
+    ["limiter", "priority"],
+)
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class TokenBucket(models.Model):
+    """
+    Состояние общего для всех процессов ограничителя частоты запросов
+    (см. `ratelimit.limiter.RateLimiter`).
+
+    Attributes:
+        name (CharField): Имя ограничиваемого ресурса.
+        tokens (FloatField): Количество токенов на момент `updated_at`.
+        updated_at (DateTimeField): Время последнего изменения `tokens`.
+    """
+
+    name = models.CharField(max_length=64, primary_key=True)
+    tokens = models.FloatField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        """
+        Возвращает строковое представление объекта TokenBucket.
+        """
+        return f"{self.name}: {self.tokens:.1f}"
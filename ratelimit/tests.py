@@ -0,0 +1,165 @@
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from accounts.models import CustomUser
+from benchmarks.mock_gpt import MockGPTServer
+from posts.models import Post
+from posts.tasks import create_bot_post
+from utils import gpt
+
+from .limiter import BATCH, INTERACTIVE, RateLimiter
+from .models import TokenBucket
+
+
+class RateLimiterTest(TestCase):
+    """
+    Тесты общего ограничителя частоты запросов.
+    """
+
+    def test_burst(self):
+        """
+        Проверяет, что до `burst` запросов проходят сразу, а следующий должен
+        ждать пополнения токенов.
+        """
+        limiter = RateLimiter("test", rate=10, burst=2, reserve=0)
+        self.assertEqual(limiter.try_acquire(INTERACTIVE), 0)
+        self.assertEqual(limiter.try_acquire(INTERACTIVE), 0)
+        self.assertAlmostEqual(limiter.try_acquire(INTERACTIVE), 0.1, delta=0.02)
+
+    def test_shared_state(self):
+        """
+        Проверяет, что ограничители с одним именем (например, в разных
+        процессах) расходуют общую квоту.
+        """
+        RateLimiter("test", rate=0.01, burst=1, reserve=0).try_acquire(INTERACTIVE)
+        limiter = RateLimiter("test", rate=0.01, burst=1, reserve=0)
+        self.assertGreater(limiter.try_acquire(INTERACTIVE), 0)
+        self.assertEqual(RateLimiter("other", 0.01, 1, 0).try_acquire(BATCH), 0)
+        self.assertEqual(TokenBucket.objects.count(), 2)
+
+    def test_concurrent_update(self):
+        """
+        Проверяет, что токен, взятый другим процессом между чтением и записью
+        состояния, не теряется: попытка повторяется по свежему состоянию.
+        """
+        limiter = RateLimiter("test", rate=0.01, burst=2, reserve=0)
+        other = RateLimiter("test", rate=0.01, burst=2, reserve=0)
+        get_bucket = limiter.get_bucket
+        calls = []
+
+        def get_bucket_with_race(now):
+            bucket = get_bucket(now)
+            if not calls:
+                other.try_acquire(INTERACTIVE)
+            calls.append(now)
+            return bucket
+
+        with mock.patch.object(limiter, "get_bucket", get_bucket_with_race):
+            self.assertEqual(limiter.try_acquire(INTERACTIVE), 0)
+        self.assertEqual(len(calls), 2)
+        self.assertGreater(limiter.try_acquire(INTERACTIVE), 0)
+
+    def test_priority(self):
+        """
+        Проверяет, что фоновые запросы не расходуют квоту, оставленную
+        запросам пользователей.
+        """
+        limiter = RateLimiter("test", rate=0.01, burst=4, reserve=0.5)
+        self.assertEqual(limiter.try_acquire(BATCH), 0)
+        self.assertEqual(limiter.try_acquire(BATCH), 0)
+        self.assertGreater(limiter.try_acquire(BATCH), 0)
+        self.assertEqual(limiter.try_acquire(INTERACTIVE), 0)
+        self.assertEqual(limiter.try_acquire(INTERACTIVE), 0)
+        self.assertGreater(limiter.try_acquire(INTERACTIVE), 0)
+
+    def test_acquire_waits(self):
+        """
+        Проверяет, что запрос без свободных токенов ждёт их пополнения.
+        """
+        limiter = RateLimiter("test", rate=20, burst=1, reserve=0)
+        started = time.monotonic()
+        self.assertTrue(limiter.acquire(INTERACTIVE, timeout=1))
+        self.assertTrue(limiter.acquire(INTERACTIVE, timeout=1))
+        self.assertTrue(async_to_sync(limiter.aacquire)(INTERACTIVE, timeout=1))
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_timeout(self):
+        """
+        Проверяет, что запрос не ждёт токен, который не появится до истечения
+        времени ожидания.
+        """
+        limiter = RateLimiter("test", rate=1, burst=1, reserve=0)
+        self.assertTrue(limiter.acquire(INTERACTIVE, timeout=0.1))
+        started = time.monotonic()
+        self.assertFalse(limiter.acquire(INTERACTIVE, timeout=0.1))
+        self.assertFalse(async_to_sync(limiter.aacquire)(INTERACTIVE, timeout=0.1))
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_try_acquire_is_not_a_timeout(self):
+        """
+        Проверяет, что `atry_acquire` не ждёт токен и не учитывает отказ как
+        таймаут ожидания.
+        """
+        limiter = RateLimiter("test", rate=0.01, burst=1, reserve=0)
+        labels = {"limiter": "test", "priority": INTERACTIVE}
+        before = REGISTRY.get_sample_value("radiance_rate_limit_timeouts_total", labels)
+        self.assertTrue(async_to_sync(limiter.atry_acquire)(INTERACTIVE))
+        self.assertFalse(async_to_sync(limiter.atry_acquire)(INTERACTIVE))
+        self.assertEqual(
+            REGISTRY.get_sample_value("radiance_rate_limit_timeouts_total", labels),
+            before,
+        )
+
+    def test_disabled(self):
+        """
+        Проверяет, что при нулевой скорости ограничение не применяется.
+        """
+        limiter = RateLimiter("test", rate=0, burst=1, reserve=0)
+        for _ in range(3):
+            self.assertTrue(limiter.acquire(BATCH, timeout=0))
+        self.assertFalse(TokenBucket.objects.exists())
+
+
+class GPTRateLimitTest(TestCase):
+    """
+    Тесты ограничения частоты запросов к API генерации текста.
+    """
+
+    def setUp(self):
+        """
+        Запускает заглушку API и исчерпывает квоту фоновых запросов.
+        """
+        self.server = MockGPTServer(latency_ms=0, token_delay_ms=0)
+        self.server.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(gpt.breaker.reset)
+        limiter = RateLimiter("yagpt", rate=0.01, burst=2, reserve=0.5)
+        limiter.try_acquire(BATCH)
+        patcher = mock.patch.object(gpt, "rate_limiter", limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(YAGPT_RATE_BATCH_MAX_WAIT=0.1)
+    def test_batch_post_is_skipped(self):
+        """
+        Проверяет, что задача поста бота завершается ошибкой для повтора,
+        если квота не освободилась, а ответ в чате использует оставленный для
+        него резерв.
+        """
+        bot = CustomUser.objects.create_user(
+            email="bot@example.com", password="password", username="bot", is_bot=True
+        )
+        with override_settings(YAGPT_URL=self.server.url):
+            with self.assertRaises(RuntimeError):
+                create_bot_post(bot.pk)
+            self.assertFalse(Post.objects.exists())
+            self.assertEqual(self.server.requests, 0)
+
+            reply = async_to_sync(gpt.amake_request)("system", "Привет")
+        self.assertNotEqual(reply, "Произошла ошибка :(")
+        self.assertEqual(self.server.requests, 1)
@@ -1,6 +1,33 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
+def is_serving() -> bool:
+    """
+    Проверяет, что процесс обслуживает запросы `runserver`, а не выполняет
+    другую команду управления (миграции, тесты, воркеры dramatiq).
+
+    Процесс автоперезагрузки `runserver` запросы не обслуживает: их
+    обслуживает запущенный им дочерний процесс с `RUN_MAIN`.
+    """
+    if len(sys.argv) < 2 or sys.argv[1] != "runserver":
+        return False
+    return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+
+
 class SubsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "subs"
+
+    def ready(self):
+        """
+        Регистрирует сигналы и запускает построение индекса автодополнения,
+        чтобы первые запросы подсказок не ждали его.
+        """
+        import subs.signals  # noqa
+        from subs.autocomplete import username_index
+
+        if is_serving():
+            username_index.ensure_started()
@@ -0,0 +1,238 @@
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from loguru import logger
+
+from accounts.models import CustomUser
+from subs.metrics import (
+    AUTOCOMPLETE_BYTES,
+    AUTOCOMPLETE_ENTRIES,
+    AUTOCOMPLETE_TRUNCATED,
+)
+
+
+def normalize_username(username: str) -> str:
+    """
+    Приводит имя пользователя к виду, в котором оно хранится в индексе.
+
+    Args:
+        username (str): Имя пользователя или введённый префикс.
+
+    Returns:
+        str: Имя в нормальной форме NFKC без учёта регистра.
+    """
+    return unicodedata.normalize("NFKC", username).casefold().strip()
+
+
+def estimate_entry_size(key: str, username: str) -> int:
+    """
+    Оценивает объём памяти, занимаемый одной записью индекса.
+
+    Учитываются строки, кортеж ключа в отсортированном массиве, кортеж в
+    словаре пользователей и указатели на них в контейнерах.
+
+    Args:
+        key (str): Нормализованное имя.
+        username (str): Исходное имя.
+
+    Returns:
+        int: Оценка размера записи в байтах.
+    """
+    return (
+        sys.getsizeof(key)
+        + sys.getsizeof(username)
+        + 2 * sys.getsizeof((key, 0))
+        + 4 * sys.getsizeof(0)
+    )
+
+
+class UsernameIndex:
+    """
+    Индекс имён пользователей для автодополнения по префиксу.
+
+    Хранит отсортированный массив пар (нормализованное имя, идентификатор) и
+    словарь идентификатор -> (нормализованное имя, исходное имя). Поиск
+    выполняется бинарным поиском по массиву и не обращается к базе данных.
+
+    Индекс строится из CustomUser в фоновом потоке при запуске сервера (или
+    при первом обращении, если сервер запущен не через `runserver`) и затем
+    периодически перестраивается целиком (`AUTOCOMPLETE_REFRESH_SECONDS`),
+    что подхватывает изменения, не порождающие сигналов (`bulk_create`,
+    `QuerySet.update`), и изменения из других процессов. Между перестроениями
+    индекс обновляется сигналами `post_save` и `post_delete`.
+
+    Объём индекса ограничен `AUTOCOMPLETE_MEMORY_BUDGET` байт: при построении
+    в первую очередь добавляются недавно входившие пользователи, а записи,
+    не поместившиеся в бюджет, пропускаются.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: list[tuple[str, int]] = []
+        self._users: dict[int, tuple[str, str]] = {}
+        self._size = 0
+        self._truncated = False
+        self._ready = False
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        """
+        Returns:
+            bool: True, если индекс построен.
+        """
+        return self._ready
+
+    def ensure_started(self) -> None:
+        """
+        Запускает фоновый поток, строящий и периодически обновляющий индекс,
+        если он ещё не запущен или завершился.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_forever, name="username-index", daemon=True
+            )
+        self._thread.start()
+
+    def _refresh_forever(self) -> None:
+        """
+        Перестраивает индекс с интервалом `AUTOCOMPLETE_REFRESH_SECONDS`.
+
+        Ошибка перестроения не останавливает поток: индекс продолжает отвечать
+        по прошлым данным до следующей попытки.
+        """
+        while True:
+            try:
+                self.rebuild()
+            except Exception:  # noqa: PIE786
+                logger.exception("Failed to rebuild the username index")
+            finally:
+                close_old_connections()
+            time.sleep(settings.AUTOCOMPLETE_REFRESH_SECONDS)
+
+    def rebuild(self) -> None:
+        """
+        Строит индекс заново по данным CustomUser и атомарно подменяет им
+        текущий.
+        """
+        started = time.monotonic()
+        budget = settings.AUTOCOMPLETE_MEMORY_BUDGET
+        keys, users, size, truncated = [], {}, 0, False
+        rows = (
+            CustomUser.objects.filter(is_active=True)
+            .order_by(F("last_login").desc(nulls_last=True), "pk")
+            .values_list("pk", "username")
+            .iterator(chunk_size=10000)
+        )
+        for pk, username in rows:
+            key = normalize_username(username)
+            entry_size = estimate_entry_size(key, username)
+            if size + entry_size > budget:
+                truncated = True
+                break
+            keys.append((key, pk))
+            users[pk] = (key, username)
+            size += entry_size
+        keys.sort()
+        with self._lock:
+            self._keys, self._users, self._size = keys, users, size
+            self._truncated = truncated
+            self._ready = True
+            self._report()
+        logger.info(
+            "Username index rebuilt: {} users, {} bytes in {:.2f}s",
+            len(keys),
+            size,
+            time.monotonic() - started,
+        )
+
+    def add(self, pk: int, username: str) -> None:
+        """
+        Добавляет пользователя в индекс или обновляет его имя.
+
+        Args:
+            pk (int): Идентификатор пользователя.
+            username (str): Имя пользователя.
+        """
+        key = normalize_username(username)
+        with self._lock:
+            if not self._ready:
+                return
+            current = self._users.get(pk)
+            if current == (key, username):
+                return
+            if current is not None:
+                self._discard(pk)
+            entry_size = estimate_entry_size(key, username)
+            if self._size + entry_size > settings.AUTOCOMPLETE_MEMORY_BUDGET:
+                self._truncated = True
+                self._report()
+                return
+            insort(self._keys, (key, pk))
+            self._users[pk] = (key, username)
+            self._size += entry_size
+            self._report()
+
+    def remove(self, pk: int) -> None:
+        """
+        Удаляет пользователя из индекса.
+
+        Args:
+            pk (int): Идентификатор пользователя.
+        """
+        with self._lock:
+            if self._ready and pk in self._users:
+                self._discard(pk)
+                self._report()
+
+    def _discard(self, pk: int) -> None:
+        """
+        Удаляет запись пользователя. Вызывается под блокировкой.
+        """
+        key, username = self._users.pop(pk)
+        position = bisect_left(self._keys, (key, pk))
+        del self._keys[position]
+        self._size -= estimate_entry_size(key, username)
+
+    def _report(self) -> None:
+        """
+        Обновляет метрики размера индекса. Вызывается под блокировкой.
+        """
+        AUTOCOMPLETE_ENTRIES.set(len(self._keys))
+        AUTOCOMPLETE_BYTES.set(self._size)
+        AUTOCOMPLETE_TRUNCATED.set(int(self._truncated))
+
+    def lookup(self, prefix: str, limit: int) -> list[dict]:
+        """
+        Возвращает пользователей, имя которых начинается с префикса.
+
+        Args:
+            prefix (str): Введённый префикс имени.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            list[dict]: Пользователи в алфавитном порядке нормализованных имён,
+                каждый в виде словаря с ключами `id` и `username`.
+        """
+        prefix = normalize_username(prefix)
+        if not prefix:
+            return []
+        results = []
+        with self._lock:
+            position = bisect_left(self._keys, (prefix,))
+            for key, pk in self._keys[position : position + limit]:
+                if not key.startswith(prefix):
+                    break
+                results.append({"id": pk, "username": self._users[pk][1]})
+        return results
+
+
+username_index = UsernameIndex()
@@ -0,0 +1,19 @@
+from prometheus_client import Gauge, Histogram
+
+AUTOCOMPLETE_ENTRIES = Gauge(
+    "radiance_autocomplete_entries",
+    "Usernames held in the in-process autocomplete index.",
+)
+AUTOCOMPLETE_BYTES = Gauge(
+    "radiance_autocomplete_bytes",
+    "Estimated memory used by the in-process autocomplete index.",
+)
+AUTOCOMPLETE_TRUNCATED = Gauge(
+    "radiance_autocomplete_truncated",
+    "1 if usernames were left out of the index to stay within the memory budget.",
+)
+AUTOCOMPLETE_LOOKUP_SECONDS = Histogram(
+    "radiance_autocomplete_lookup_seconds",
+    "Time spent looking up a prefix in the autocomplete index.",
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005),
+)
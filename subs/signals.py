@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import CustomUser
+from subs.autocomplete import username_index
+
+
+@receiver(post_save, sender=CustomUser)
+def update_username_index(sender: CustomUser, instance: CustomUser, **kwargs) -> None:
+    """
+    Добавляет пользователя в индекс автодополнения или обновляет его имя.
+
+    Неактивные пользователи из индекса удаляются.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (CustomUser).
+        instance (CustomUser): Сохранённый пользователь.
+        **kwargs: Дополнительные параметры.
+    """
+    if instance.is_active:
+        username_index.add(instance.pk, instance.username)
+    else:
+        username_index.remove(instance.pk)
+
+
+@receiver(post_delete, sender=CustomUser)
+def remove_from_username_index(
+    sender: CustomUser, instance: CustomUser, **kwargs
+) -> None:
+    """
+    Удаляет пользователя из индекса автодополнения.
+
+    Args:
+        sender (Model): Модель, отправляющая сигнал (CustomUser).
+        instance (CustomUser): Удалённый пользователь.
+        **kwargs: Дополнительные параметры.
+    """
+    username_index.remove(instance.pk)
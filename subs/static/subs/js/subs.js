@@ -0,0 +1,44 @@
+document.addEventListener('DOMContentLoaded', () => {
+    const input = document.querySelector('.find_form input[name="q"]');
+    const list = document.querySelector('.autocomplete-list');
+    if (!input || !list) return;
+
+    let timer = null;
+    let controller = null;
+
+    const render = (results) => {
+        list.innerHTML = '';
+        results.forEach((user) => {
+            const link = document.createElement('a');
+            link.href = input.dataset.profileUrl.replace(/0\/$/, `${user.id}/`);
+            link.textContent = user.username;
+            list.appendChild(link);
+        });
+    };
+
+    const suggest = async () => {
+        const query = input.value.trim();
+        if (!query) {
+            render([]);
+            return;
+        }
+        if (controller) controller.abort();
+        controller = new AbortController();
+        const url = new URL(input.dataset.url, window.location.origin);
+        url.searchParams.set('q', query);
+        try {
+            const response = await fetch(url, {signal: controller.signal});
+            if (!response.ok) return;
+            const data = await response.json();
+            render(data.results);
+        } catch (error) {
+            if (error.name !== 'AbortError') console.error('Autocomplete failed:', error);
+        }
+    };
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(suggest, 150);
+    });
+    input.addEventListener('blur', () => setTimeout(() => render([]), 200));
+});
@@ -1,7 +1,12 @@
-from django.test import TestCase
+import threading
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from accounts.models import CustomUser, Subscription
+from subs.autocomplete import UsernameIndex
+from tests.support import QueryBudgetMixin
 
 
 class SubsViewTest(TestCase):
@@ -90,6 +95,20 @@ class SubsViewTest(TestCase):
         self.assertContains(response, self.user2.username)
         self.assertNotContains(response, self.user7.username)
 
+    def test_next_page(self):
+        """
+        Проверяет переход на следующую страницу результатов поиска без подсчёта
+        общего количества пользователей.
+        """
+        url = reverse("subs:subs")
+        response = self.client.get(url, {"q": "user"})
+        self.assertEqual(response.context["next_page"], "2")
+
+        response = self.client.get(url, {"q": "user", "page": 2})
+        self.assertEqual(list(response.context["users"]), [self.user6])
+        self.assertIsNone(response.context["next_page"])
+        self.assertContains(response, "page=1")
+
     def test_no_subscriptions_for_anonymous_user(self):
         """
         Проверяет отсутствие подписок у анонимного пользователя.
@@ -115,3 +134,126 @@ class SubsViewTest(TestCase):
         self.assertContains(
             response, "Пользователи не найдены"
         )  # н + а + и +  ̆ + д + е + н + ы
+
+
+class UsernameIndexTest(TestCase):
+    """
+    Тесты для индекса автодополнения имён пользователей.
+    """
+
+    def setUp(self):
+        """
+        Создаёт пользователей и строит по ним отдельный индекс, подменяя им
+        общий индекс процесса.
+        """
+        for username in ("Alice", "alina", "bob"):
+            CustomUser.objects.create_user(
+                email=f"{username}@example.com", password="password", username=username
+            )
+        self.index = UsernameIndex()
+        self.index.rebuild()
+        for target in ("subs.signals.username_index", "subs.views.username_index"):
+            patcher = patch(target, self.index)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def usernames(self, prefix: str) -> list[str]:
+        """
+        Возвращает имена пользователей, найденных по префиксу.
+        """
+        return [user["username"] for user in self.index.lookup(prefix, 10)]
+
+    def test_lookup(self):
+        """
+        Проверяет поиск по префиксу без учёта регистра.
+        """
+        self.assertEqual(self.usernames("AL"), ["Alice", "alina"])
+        self.assertEqual(self.usernames("bob"), ["bob"])
+        self.assertEqual(self.usernames("c"), [])
+        self.assertEqual(self.usernames(""), [])
+        self.assertEqual(len(self.index.lookup("al", 1)), 1)
+
+    def test_incremental_updates(self):
+        """
+        Проверяет, что сигналы обновляют индекс при изменении и удалении
+        пользователей.
+        """
+        user = CustomUser.objects.get(username="bob")
+        user.username = "alex"
+        user.save()
+        self.assertEqual(self.usernames("al"), ["alex", "Alice", "alina"])
+        self.assertEqual(self.usernames("bob"), [])
+
+        user.delete()
+        self.assertEqual(self.usernames("al"), ["Alice", "alina"])
+
+    def test_memory_budget(self):
+        """
+        Проверяет, что индекс не превышает заданный бюджет памяти.
+        """
+        with override_settings(AUTOCOMPLETE_MEMORY_BUDGET=1):
+            self.index.rebuild()
+            CustomUser.objects.create_user(
+                email="al@example.com", password="password", username="al"
+            )
+        self.assertEqual(self.usernames("a"), [])
+
+    def test_refresh_survives_errors(self):
+        """
+        Проверяет, что фоновый поток продолжает перестраивать индекс после
+        ошибки, а завершившийся поток запускается заново.
+        """
+        rebuilt, finished = threading.Event(), threading.Event()
+        errors = [ValueError("rebuild failed")]
+        self.addCleanup(finished.set)
+
+        def rebuild():
+            if errors:
+                raise errors.pop()
+            rebuilt.set()
+            # Останавливает поток до конца теста, чтобы он не обращался к базе
+            finished.wait()
+
+        with (
+            patch.object(self.index, "rebuild", rebuild),
+            override_settings(AUTOCOMPLETE_REFRESH_SECONDS=0.01),
+        ):
+            self.index._thread = threading.Thread(target=lambda: None)
+            self.index._thread.start()
+            self.index._thread.join()
+            self.index.ensure_started()
+            self.assertTrue(rebuilt.wait(timeout=5))
+
+    def test_autocomplete_view(self):
+        """
+        Проверяет, что подсказки возвращаются без запросов к базе данных.
+        """
+        with patch.object(self.index, "ensure_started"), self.assertNumQueries(0):
+            response = self.client.get(reverse("subs:autocomplete"), {"q": "ali"})
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "id": CustomUser.objects.get(username="Alice").pk,
+                    "username": "Alice",
+                },
+                {
+                    "id": CustomUser.objects.get(username="alina").pk,
+                    "username": "alina",
+                },
+            ],
+        )
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов страницы поиска пользователей.
+    """
+
+    def test_subs(self):
+        """
+        Проверяет количество запросов страницы поиска пользователей.
+        """
+        self.client.force_login(self.user)
+        url = reverse("subs:subs")
+        self.assertQueryBudget(5, lambda: self.client.get(url, {"q": "seed"}))
@@ -1,10 +1,11 @@
 from django.urls import path
 
-from subs.views import SubsView
+from subs.views import AutocompleteView, SubsView
 
 app_name = "subs"
 
 
 urlpatterns = [
     path("", SubsView.as_view(), name="subs"),
+    path("autocomplete/", AutocompleteView.as_view(), name="autocomplete"),
 ]
@@ -1,10 +1,14 @@
-from django.core.paginator import Paginator
-from django.db.models import Q
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.views import View
 
 from accounts.models import CustomUser, Subscription
+from subs.autocomplete import username_index
+from subs.metrics import AUTOCOMPLETE_LOOKUP_SECONDS
+from utils.pagination import get_page_number, paginate_offset
+
+USERS_PER_PAGE = 5
+AUTOCOMPLETE_LIMIT = 10
 
 
 class SubsView(View):
@@ -21,8 +25,9 @@ class SubsView(View):
         Обрабатывает GET-запрос для отображения списка подписок и поиска пользователей.
 
         Проверяет, авторизован ли пользователь. Если да, то извлекает и отображает его
-        подписки. Выполняет поиск пользователей по запросу, если таковой имеется.
-        Реализует пагинацию для списка пользователей.
+        подписки. Выполняет поиск пользователей по запросу, если таковой имеется
+        (см. `CustomUserManager.search`). Список пользователей разбивается на
+        страницы без подсчёта общего количества найденных пользователей.
 
         Args:
             request (HttpRequest): Объект запроса.
@@ -31,25 +36,55 @@ class SubsView(View):
             HttpResponse: Ответ с отрендеренным шаблоном и контекстом.
         """
         if request.user.is_authenticated:
-            subscriptions = Subscription.objects.filter(follower=request.user)
+            subscriptions = Subscription.objects.filter(
+                follower=request.user
+            ).select_related("following")
         else:
             subscriptions = Subscription.objects.none()
 
         query = request.GET.get("q", "")
-        page_number = request.GET.get("page", 1)
+        page = request.GET.get("page")
 
         if query:
-            user_list = CustomUser.objects.filter(
-                Q(username__icontains=query) | Q(email__icontains=query)
-            ).order_by("username")
+            users, next_page = paginate_offset(
+                CustomUser.objects.search(query), page, USERS_PER_PAGE
+            )
         else:
-            user_list = CustomUser.objects.none()
-        paginator = Paginator(user_list, 5)
-        page_obj = paginator.get_page(page_number)
+            users, next_page = [], None
 
         context = {
             "subscriptions": subscriptions,
-            "page_obj": page_obj,
+            "users": users,
+            "page_number": get_page_number(page),
+            "next_page": next_page,
         }
 
         return render(request, "subs/subs.html", context)
+
+
+class AutocompleteView(View):
+    """
+    Представление для автодополнения имён пользователей в поиске.
+
+    Поиск выполняется по индексу в памяти процесса (см. `UsernameIndex`) и не
+    обращается к базе данных.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Обрабатывает GET-запрос на получение подсказок.
+
+        Args:
+            request (HttpRequest): Объект запроса. Параметр `q` содержит
+                введённое начало имени.
+
+        Returns:
+            JsonResponse: Ответ с полем `results` (список пользователей с
+                полями `id` и `username`) и признаком готовности индекса `ready`.
+        """
+        username_index.ensure_started()
+        with AUTOCOMPLETE_LOOKUP_SECONDS.time():
+            results = username_index.lookup(
+                request.GET.get("q", ""), AUTOCOMPLETE_LIMIT
+            )
+        return JsonResponse({"results": results, "ready": username_index.ready})
@@ -0,0 +1,247 @@
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from io import StringIO
+from typing import Callable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from accounts.models import CustomUser, Subscription
+from benchmarks.mock_gpt import MockGPTServer
+from chat.models import Message
+from feed.models import FeedItem
+from notifications.models import Notification
+from posts.models import Comment, Post
+from utils import gpt
+
+PROJECT_DIR = os.fspath(settings.BASE_DIR)
+ORIGIN_DEPTH = 4
+
+
+def get_query_origins(frame) -> list[str]:
+    """
+    Возвращает места в коде проекта и шаблонах, из которых был выполнен запрос.
+
+    Args:
+        frame: Кадр стека, в котором выполняется запрос.
+
+    Returns:
+        list[str]: До `ORIGIN_DEPTH` ближайших мест в виде `файл:строка`,
+            начиная с самого глубокого.
+    """
+    origins = []
+    while frame is not None and len(origins) < ORIGIN_DEPTH:
+        filename = frame.f_code.co_filename
+        node = frame.f_locals.get("self")
+        if frame.f_code.co_name == "render_annotated" and hasattr(node, "origin"):
+            origins.append(f"{node.origin.template_name}:{node.token.lineno}")
+        elif (
+            filename.startswith(PROJECT_DIR)
+            and "site-packages" not in filename
+            and filename != __file__
+        ):
+            origins.append(
+                f"{os.path.relpath(filename, PROJECT_DIR)}:{frame.f_lineno} "
+                f"in {frame.f_code.co_name}"
+            )
+        frame = frame.f_back
+    return origins
+
+
+def format_queries(queries: list[dict]) -> str:
+    """
+    Форматирует выполненные запросы вместе с местами их вызова.
+
+    Args:
+        queries (list[dict]): Запросы, собранные `capture_queries`.
+
+    Returns:
+        str: Пронумерованный список запросов.
+    """
+    lines = []
+    for number, query in enumerate(queries, start=1):
+        lines.append(f"{number}. {query['sql']} {query['params']!r}")
+        lines.extend(f"       at {origin}" for origin in query["origins"])
+    return "\n".join(lines)
+
+
+@contextmanager
+def capture_queries(using: str = DEFAULT_DB_ALIAS) -> Iterator[list[dict]]:
+    """
+    Собирает SQL-запросы, выполненные в блоке, вместе с местами их вызова.
+
+    Args:
+        using (str): Псевдоним базы данных.
+
+    Yields:
+        list[dict]: Список, пополняемый словарями с ключами `sql`, `params` и
+            `origins`.
+    """
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(
+            {
+                "sql": sql,
+                "params": params,
+                "origins": get_query_origins(sys._getframe(1)),
+            }
+        )
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(record):
+        yield queries
+
+
+class QueryBudgetMixin:
+    """
+    Примесь для `TestCase`, проверяющая, что число запросов к базе данных не
+    превышает бюджет и не растёт вместе с объёмом данных.
+
+    Перед тестами создаётся фоновый социальный граф командой
+    `generate_social_graph`, пользователь `user` с небольшой активностью,
+    его собеседник `other` и администратор `admin`.
+
+    Attributes:
+        background_users (int): Количество пользователей фонового графа.
+        seed_size (int): Объём активности `user` до первого замера.
+        grow_size (int): Объём активности, добавляемой перед вторым замером.
+    """
+
+    background_users = 30
+    seed_size = 1
+    grow_size = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Создаёт фоновые данные и пользователей, от имени которых выполняются
+        запросы.
+        """
+        call_command(
+            "generate_social_graph",
+            cls.background_users,
+            follows=3,
+            posts=2,
+            stdout=StringIO(),
+        )
+        cls.user = CustomUser.objects.create_user(
+            email="user@example.com", password="password", username="user"
+        )
+        cls.other = CustomUser.objects.create_user(
+            email="other@example.com", password="password", username="other"
+        )
+        cls.admin = CustomUser.objects.create_superuser(
+            email="admin@example.com", password="password", username="admin"
+        )
+        seed_activity(cls.user, cls.other, cls.seed_size)
+
+    def grow(self) -> None:
+        """
+        Добавляет активность пользователя `user` перед вторым замером.
+        """
+        seed_activity(self.user, self.other, self.grow_size)
+
+    def assertQueryBudget(
+        self, budget: int, request: Callable, grow: Optional[Callable] = None
+    ) -> None:
+        """
+        Выполняет `request` дважды: до и после вызова `grow`, добавляющего
+        данных. Перед каждым запуском кеш очищается, чтобы измерялся худший
+        случай. Проверяет, что оба запуска укладываются в `budget` запросов и
+        выполняют одинаковое их число. При ошибке выводит запросы вместе с
+        местами их вызова в коде и шаблонах.
+
+        Args:
+            budget (int): Максимальное количество запросов.
+            request (Callable): Проверяемое действие, например запрос к странице.
+            grow (Optional[Callable]): Функция, добавляющая данных, отображаемых
+                `request`. По умолчанию `self.grow`.
+        """
+        runs = []
+        for step in range(2):
+            if step:
+                (grow or self.grow)()
+            cache.clear()
+            with capture_queries() as queries:
+                request()
+            runs.append(queries)
+            if len(queries) > budget:
+                self.fail(
+                    f"{len(queries)} queries executed, the budget is {budget}:\n"
+                    f"{format_queries(queries)}"
+                )
+        if len(runs[0]) != len(runs[1]):
+            self.fail(
+                f"The number of queries grew with data from {len(runs[0])} to "
+                f"{len(runs[1])}:\n{format_queries(runs[1])}"
+            )
+
+
+def seed_activity(user: CustomUser, other: CustomUser, size: int) -> None:
+    """
+    Создаёт активность пользователя, отображаемую на страницах: посты с
+    комментариями и лайками, ленту, подписки в обе стороны, переписку с
+    `other` и уведомления.
+
+    Args:
+        user (CustomUser): Пользователь, для которого создаются данные.
+        other (CustomUser): Собеседник пользователя.
+        size (int): Количество объектов каждого вида.
+    """
+    prefix = f"seed{user.pk}_{uuid.uuid4().hex}"
+    users = CustomUser.objects.bulk_create(
+        CustomUser(email=f"{prefix}_{i}@example.com", username=f"{prefix}_{i}")
+        for i in range(size)
+    )
+    Subscription.objects.bulk_create(
+        [Subscription(follower=user, following=u) for u in users]
+        + [Subscription(follower=u, following=user) for u in users]
+    )
+    posts = Post.objects.bulk_create(
+        Post(user=user, content=f"Post {i}") for i in range(size)
+    )
+    FeedItem.objects.bulk_create(
+        FeedItem(user=user, post=post, created_at=post.created_at) for post in posts
+    )
+    Comment.objects.bulk_create(
+        Comment(post=post, user=u, content="Comment") for post in posts for u in users
+    )
+    Post.liked_by.through.objects.bulk_create(
+        Post.liked_by.through(post=post, customuser=u) for post in posts for u in users
+    )
+    Message.objects.bulk_create(
+        [Message(sender=user, recipient=other, content="Message") for _ in users]
+        + [Message(sender=u, recipient=user, content="Message") for u in users]
+    )
+    Notification.objects.bulk_create(
+        Notification(user=user, topic="Topic", message="Notification") for _ in users
+    )
+    Post.objects.filter(user=user).reconcile_counters()
+    CustomUser.objects.filter(
+        pk__in=[user.pk, *(u.pk for u in users)]
+    ).reconcile_follower_counts()
+
+
+class MockGPTMixin:
+    """
+    Запускает заглушку API генерации текста для тестов клиента.
+    """
+
+    def start_server(self, **kwargs) -> MockGPTServer:
+        """
+        Запускает заглушку без задержек и останавливает её после теста.
+        """
+        server = MockGPTServer(
+            **{"latency_ms": 0, "token_delay_ms": 0, "latency": "constant", **kwargs}
+        )
+        server.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(gpt.breaker.reset)
+        self.addCleanup(gpt.response_cache.clear)
+        return server
@@ -6,6 +6,7 @@ from django.test import TestCase
 from django.urls import reverse
 
 from accounts.models import CustomUser
+from tests.support import QueryBudgetMixin
 
 
 class UserInfoViewTest(TestCase):
@@ -92,3 +93,17 @@ class UserInfoViewTest(TestCase):
         user_media_path = os.path.join("media", "users", self.user.email)
         if os.path.exists(user_media_path):
             shutil.rmtree(user_media_path)
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Тесты количества запросов страницы информации о пользователе.
+    """
+
+    def test_userinfo(self):
+        """
+        Проверяет количество запросов страницы информации о пользователе.
+        """
+        self.client.force_login(self.user)
+        url = reverse("userinfo:userinfo")
+        self.assertQueryBudget(3, lambda: self.client.get(url))
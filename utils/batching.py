@@ -0,0 +1,18 @@
+from itertools import islice
+from typing import Iterable, Iterator
+
+
+def batched(objects: Iterable, size: int) -> Iterator[list]:
+    """
+    Разбивает последовательность объектов на списки заданного размера.
+
+    Args:
+        objects (Iterable): Объекты.
+        size (int): Размер списка.
+
+    Yields:
+        list: Очередная порция объектов.
+    """
+    iterator = iter(objects)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, HALF_OPEN, OPEN)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для обращений к внешнему сервису.
+
+    Пока сервис отвечает, предохранитель замкнут и пропускает все вызовы.
+    После `failure_threshold` неудачных вызовов подряд он размыкается: в
+    течение `reset_timeout` секунд вызовы не выполняются, и вызывающий код
+    сразу возвращает запасной ответ, не ожидая недоступный сервис. Затем
+    пропускается один пробный вызов: его успех замыкает предохранитель, а
+    неудача снова размыкает. Если пробный вызов так и не завершился (например,
+    был отменён), следующий пробный вызов разрешается ещё через
+    `reset_timeout` секунд.
+
+    Один экземпляр разделяется всеми потоками и циклами событий процесса.
+
+    Attributes:
+        failure_threshold (int): Количество неудач подряд, размыкающее
+            предохранитель.
+        reset_timeout (float): Время в секундах до пробного вызова.
+        on_change (Callable[[str], None] | None): Вызывается с новым
+            состоянием при каждом его изменении.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        on_change: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """
+        Returns:
+            str: Текущее состояние: `closed`, `half_open` или `open`.
+        """
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Проверяет, можно ли выполнить вызов.
+
+        Returns:
+            bool: False, если предохранитель разомкнут и вызов нужно
+                отклонить.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._opened_at = self._clock()
+            self._set_state(HALF_OPEN)
+            return True
+
+    def record_success(self) -> None:
+        """
+        Учитывает успешный вызов и замыкает предохранитель.
+        """
+        with self._lock:
+            self._failures = 0
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """
+        Учитывает неудачный вызов и размыкает предохранитель, если неудач
+        подряд стало слишком много или не удался пробный вызов.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def reset(self) -> None:
+        """
+        Замыкает предохранитель и сбрасывает счётчик неудач.
+        """
+        self.record_success()
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            self._state = state
+            if self.on_change is not None:
+                self.on_change(state)
@@ -0,0 +1,47 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.migrations.operations import AddIndex, RunSQL
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndexConcurrently):
+    """
+    Операция миграции, создающая индекс без блокировки таблицы на запись.
+
+    На PostgreSQL индекс создаётся через `CREATE INDEX CONCURRENTLY`, поэтому
+    миграция с этой операцией должна быть объявлена с `atomic = False`. На
+    остальных СУБД (SQLite при локальной разработке и в тестах) операция
+    работает как обычный `AddIndex`.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class RunSQLIfPostgres(RunSQL):
+    """
+    Операция миграции `RunSQL`, которая выполняется только на PostgreSQL.
+
+    Используется для объектов, которых нет в других СУБД (триггеры, GIN-индексы,
+    расширения): на SQLite при локальной разработке и в тестах операция
+    ничего не делает.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
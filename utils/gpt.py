@@ -1,9 +1,30 @@
+import asyncio
 import json
+import random
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
 
-import requests
+import httpx
+from asgiref.current_thread_executor import CurrentThreadExecutor
 from django.conf import settings
 from loguru import logger
 
+from ratelimit.limiter import BATCH, INTERACTIVE, RateLimiter
+from utils.circuit_breaker import CircuitBreaker
+from utils.hedging import HedgeBudget, LatencyTracker
+from utils.metrics import (
+    YAGPT_BREAKER_STATE,
+    YAGPT_HEDGE_THRESHOLD_SECONDS,
+    YAGPT_HEDGES,
+    YAGPT_REQUEST_SECONDS,
+    YAGPT_REQUESTS,
+    YAGPT_RETRIES,
+)
+from utils.response_cache import ResponseCache, make_key
+
 
 def format_text(text: str) -> str:
     """
@@ -11,6 +32,29 @@ def format_text(text: str) -> str:
     """
     response_dict: dict = json.loads(text)
     answer: str = response_dict["result"]["alternatives"][0]["message"]["text"]
+    return complete_answer(answer)
+
+
+def parse_stream_line(line: str) -> str | None:
+    """
+    Возвращает текст ответа из строки потокового ответа API.
+
+    Returns:
+        str | None: Текст, сгенерированный к этому моменту, или None, если
+            строка не в формате ответа API.
+    """
+    try:
+        return json.loads(line)["result"]["alternatives"][0]["message"]["text"]
+    except (ValueError, LookupError, TypeError):
+        logger.warning("Malformed YandexGPT stream line: {!r}", line)
+        return None
+
+
+def complete_answer(answer: str) -> str:
+    """
+    Добавляет многоточие к ответу, оборванному на середине предложения
+    ограничением `max_tokens`.
+    """
     if (
         not answer.endswith(".")
         and not answer.endswith("?")
@@ -20,20 +64,153 @@ def format_text(text: str) -> str:
     return answer
 
 
-URL = "https://llm.api.cloud.yandex.net/foundationModels/v1/completion"
 API_KEY: str = settings.YAGPT_API_KEY
 HEADERS = {"Content-Type": "application/json", "Authorization": f"Api-Key {API_KEY}"}
+ERROR_ANSWER = "Произошла ошибка :("
+# Ответы, после которых запрос стоит повторить: API перегружен или временно
+# недоступен
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
+breaker = CircuitBreaker(
+    settings.YAGPT_BREAKER_FAILURES,
+    settings.YAGPT_BREAKER_RESET_SECONDS,
+    on_change=YAGPT_BREAKER_STATE.state,
+)
 
-def make_request(
+response_cache = ResponseCache(
+    settings.YAGPT_CACHE_SIZE, settings.YAGPT_CACHE_TTL, settings.YAGPT_CACHE_VARIANTS
+)
+
+rate_limiter = RateLimiter(
+    "yagpt",
+    settings.YAGPT_RATE_LIMIT,
+    settings.YAGPT_RATE_BURST,
+    settings.YAGPT_RATE_RESERVE,
+)
+
+hedge_budget = HedgeBudget(settings.YAGPT_HEDGE_BUDGET)
+# Задержки полного ответа и первой строки потокового ответа различаются,
+# поэтому порог дублирования для них рассчитывается отдельно
+response_latency = LatencyTracker()
+first_line_latency = LatencyTracker()
+
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+# Цикл событий фонового потока, в котором выполняются вызовы `make_request`
+_sync_loop: asyncio.AbstractEventLoop | None = None
+_sync_loop_lock = threading.Lock()
+
+
+def get_limits() -> httpx.Limits:
+    """
+    Возвращает ограничения пула соединений с API.
+
+    Returns:
+        httpx.Limits: Не более `YAGPT_MAX_CONNECTIONS` одновременных соединений,
+            из которых до `YAGPT_MAX_KEEPALIVE_CONNECTIONS` остаются открытыми
+            между запросами.
+    """
+    return httpx.Limits(
+        max_connections=settings.YAGPT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.YAGPT_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+def get_timeout(started: float | None = None) -> httpx.Timeout:
+    """
+    Возвращает таймауты очередной попытки запроса к API.
+
+    Args:
+        started (float | None): Время начала вызова по `time.monotonic`.
+            Если указано, таймауты не превышают времени, оставшегося до
+            окончания срока `YAGPT_DEADLINE`.
+
+    Returns:
+        httpx.Timeout: Таймауты соединения, отправки и ожидания ответа.
+    """
+    connect, read = settings.YAGPT_CONNECT_TIMEOUT, settings.YAGPT_READ_TIMEOUT
+    if started is not None:
+        remaining = max(get_remaining(started), 0.001)
+        connect, read = min(connect, remaining), min(read, remaining)
+    return httpx.Timeout(read, connect=connect)
+
+
+def get_remaining(started: float) -> float:
+    """
+    Возвращает время в секундах, оставшееся до окончания срока
+    `YAGPT_DEADLINE` вызова, начатого в `started` по `time.monotonic`.
+    """
+    return started + settings.YAGPT_DEADLINE - time.monotonic()
+
+
+def get_retry_delay(attempt: int, started: float) -> float | None:
+    """
+    Возвращает паузу перед повторной попыткой запроса.
+
+    Пауза выбирается случайно от нуля до удвоенной с каждой попыткой границы
+    ("full jitter"), чтобы после сбоя процессы не повторяли запросы
+    одновременно.
+
+    Args:
+        attempt (int): Номер неудавшейся попытки, начиная с нуля.
+        started (float): Время начала вызова по `time.monotonic`.
+
+    Returns:
+        float | None: Пауза в секундах или None, если попытки исчерпаны или
+            повтор не успеет начаться до окончания срока вызова.
+    """
+    if attempt >= settings.YAGPT_RETRIES:
+        return None
+    delay = (
+        random.uniform(
+            0,
+            min(
+                settings.YAGPT_RETRY_BACKOFF_MS * 2**attempt,
+                settings.YAGPT_RETRY_BACKOFF_MAX_MS,
+            ),
+        )
+        / 1000
+    )
+    if delay >= get_remaining(started):
+        return None
+    YAGPT_RETRIES.inc()
+    return delay
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Возвращает асинхронный клиент API для текущего цикла событий.
+
+    Соединения асинхронного клиента привязаны к циклу событий, в котором они
+    открыты, поэтому для каждого цикла создаётся свой клиент. В daphne цикл
+    один на процесс, и все консьюмеры используют общий пул соединений, а
+    синхронные вызовы выполняются в общем цикле фонового потока
+    (см. `run_sync`).
+
+    Returns:
+        httpx.AsyncClient: Клиент с пулом соединений.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers=HEADERS, limits=get_limits(), timeout=get_timeout()
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def build_prompt(
     system_text: str,
     user_text: str,
-    stream: bool = False,
-    temperature: float = 0.3,
-    max_tokens: int = 100,
-) -> str:
-    prompt = {
-        "modelUri": "gpt://b1ggjnuhu5mmhqqnag0t/yandexgpt/latest",
+    stream: bool,
+    temperature: float,
+    max_tokens: int,
+) -> dict:
+    """
+    Формирует тело запроса к API генерации текста.
+    """
+    return {
+        "modelUri": settings.YAGPT_MODEL_URI,
         "completionOptions": {
             "stream": stream,
             "temperature": temperature,
@@ -45,12 +222,500 @@ def make_request(
         ],
     }
 
-    response = requests.post(URL, headers=HEADERS, json=prompt)
-    temp_result = response.text
-    if response.status_code != 200:
-        final_answer = "Произошла ошибка :("
-        logger.error(temp_result)
-    else:
-        final_answer = format_text(temp_result)
 
-    return final_answer
+def is_retryable(response: httpx.Response | None) -> bool:
+    """
+    Проверяет, стоит ли повторить запрос.
+
+    Args:
+        response (httpx.Response | None): Ответ API или None, если ответ не
+            получен из-за таймаута или сетевой ошибки.
+    """
+    return response is None or response.status_code in RETRY_STATUSES
+
+
+def get_quota_timeout(priority: str) -> float:
+    """
+    Возвращает наибольшее время ожидания квоты `rate_limiter` перед первым
+    запросом вызова. Срок `YAGPT_DEADLINE` отсчитывается после него.
+    """
+    if priority == BATCH:
+        return settings.YAGPT_RATE_BATCH_MAX_WAIT
+    return settings.YAGPT_DEADLINE
+
+
+async def allow_request(priority: str, acquire: Callable | None = None) -> bool:
+    """
+    Проверяет, можно ли обратиться к API, и дожидается квоты `rate_limiter`.
+    Учитывает отклонённые вызовы.
+
+    Args:
+        priority (str): `INTERACTIVE` или `BATCH`.
+        acquire (Callable | None): Берёт токен квоты, по умолчанию
+            `rate_limiter.aacquire`.
+
+    Returns:
+        bool: False, если предохранитель разомкнут или квоты не хватило, и
+            следует сразу вернуть `ERROR_ANSWER`.
+    """
+    if not breaker.allow():
+        YAGPT_REQUESTS.labels("rejected").inc()
+        return False
+    acquire = acquire or rate_limiter.aacquire
+    if not await acquire(priority, get_quota_timeout(priority)):
+        YAGPT_REQUESTS.labels("throttled").inc()
+        return False
+    return True
+
+
+def finish_request(outcome: str | None, started: float) -> None:
+    """
+    Учитывает результат вызова в предохранителе и метриках.
+
+    Args:
+        outcome (str | None): `ok`, `error` (API отклонил запрос),
+            `unavailable` (таймаут или временная ошибка после всех попыток)
+            или None, если вызов был прерван вызывающим кодом.
+        started (float): Время начала вызова по `time.monotonic`.
+    """
+    YAGPT_REQUEST_SECONDS.observe(time.monotonic() - started)
+    YAGPT_REQUESTS.labels(outcome or "cancelled").inc()
+    # Отклонённый запрос означает, что API доступен
+    if outcome in ("ok", "error"):
+        breaker.record_success()
+    elif outcome == "unavailable":
+        breaker.record_failure()
+
+
+def get_outcome(response: httpx.Response | None) -> str:
+    """
+    Возвращает результат вызова по последнему ответу API для
+    `finish_request`.
+    """
+    if response is not None and response.status_code == 200:
+        return "ok"
+    if response is not None:
+        logger.error(response.text)
+    return "unavailable" if is_retryable(response) else "error"
+
+
+def get_cache_key(
+    cache: bool, system_text: str, user_text: str, temperature: float
+) -> tuple | None:
+    """
+    Возвращает ключ `response_cache` для запроса или None, если кэш не
+    используется.
+    """
+    if not cache:
+        return None
+    return make_key(settings.YAGPT_MODEL_URI, system_text, user_text, temperature)
+
+
+async def timed(call: Callable[[], Awaitable], tracker: LatencyTracker):
+    """
+    Выполняет запрос и добавляет его задержку в `tracker`.
+
+    Задержка отменённого запроса тоже учитывается: иначе самые медленные
+    ответы, которые дублирование и отменяет, выпадали бы из окна, и порог
+    дублирования постепенно снижался бы.
+    """
+    started = time.monotonic()
+    try:
+        result = await call()
+    except asyncio.CancelledError:
+        tracker.add(time.monotonic() - started)
+        raise
+    tracker.add(time.monotonic() - started)
+    return result
+
+
+async def hedged(
+    call: Callable[[], Awaitable],
+    tracker: LatencyTracker | None,
+    priority: str,
+    close: Callable[..., Awaitable] | None = None,
+):
+    """
+    Выполняет запрос к API, дублируя его, если ответ задерживается.
+
+    Если за `YAGPT_HEDGE_PERCENTILE`-й перцентиль недавних задержек ответа
+    нет, отправляется второй такой же запрос. Используется ответ, полученный
+    первым, а второй запрос отменяется. Дубль отправляется, только если
+    позволяют бюджет `hedge_budget` и квота `rate_limiter`.
+
+    Args:
+        call (Callable[[], Awaitable]): Выполняет запрос и возвращает ответ.
+        tracker (LatencyTracker | None): Задержки ответов этого вида или None,
+            если запрос не дублируется.
+        priority (str): Приоритет запроса в общей квоте `rate_limiter`.
+        close (Callable[..., Awaitable] | None): Освобождает ответ, который не
+            понадобился.
+
+    Returns:
+        Ответ, полученный первым. Если оба запроса завершились ошибкой,
+        выбрасывается ошибка последнего.
+    """
+    threshold = None
+    if tracker is not None and settings.YAGPT_HEDGE_PERCENTILE > 0:
+        hedge_budget.deposit()
+        threshold = tracker.get_percentile(settings.YAGPT_HEDGE_PERCENTILE)
+    if threshold is None:
+        return await call() if tracker is None else await timed(call, tracker)
+
+    YAGPT_HEDGE_THRESHOLD_SECONDS.set(threshold)
+    tasks = [asyncio.ensure_future(timed(call, tracker))]
+    winner = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=threshold)
+        if not done:
+            if not hedge_budget.withdraw():
+                YAGPT_HEDGES.labels("skipped").inc()
+            elif not await rate_limiter.atry_acquire(priority):
+                hedge_budget.deposit(1)
+                YAGPT_HEDGES.labels("skipped").inc()
+            else:
+                tasks.append(asyncio.ensure_future(timed(call, tracker)))
+        pending = set(tasks)
+        while winner is None:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded or not pending:
+                winner = (succeeded or list(done))[0]
+        if len(tasks) > 1:
+            YAGPT_HEDGES.labels("won" if winner is tasks[1] else "lost").inc()
+        return winner.result()
+    finally:
+        for task in tasks:
+            if task is winner:
+                continue
+            if not task.done():
+                task.cancel()
+            elif close is not None and not task.cancelled() and not task.exception():
+                await close(task.result())
+
+
+async def post_completion(
+    payload: dict, timeout: httpx.Timeout
+) -> tuple[httpx.Response, None]:
+    """
+    Отправляет запрос генерации и читает ответ целиком.
+
+    Returns:
+        tuple[httpx.Response, None]: Ответ и None вместо строк ответа, чтобы
+            результат совпадал по виду с `open_stream`.
+    """
+    response = await get_async_client().post(
+        settings.YAGPT_URL, json=payload, timeout=timeout
+    )
+    return response, None
+
+
+async def open_stream(
+    payload: dict, timeout: httpx.Timeout
+) -> tuple[httpx.Response, AsyncIterator[str]]:
+    """
+    Отправляет запрос потоковой генерации и дожидается первой строки ответа.
+
+    Returns:
+        tuple[httpx.Response, AsyncIterator[str]]: Ответ, который нужно
+            закрыть после чтения, и непустые строки ответа, начиная с первой.
+            Если API вернул ошибку, тело ответа уже прочитано, а строк нет.
+    """
+    client = get_async_client()
+    request = client.build_request(
+        "POST", settings.YAGPT_URL, json=payload, timeout=timeout
+    )
+    response = await client.send(request, stream=True)
+    first = rest = None
+    try:
+        if response.status_code == 200:
+            rest = (line async for line in response.aiter_lines() if line)
+            first = await anext(rest, None)
+        else:
+            await response.aread()
+    except BaseException:
+        await response.aclose()
+        raise
+
+    async def lines():
+        if first is not None:
+            yield first
+            async for line in rest:
+                yield line
+
+    return response, lines()
+
+
+async def close_stream(stream: tuple[httpx.Response, AsyncIterator[str]]) -> None:
+    """
+    Закрывает ответ `open_stream`, который не понадобился.
+    """
+    await stream[0].aclose()
+
+
+async def send_with_retries(
+    send: Callable[[httpx.Timeout], Awaitable[tuple]],
+    started: float,
+    priority: str,
+    tracker: LatencyTracker | None = None,
+    close: Callable[..., Awaitable] | None = None,
+    acquire: Callable | None = None,
+) -> tuple:
+    """
+    Отправляет запрос к API, повторяя его после таймаута или временной
+    ошибки.
+
+    Запрос повторяется до `YAGPT_RETRIES` раз со случайной паузой, пока не
+    истёк срок `YAGPT_DEADLINE`, и перед каждым повтором дожидается квоты
+    `rate_limiter`, общей для всех процессов.
+
+    Args:
+        send (Callable[[httpx.Timeout], Awaitable[tuple]]): Выполняет одну
+            попытку с заданными таймаутами (`post_completion` или
+            `open_stream`) и возвращает ответ и его строки.
+        started (float): Время начала вызова по `time.monotonic`.
+        priority (str): Приоритет запроса в общей квоте `rate_limiter`.
+        tracker (LatencyTracker | None): Задержки ответов этого вида, если
+            запрос дублируется (см. `hedged`).
+        close (Callable[..., Awaitable] | None): Освобождает результат
+            попытки, которая будет повторена.
+        acquire (Callable | None): Берёт токен квоты, по умолчанию
+            `rate_limiter.aacquire`.
+
+    Returns:
+        tuple: Результат последней попытки или `(None, None)`, если ответ
+            не получен.
+    """
+    acquire = acquire or rate_limiter.aacquire
+    for attempt in range(settings.YAGPT_RETRIES + 1):
+        try:
+            result = await hedged(
+                partial(send, get_timeout(started)), tracker, priority, close=close
+            )
+        except httpx.TransportError as error:
+            logger.warning("YandexGPT request failed: {!r}", error)
+            result = (None, None)
+        if not is_retryable(result[0]):
+            break
+        delay = get_retry_delay(attempt, started)
+        if delay is None:
+            break
+        if close is not None and result[0] is not None:
+            await close(result)
+        await asyncio.sleep(delay)
+        if not await acquire(priority, get_remaining(started)):
+            break
+    return result
+
+
+def get_sync_loop() -> asyncio.AbstractEventLoop:
+    """
+    Возвращает цикл событий для синхронных вызовов, при первом обращении
+    запуская его в фоновом потоке.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="yagpt", daemon=True
+            ).start()
+    return _sync_loop
+
+
+def run_sync(call: Callable[..., Awaitable]):
+    """
+    Выполняет асинхронный вызов API из синхронного кода и дожидается его
+    результата.
+
+    Работает как `async_to_sync`, но в общем цикле событий `get_sync_loop`,
+    а не в новом цикле на каждый вызов, поэтому соединения клиента
+    `get_async_client` сохраняются между вызовами. Квота `rate_limiter`
+    берётся в вызывающем потоке, как и остальные обращения к базе данных.
+
+    Args:
+        call (Callable[..., Awaitable]): Принимает функцию получения токена
+            квоты в аргументе `acquire` и возвращает корутину вызова API.
+    """
+    executor = CurrentThreadExecutor(None)
+
+    async def acquire(priority: str, timeout: float) -> bool:
+        return await asyncio.wrap_future(
+            executor.submit(rate_limiter.acquire, priority, timeout)
+        )
+
+    future = asyncio.run_coroutine_threadsafe(call(acquire=acquire), get_sync_loop())
+    executor.run_until_future(future)
+    return future.result()
+
+
+def make_request(
+    system_text: str,
+    user_text: str,
+    stream: bool = False,
+    temperature: float = 0.3,
+    max_tokens: int = 100,
+    cache: bool = False,
+    priority: str = INTERACTIVE,
+) -> str:
+    """
+    Синхронно запрашивает ответ модели. Предназначена для кода без цикла
+    событий, например задач dramatiq.
+
+    Выполняет `amake_request` в общем цикле событий фонового потока (см.
+    `run_sync`).
+
+    Args:
+        system_text (str): Системная инструкция модели.
+        user_text (str): Сообщение пользователя.
+        stream (bool): Запрашивать ли потоковую генерацию.
+        temperature (float): Температура генерации.
+        max_tokens (int): Максимальная длина ответа в токенах.
+        cache (bool): Отвечать ли на повторяющиеся запросы из `response_cache`.
+            Подходит для коротких сообщений, на которые допустимы уже
+            сгенерированные ответы.
+        priority (str): Приоритет запроса в общей квоте `rate_limiter`:
+            `INTERACTIVE` для ответов, которых ждёт пользователь, или `BATCH`
+            для фоновой генерации.
+
+    Returns:
+        str: Ответ модели или `ERROR_ANSWER`.
+    """
+    return run_sync(
+        partial(
+            amake_request,
+            system_text,
+            user_text,
+            stream,
+            temperature,
+            max_tokens,
+            cache,
+            priority,
+        )
+    )
+
+
+async def amake_request(
+    system_text: str,
+    user_text: str,
+    stream: bool = False,
+    temperature: float = 0.3,
+    max_tokens: int = 100,
+    cache: bool = False,
+    priority: str = INTERACTIVE,
+    hedge: bool = False,
+    acquire: Callable | None = None,
+) -> str:
+    """
+    Асинхронно запрашивает ответ модели, не занимая поток на время ожидания.
+    Принимает те же аргументы, что и `make_request`.
+
+    Перед запросом к API вызов дожидается квоты `rate_limiter`, а после
+    таймаута или временной ошибки повторяет запрос (см. `send_with_retries`).
+    Пока предохранитель разомкнут, API не вызывается.
+
+    Args:
+        hedge (bool): Дублировать ли запрос, ответ на который задерживается
+            (см. `hedged`). Сокращает редкие долгие ожидания ценой
+            дополнительных запросов, поэтому подходит для ответов, которых
+            ждёт пользователь.
+        acquire (Callable | None): Берёт токен квоты, по умолчанию
+            `rate_limiter.aacquire`.
+
+    Returns:
+        str: Ответ модели или `ERROR_ANSWER`.
+    """
+    key = get_cache_key(cache, system_text, user_text, temperature)
+    if key is not None and (answer := response_cache.get(key)) is not None:
+        return answer
+    if not await allow_request(priority, acquire):
+        return ERROR_ANSWER
+    payload = build_prompt(system_text, user_text, stream, temperature, max_tokens)
+    started, outcome = time.monotonic(), None
+    try:
+        response, _ = await send_with_retries(
+            partial(post_completion, payload),
+            started,
+            priority,
+            response_latency if hedge else None,
+            acquire=acquire,
+        )
+        outcome = get_outcome(response)
+    finally:
+        finish_request(outcome, started)
+    if outcome != "ok":
+        return ERROR_ANSWER
+    answer = format_text(response.text)
+    if key is not None:
+        response_cache.add(key, answer)
+    return answer
+
+
+async def astream_request(
+    system_text: str,
+    user_text: str,
+    temperature: float = 0.3,
+    max_tokens: int = 100,
+    cache: bool = False,
+    priority: str = INTERACTIVE,
+    hedge: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Асинхронно запрашивает потоковую генерацию ответа модели.
+
+    API отдаёт ответ построчно по мере генерации, и каждая строка содержит
+    весь сгенерированный к этому моменту текст. Окончательный ответ
+    следует передать в `complete_answer`. Запрос повторяется так же, как в
+    `amake_request` (см. `send_with_retries`), но только пока не получена
+    первая строка: если соединение оборвалось посреди ответа, генерация
+    заканчивается на уже полученном тексте.
+
+    Args:
+        system_text (str): Системная инструкция модели.
+        user_text (str): Сообщение пользователя.
+        temperature (float): Температура генерации.
+        max_tokens (int): Максимальная длина ответа в токенах.
+        cache (bool): Отвечать ли на повторяющиеся запросы из `response_cache`.
+            Сохранённый ответ возвращается целиком одной строкой.
+        priority (str): Приоритет запроса в общей квоте `rate_limiter`.
+        hedge (bool): Дублировать ли запрос, первая строка ответа на который
+            задерживается (см. `hedged`).
+
+    Yields:
+        str: Текст ответа, сгенерированный к очередному моменту. Если API
+            недоступен или вернул ошибку, генератор ничего не возвращает.
+    """
+    key = get_cache_key(cache, system_text, user_text, temperature)
+    if key is not None and (answer := response_cache.get(key)) is not None:
+        yield answer
+        return
+    if not await allow_request(priority):
+        return
+    payload = build_prompt(system_text, user_text, True, temperature, max_tokens)
+    started, outcome, answer = time.monotonic(), None, None
+    try:
+        response, lines = await send_with_retries(
+            partial(open_stream, payload),
+            started,
+            priority,
+            first_line_latency if hedge else None,
+            close=close_stream,
+        )
+        if response is not None:
+            try:
+                async for line in lines:
+                    if (text := parse_stream_line(line)) is not None:
+                        answer = text
+                        yield answer
+            except httpx.TransportError as error:
+                logger.warning("YandexGPT stream failed: {!r}", error)
+                outcome = "unavailable"
+            finally:
+                await close_stream((response, lines))
+        outcome = outcome or get_outcome(response)
+    finally:
+        finish_request(outcome, started)
+    if key is not None and outcome == "ok" and answer:
+        response_cache.add(key, complete_answer(answer))
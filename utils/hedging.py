@@ -0,0 +1,90 @@
+import math
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    Скользящее окно последних задержек ответа API для выбора момента
+    дублирующего запроса.
+
+    Attributes:
+        window (int): Количество хранимых задержек.
+        min_samples (int): Наименьшее количество задержек, по которому
+            рассчитывается перцентиль.
+    """
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        """
+        Добавляет задержку в окно, вытесняя самую старую.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def get_percentile(self, percentile: float) -> float | None:
+        """
+        Возвращает перцентиль задержек в окне.
+
+        Args:
+            percentile (float): Перцентиль от 0 до 100.
+
+        Returns:
+            float | None: Задержка в секундах или None, если задержек ещё
+                слишком мало.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        index = math.ceil(percentile / 100 * len(samples)) - 1
+        return samples[min(max(index, 0), len(samples) - 1)]
+
+
+class HedgeBudget:
+    """
+    Ограничение доли дублирующих запросов.
+
+    Каждый запрос, который можно продублировать, пополняет бюджет на
+    `ratio`, а каждый дубль расходует единицу. Поэтому дублей в среднем не
+    больше `ratio` от числа запросов, даже если API замедлился целиком и
+    порог задержки превышают все запросы.
+
+    Attributes:
+        ratio (float): Допустимая доля дублирующих запросов.
+        burst (float): Наибольший запас бюджета.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def deposit(self, amount: float | None = None) -> None:
+        """
+        Пополняет бюджет на `amount` или, по умолчанию, на `ratio`.
+        """
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + (amount or self.ratio))
+
+    def withdraw(self) -> bool:
+        """
+        Расходует бюджет на один дублирующий запрос.
+
+        Returns:
+            bool: False, если бюджет исчерпан.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Callable, Optional
+
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+
+
+def make_etag(request: HttpRequest, *parts) -> str:
+    """
+    Строит ETag страницы из значений, от которых зависит её содержимое.
+
+    Помимо переданных значений, в ETag входят идентификатор зрителя и секрет
+    CSRF-токена: страница отображается по-разному для разных пользователей и
+    содержит формы с CSRF-токеном, который после повторного входа становится
+    недействительным. Секрет создаётся здесь же, если у клиента его ещё нет,
+    чтобы ETag первого ответа совпадал с ETag следующего запроса.
+
+    Args:
+        request (HttpRequest): Объект запроса.
+        *parts: Значения, от которых зависит содержимое страницы (количество
+            объектов, даты создания, версии счётчиков и т.п.).
+
+    Returns:
+        str: ETag без кавычек.
+    """
+    get_token(request)
+    payload = repr([request.user.pk, request.META["CSRF_COOKIE"], *parts])
+    return hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_page(
+    etag_func: Optional[Callable] = None,
+    last_modified_func: Optional[Callable] = None,
+) -> list[Callable]:
+    """
+    Возвращает декораторы для страницы с поддержкой условных GET-запросов.
+
+    Если валидаторы совпадают с присланными клиентом (`If-None-Match`,
+    `If-Modified-Since`), представление не вызывается и возвращается ответ 304.
+    Так как содержимое страницы зависит от пользователя, ответ помечается
+    `Vary: Cookie` и `Cache-Control: private, no-cache`: общие кеши его не
+    сохраняют, а браузер перепроверяет страницу при каждом обращении.
+
+    Args:
+        etag_func (Optional[Callable]): Функция, вычисляющая ETag по запросу
+            и аргументам представления.
+        last_modified_func (Optional[Callable]): Функция, вычисляющая дату
+            последнего изменения страницы.
+
+    Returns:
+        list[Callable]: Декораторы для `method_decorator`.
+
+    Example:
+        @method_decorator(conditional_page(etag_func=get_etag), name="get")
+    """
+    return [
+        vary_on_cookie,
+        cache_control(private=True, no_cache=True),
+        condition(etag_func=etag_func, last_modified_func=last_modified_func),
+    ]
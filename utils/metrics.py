@@ -0,0 +1,50 @@
+from prometheus_client import Counter, Enum, Gauge, Histogram
+
+from utils.circuit_breaker import STATES
+
+YAGPT_REQUESTS = Counter(
+    "radiance_yagpt_requests_total",
+    "Completion calls by outcome (ok, error = rejected by the API, unavailable = "
+    "timed out or failed after retries, rejected = failed fast by the open "
+    "circuit breaker, throttled = gave up waiting for the shared rate limit, "
+    "cancelled = abandoned by the caller).",
+    ["outcome"],
+)
+YAGPT_RETRIES = Counter(
+    "radiance_yagpt_retries_total",
+    "Repeated attempts of completion calls after a timeout or a transient error.",
+)
+YAGPT_REQUEST_SECONDS = Histogram(
+    "radiance_yagpt_request_seconds",
+    "Duration of completion calls that reached the API, including retries.",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+YAGPT_BREAKER_STATE = Enum(
+    "radiance_yagpt_circuit_breaker_state",
+    "State of the circuit breaker guarding the completion API in this process.",
+    states=list(STATES),
+)
+YAGPT_CACHE_REQUESTS = Counter(
+    "radiance_yagpt_cache_requests_total",
+    "Lookups in the completion response cache by result (hit, miss).",
+    ["result"],
+)
+YAGPT_CACHE_ENTRIES = Gauge(
+    "radiance_yagpt_cache_entries",
+    "Prompts held in the in-process completion response cache.",
+)
+YAGPT_CACHE_EVICTIONS = Counter(
+    "radiance_yagpt_cache_evictions_total",
+    "Prompts evicted from the completion response cache as least recently used.",
+)
+YAGPT_HEDGES = Counter(
+    "radiance_yagpt_hedges_total",
+    "Slow completion requests by hedging result (won = the duplicate answered "
+    "first, lost = the original answered first, skipped = no hedging budget or "
+    "rate limit left).",
+    ["result"],
+)
+YAGPT_HEDGE_THRESHOLD_SECONDS = Gauge(
+    "radiance_yagpt_hedge_threshold_seconds",
+    "Latency after which the last hedged completion request was duplicated.",
+)
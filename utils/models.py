@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class AtomicFieldsMixin(models.Model):
+    """
+    Абстрактная модель-примесь, сохранение которой не перезаписывает поля
+    `ATOMIC_FIELDS`.
+
+    Такие поля (счётчики, версии) изменяются только атомарными UPDATE с
+    F()-выражениями, поэтому значения в загруженном ранее объекте могут быть
+    устаревшими. Обычное сохранение такого объекта (например, в
+    админ-панели) вернуло бы их к старым значениям.
+
+    Attributes:
+        ATOMIC_FIELDS (tuple[str, ...]): Имена полей, которые не сохраняются
+            у существующих объектов.
+    """
+
+    ATOMIC_FIELDS: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет объект, исключая поля `ATOMIC_FIELDS` из UPDATE
+        существующей строки. Новая строка сохраняется со всеми полями.
+        """
+        if not self._state.adding and not kwargs.get("force_insert"):
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key
+                ]
+            kwargs["update_fields"] = [
+                name for name in update_fields if name not in self.ATOMIC_FIELDS
+            ]
+        super().save(*args, **kwargs)
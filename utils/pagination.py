@@ -0,0 +1,149 @@
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Q, QuerySet
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    """
+    Кодирует позицию в ленте (дата создания + идентификатор) в строку,
+    безопасную для использования в URL.
+
+    Args:
+        created_at (datetime): Дата создания последнего показанного объекта.
+        pk (int): Идентификатор последнего показанного объекта.
+
+    Returns:
+        str: Закодированный курсор.
+    """
+    return urlsafe_base64_encode(force_bytes(f"{created_at.isoformat()}|{pk}"))
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, int]]:
+    """
+    Декодирует курсор, созданный функцией `encode_cursor`.
+
+    Args:
+        cursor (Optional[str]): Закодированный курсор из параметров запроса.
+
+    Returns:
+        Optional[tuple[datetime, int]]: Пара (дата создания, идентификатор) или None,
+            если курсор не передан или повреждён.
+    """
+    if not cursor:
+        return None
+    try:
+        created_at, pk = force_str(urlsafe_base64_decode(cursor)).split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, ValueError):
+        return None
+
+
+def keyset_queryset(
+    queryset: QuerySet,
+    cursor: Optional[str],
+    date_field: str = "created_at",
+    id_field: str = "pk",
+) -> QuerySet:
+    """
+    Отбирает объекты, расположенные после позиции курсора, и упорядочивает их
+    от новых к старым.
+
+    Args:
+        queryset (QuerySet): Исходный набор объектов.
+        cursor (Optional[str]): Курсор, полученный с предыдущей страницы.
+        date_field (str): Поле с датой, по которому упорядочивается лента.
+        id_field (str): Уникальное поле, разрешающее совпадения дат.
+
+    Returns:
+        QuerySet: Отфильтрованный и упорядоченный набор объектов.
+    """
+    position = decode_cursor(cursor)
+    if position is not None:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(**{f"{date_field}__lt": created_at})
+            | Q(**{date_field: created_at, f"{id_field}__lt": pk})
+        )
+    return queryset.order_by(f"-{date_field}", f"-{id_field}")
+
+
+def get_page_number(page: Optional[str]) -> int:
+    """
+    Разбирает номер страницы из параметров запроса.
+
+    Args:
+        page (Optional[str]): Номер страницы, начиная с 1.
+
+    Returns:
+        int: Номер страницы или 1, если номер не передан или некорректен.
+    """
+    try:
+        return max(int(page), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def paginate_offset(
+    queryset: QuerySet, page: Optional[str], per_page: int
+) -> tuple[list, Optional[str]]:
+    """
+    Возвращает страницу объектов по её номеру, не подсчитывая их общее количество.
+
+    Используется для наборов, упорядоченных по вычисляемому значению (например,
+    по релевантности поиска), для которых пагинация по курсору невозможна.
+    Вместо COUNT(*) выбирается на один объект больше размера страницы: если он
+    есть, значит, есть и следующая страница.
+
+    Args:
+        queryset (QuerySet): Упорядоченный набор объектов.
+        page (Optional[str]): Номер страницы из параметров запроса, начиная с 1.
+        per_page (int): Количество объектов на странице.
+
+    Returns:
+        tuple[list, Optional[str]]: Объекты страницы и номер следующей страницы
+            (None, если страница последняя).
+    """
+    number = get_page_number(page)
+    offset = (number - 1) * per_page
+    items = list(queryset[offset : offset + per_page + 1])
+    if len(items) <= per_page:
+        return items, None
+    return items[:per_page], str(number + 1)
+
+
+def paginate_keyset(
+    queryset: QuerySet,
+    cursor: Optional[str],
+    per_page: int,
+    date_field: str = "created_at",
+    id_field: str = "pk",
+) -> tuple[list, Optional[str]]:
+    """
+    Возвращает страницу объектов, упорядоченных от новых к старым, начиная
+    с позиции курсора.
+
+    В отличие от `Paginator`, не выполняет COUNT(*) и OFFSET: страница выбирается
+    по условию `(date_field, id_field) < курсор`, поэтому стоимость запроса не
+    зависит от номера страницы и общего количества объектов.
+
+    Args:
+        queryset (QuerySet): Исходный набор объектов.
+        cursor (Optional[str]): Курсор, полученный с предыдущей страницы.
+        per_page (int): Количество объектов на странице.
+        date_field (str): Поле с датой, по которому упорядочивается лента.
+        id_field (str): Уникальное поле, разрешающее совпадения дат.
+
+    Returns:
+        tuple[list, Optional[str]]: Объекты страницы и курсор следующей страницы
+            (None, если страница последняя).
+    """
+    queryset = keyset_queryset(queryset, cursor, date_field, id_field)
+    items = list(queryset[: per_page + 1])
+    if len(items) <= per_page:
+        return items, None
+    items = items[:per_page]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, date_field), getattr(last, id_field))
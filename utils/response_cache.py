@@ -0,0 +1,110 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from utils.metrics import (
+    YAGPT_CACHE_ENTRIES,
+    YAGPT_CACHE_EVICTIONS,
+    YAGPT_CACHE_REQUESTS,
+)
+
+
+def make_key(
+    model_uri: str, system_text: str, user_text: str, temperature: float
+) -> tuple:
+    """
+    Возвращает ключ кэша ответов модели.
+
+    Сообщение пользователя приводится к нижнему регистру, а пробелы в нём
+    схлопываются, чтобы "Привет" и "привет " считались одним запросом.
+    """
+    return (model_uri, system_text, " ".join(user_text.casefold().split()), temperature)
+
+
+class ResponseCache:
+    """
+    Кэш ответов модели на повторяющиеся запросы в памяти процесса.
+
+    Для каждого ключа накапливается до `variants` ответов: пока их меньше,
+    запрос считается промахом и уходит в API, а затем на него отвечает
+    случайный из сохранённых вариантов, поэтому бот не повторяет одну и ту
+    же фразу. Варианты ключа устаревают через `ttl` секунд после
+    первого из них. Если ключей больше `max_entries`, вытесняются давно не
+    использовавшиеся.
+
+    Attributes:
+        max_entries (int): Наибольшее количество ключей. 0 отключает кэш.
+        ttl (float): Время жизни вариантов ключа в секундах.
+        variants (int): Количество вариантов ответа на один ключ.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        variants: int,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variants = max(variants, 1)
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, list[str]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> str | None:
+        """
+        Возвращает сохранённый ответ.
+
+        Returns:
+            str | None: Случайный из вариантов ответа или None, если ключа нет,
+                он устарел или варианты ещё не накоплены.
+        """
+        if not self.max_entries:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                YAGPT_CACHE_ENTRIES.set(len(self._entries))
+                entry = None
+            if entry is None or len(entry[1]) < self.variants:
+                YAGPT_CACHE_REQUESTS.labels("miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            YAGPT_CACHE_REQUESTS.labels("hit").inc()
+            return self._rng.choice(entry[1])
+
+    def add(self, key: tuple, answer: str) -> None:
+        """
+        Сохраняет ещё один вариант ответа.
+        """
+        if not self.max_entries:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                entry = (self._clock() + self.ttl, [])
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(entry[1]) < self.variants:
+                entry[1].append(answer)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                YAGPT_CACHE_EVICTIONS.inc()
+            YAGPT_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        """
+        Удаляет все сохранённые ответы.
+        """
+        with self._lock:
+            self._entries.clear()
+            YAGPT_CACHE_ENTRIES.set(0)
@@ -0,0 +1,284 @@
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+
+from benchmarks.mock_gpt import MockGPTServer
+from tests.support import MockGPTMixin
+
+from . import gpt
+from .circuit_breaker import CircuitBreaker
+from .gpt import amake_request, astream_request, make_request
+from .hedging import HedgeBudget, LatencyTracker
+from .response_cache import ResponseCache, make_key
+
+
+@override_settings(YAGPT_RETRY_BACKOFF_MS=1)
+class GPTResilienceTest(MockGPTMixin, TestCase):
+    """
+    Тесты таймаутов, повторных запросов и предохранителя при обращении к API
+    генерации текста.
+    """
+
+    def test_retries(self):
+        """
+        Проверяет, что после временной ошибки запрос повторяется
+        `YAGPT_RETRIES` раз.
+        """
+        server = self.start_server(error_rate=1)
+        with override_settings(YAGPT_URL=server.url, YAGPT_RETRIES=2):
+            self.assertEqual(make_request("system", "Привет"), "Произошла ошибка :(")
+        self.assertEqual(server.requests, 3)
+
+    def test_client_errors_are_not_retried(self):
+        """
+        Проверяет, что запрос, отклонённый API как некорректный, не
+        повторяется и не размыкает предохранитель.
+        """
+        server = self.start_server(error_rate=1, error_status=400)
+        with override_settings(YAGPT_URL=server.url, YAGPT_RETRIES=2):
+            self.assertEqual(make_request("system", "Привет"), "Произошла ошибка :(")
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(gpt.breaker.state, "closed")
+
+    def test_timeout(self):
+        """
+        Проверяет, что зависший запрос прерывается по таймауту, а повторные
+        попытки не выходят за срок вызова.
+        """
+        server = self.start_server(latency_ms=2000)
+        started = time.monotonic()
+        with override_settings(
+            YAGPT_URL=server.url, YAGPT_READ_TIMEOUT=0.2, YAGPT_DEADLINE=0.5
+        ):
+            self.assertEqual(make_request("system", "Привет"), "Произошла ошибка :(")
+            self.assertEqual(
+                async_to_sync(amake_request)("system", "Привет"), "Произошла ошибка :("
+            )
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_circuit_breaker(self):
+        """
+        Проверяет, что после нескольких неудачных вызовов подряд API не
+        вызывается, а после паузы пробный вызов замыкает предохранитель.
+        """
+        now = [0.0]
+        breaker = CircuitBreaker(2, reset_timeout=30, clock=lambda: now[0])
+        server = self.start_server(error_rate=1)
+        with (
+            mock.patch.object(gpt, "breaker", breaker),
+            override_settings(YAGPT_URL=server.url, YAGPT_RETRIES=0),
+        ):
+            for _ in range(3):
+                self.assertEqual(
+                    make_request("system", "Привет"), "Произошла ошибка :("
+                )
+            self.assertEqual(server.requests, 2)
+            self.assertEqual(breaker.state, "open")
+
+            server.error_rate = 0
+            now[0] = 31
+            self.assertNotEqual(make_request("system", "Привет"), "Произошла ошибка :(")
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(breaker.state, "closed")
+
+    def test_half_open(self):
+        """
+        Проверяет, что в полуоткрытом состоянии пропускается только один
+        пробный вызов, а его неудача снова размыкает предохранитель.
+        """
+        now = [0.0]
+        breaker = CircuitBreaker(1, reset_timeout=30, clock=lambda: now[0])
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        now[0] = 30
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, "half_open")
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        now[0] = 59
+        self.assertFalse(breaker.allow())
+
+
+class ResponseCacheTest(MockGPTMixin, TestCase):
+    """
+    Тесты кэша ответов модели.
+    """
+
+    def test_variants(self):
+        """
+        Проверяет, что на запрос отвечает API, пока не накоплены все варианты
+        ответа, а затем ответы берутся из кэша.
+        """
+        server = self.start_server()
+        cache = ResponseCache(10, ttl=60, variants=2)
+        replies = set()
+        with (
+            mock.patch.object(gpt, "response_cache", cache),
+            override_settings(YAGPT_URL=server.url),
+        ):
+            for text in ("Привет", "привет ", "ПРИВЕТ", "Привет"):
+                replies.add(make_request("system", text, cache=True))
+            self.assertEqual(server.requests, 2)
+            self.assertEqual(len(replies), 2)
+            make_request("system", "Привет")
+            make_request("system", "Привет", temperature=0.7, cache=True)
+        self.assertEqual(server.requests, 4)
+
+    def test_errors_are_not_cached(self):
+        """
+        Проверяет, что сообщение об ошибке API не сохраняется в кэш.
+        """
+        server = self.start_server(error_rate=1)
+        cache = ResponseCache(10, ttl=60, variants=1)
+        with (
+            mock.patch.object(gpt, "response_cache", cache),
+            override_settings(YAGPT_URL=server.url, YAGPT_RETRIES=0),
+        ):
+            make_request("system", "Привет", cache=True)
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl_and_eviction(self):
+        """
+        Проверяет, что ответы устаревают через `ttl`, а при переполнении
+        вытесняется давно не использовавшийся ключ.
+        """
+        now = [0.0]
+        cache = ResponseCache(2, ttl=60, variants=1, clock=lambda: now[0])
+        first, second, third = (
+            make_key("model", "system", text, 0.3) for text in "abc"
+        )
+        cache.add(first, "A")
+        cache.add(second, "B")
+        self.assertEqual(cache.get(first), "A")
+        cache.add(third, "C")
+        self.assertIsNone(cache.get(second))
+        self.assertEqual(cache.get(first), "A")
+        now[0] = 60
+        self.assertIsNone(cache.get(first))
+        self.assertEqual(len(cache), 1)
+
+    def test_disabled(self):
+        """
+        Проверяет, что кэш нулевого размера ничего не сохраняет.
+        """
+        cache = ResponseCache(0, ttl=60, variants=1)
+        key = make_key("model", "system", "Привет", 0.3)
+        cache.add(key, "Привет!")
+        self.assertIsNone(cache.get(key))
+
+
+class SlowFirstMockGPTServer(MockGPTServer):
+    """
+    Заглушка API, отвечающая на первый запрос через `first_latency_ms`, а на
+    остальные сразу.
+    """
+
+    first_latency_ms = 2000
+
+    def next_rng(self):
+        """
+        Задаёт задержку очередного запроса.
+        """
+        rng = super().next_rng()
+        self.latency_ms = self.first_latency_ms if self.requests == 1 else 0
+        return rng
+
+
+class HedgingTest(MockGPTMixin, TestCase):
+    """
+    Тесты дублирования задержавшихся запросов к API генерации текста.
+    """
+
+    def setUp(self):
+        """
+        Запускает заглушку, долго отвечающую на первый запрос, и заполняет
+        окно задержек так, чтобы порог дублирования составил 50 мс.
+        """
+        self.server = SlowFirstMockGPTServer(
+            latency="constant", latency_ms=0, token_delay_ms=0
+        )
+        self.server.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(gpt.breaker.reset)
+        self.tracker = LatencyTracker()
+        for _ in range(self.tracker.min_samples):
+            self.tracker.add(0.05)
+        for name in ("response_latency", "first_line_latency"):
+            patcher = mock.patch.object(gpt, name, self.tracker)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def hedged_requests(self, budget: HedgeBudget) -> tuple[list, float]:
+        """
+        Выполняет обычный и потоковый запрос с дублированием.
+
+        Returns:
+            tuple[list, float]: Ответы и время выполнения в секундах.
+        """
+
+        async def request():
+            reply = await amake_request("system", "Привет", hedge=True)
+            self.server.requests = 0
+            chunks = [
+                chunk async for chunk in astream_request("system", "Привет", hedge=True)
+            ]
+            return [reply, chunks]
+
+        started = time.monotonic()
+        with (
+            mock.patch.object(gpt, "hedge_budget", budget),
+            override_settings(YAGPT_URL=self.server.url),
+        ):
+            replies = async_to_sync(request)()
+        return replies, time.monotonic() - started
+
+    def test_hedge(self):
+        """
+        Проверяет, что задержавшийся запрос дублируется и используется
+        ответ, полученный первым.
+        """
+        (reply, chunks), elapsed = self.hedged_requests(HedgeBudget(1))
+        self.assertNotEqual(reply, "Произошла ошибка :(")
+        self.assertGreater(len(chunks), 0)
+        self.assertEqual(self.server.requests, 2)
+        self.assertLess(elapsed, 1.5)
+
+    def test_budget(self):
+        """
+        Проверяет, что без бюджета запросы не дублируются.
+        """
+        self.server.first_latency_ms = 200
+        budget = HedgeBudget(0)
+        budget.deposit(0.5)
+        (reply, chunks), _ = self.hedged_requests(budget)
+        self.assertNotEqual(reply, "Произошла ошибка :(")
+        self.assertEqual(self.server.requests, 1)
+
+    def test_percentile(self):
+        """
+        Проверяет расчёт перцентиля по скользящему окну задержек.
+        """
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for value in range(5):
+            tracker.add(value)
+        self.assertIsNone(tracker.get_percentile(95))
+        for value in range(200):
+            tracker.add(value / 100)
+        self.assertEqual(len(tracker), 100)
+        self.assertAlmostEqual(tracker.get_percentile(95), 1.94)
+        self.assertAlmostEqual(tracker.get_percentile(50), 1.49)
+
+    def test_budget_ratio(self):
+        """
+        Проверяет, что бюджет допускает не больше `ratio` дублей на запрос.
+        """
+        budget = HedgeBudget(0.25)
+        hedges = 0
+        for _ in range(100):
+            budget.deposit()
+            hedges += budget.withdraw()
+        self.assertEqual(hedges, 25)